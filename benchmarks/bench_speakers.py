@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Benchmark speaker assignment on synthetic segment and turn lists."""
+import argparse
+import random
+import sys
+import time
+from collections import namedtuple
+from pathlib import Path
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from core.speakers import Turn, assign_speakers  # noqa: E402
+from core.store import assign_turn_indices  # noqa: E402
+
+Segment = namedtuple("Segment", ["start", "end"])
+
+
+def synthetic_segments(duration: float, rng: random.Random) -> list:
+    """Whisper-like segments of 2-8 s with short gaps."""
+    segments, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(2.0, 8.0)
+        segments.append(Segment(t, min(t + length, duration)))
+        t += length + rng.uniform(0.0, 0.5)
+    return segments
+
+
+def synthetic_turns(duration: float, speakers: int, rng: random.Random) -> list:
+    """Speaker turns of 1-15 s, occasionally overlapping the previous one."""
+    turns, t = [], 0.0
+    while t < duration:
+        length = rng.uniform(1.0, 15.0)
+        turns.append(
+            Turn(t, min(t + length, duration), f"SPEAKER_{rng.randrange(speakers):02d}")
+        )
+        t += length - rng.uniform(0.0, 0.5) if rng.random() < 0.2 else length
+    return turns
+
+
+def linear_scan(segments, turns):
+    """The original lookup: first turn containing the segment start."""
+    speakers = []
+    for segment in segments:
+        speaker = None
+        for turn in turns:
+            if turn.start <= segment.start <= turn.end:
+                speaker = turn.speaker
+                break
+        speakers.append(speaker)
+    return speakers
+
+
+def timed(func, *args, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--speakers", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--skip-linear", action="store_true", help="skip the quadratic baseline"
+    )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    duration = args.hours * 3600
+    segments = synthetic_segments(duration, rng)
+    turns = synthetic_turns(duration, args.speakers, rng)
+    print(f"{len(segments)} segments, {len(turns)} turns over {args.hours:g} h")
+
+    sweep = timed(assign_speakers, segments, turns)
+    print(f"interval sweep: {sweep * 1000:9.2f} ms")
+    columns = [
+        np.array([s.start for s in segments]),
+        np.array([s.end for s in segments]),
+        np.array([t.start for t in turns]),
+        np.array([t.end for t in turns]),
+    ]
+    vectorized = timed(assign_turn_indices, *columns)
+    print(
+        f"vectorized:     {vectorized * 1000:9.2f} ms "
+        f"({sweep / vectorized:.0f}x faster than the sweep)"
+    )
+    if not args.skip_linear:
+        linear = timed(linear_scan, segments, turns, repeat=1)
+        print(f"linear scan:    {linear * 1000:9.2f} ms ({linear / sweep:.0f}x slower)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Benchmark sequential against batched Whisper decoding on CPU int8."""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from faster_whisper import BatchedInferencePipeline, WhisperModel  # noqa: E402
+from core.processor import decode_audio_file  # noqa: E402
+
+
+def timed_transcribe(model, waveform, **options):
+    """Decode every segment; returns (seconds, segment count, language)."""
+    start = time.perf_counter()
+    segments, info = model.transcribe(waveform, **options)
+    count = sum(1 for _ in segments)
+    return time.perf_counter() - start, count, info.language
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("audio", type=Path, help="speech recording to transcribe")
+    parser.add_argument("--model", default="base")
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--threads", type=int, default=0, help="0 uses all cores")
+    parser.add_argument("--beam-size", type=int, default=5)
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[4, 8, 16], metavar="N"
+    )
+    args = parser.parse_args()
+
+    waveform = decode_audio_file(args.audio)
+    duration = len(waveform) / 16000
+    model = WhisperModel(
+        args.model,
+        device="cpu",
+        compute_type=args.compute_type,
+        cpu_threads=args.threads,
+    )
+    print(
+        f"{args.model} {args.compute_type} on CPU, {duration:.0f} s of audio, "
+        f"beam size {args.beam_size}"
+    )
+
+    sequential, count, language = timed_transcribe(
+        model, waveform, beam_size=args.beam_size
+    )
+    print(
+        f"sequential:    {sequential:8.2f} s  RTF {sequential / duration:.3f}  "
+        f"{count} segments ({language})"
+    )
+
+    pipeline = BatchedInferencePipeline(model)
+    for batch_size in args.batch_sizes:
+        batched, count, language = timed_transcribe(
+            pipeline,
+            waveform,
+            beam_size=args.beam_size,
+            batch_size=batch_size,
+            without_timestamps=False,
+        )
+        print(
+            f"batch size {batch_size:2d}: {batched:8.2f} s  "
+            f"RTF {batched / duration:.3f}  {count} segments ({language})  "
+            f"{sequential / batched:.1f}x faster"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""Benchmark the processing pipeline and compare against a stored baseline.
+
+Cases run on synthetic audio of each length (or on --sample, tiled to the
+length): capture overhead per callback, speaker assignment, FLAC encode and
+decode, and, when small models are cached locally, Whisper and pyannote
+real-time factor. Results are written as JSON; with --baseline, any case
+slower than the baseline by more than --tolerance is reported and the script
+exits non-zero.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bench_speakers import synthetic_segments, synthetic_turns  # noqa: E402
+from core.processor import decode_audio_file  # noqa: E402
+from core.results import Segment  # noqa: E402
+from core.store import SegmentStore, TurnStore  # noqa: E402
+
+SAMPLE_RATE = 16000
+BLOCK_FRAMES = 512
+LENGTHS = {"1min": 60, "30min": 1800, "3h": 10800}
+CASES = ["capture", "speakers", "flac", "asr", "diarization"]
+MODEL_CASES = {"asr", "diarization"}
+
+
+class Skipped(Exception):
+    """Raised by a case that cannot run in this environment."""
+
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """Deterministic speech-like audio: voiced bursts separated by pauses."""
+    rng = np.random.default_rng(seed)
+    audio = np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+    position = 0
+    while position < len(audio):
+        length = int(rng.uniform(0.5, 4.0) * SAMPLE_RATE)
+        t = np.arange(min(length, len(audio) - position)) / SAMPLE_RATE
+        pitch = rng.uniform(90, 250)
+        burst = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+        envelope = 0.5 - 0.5 * np.cos(2 * np.pi * 3 * t)
+        audio[position : position + len(t)] = 0.1 * burst * envelope
+        position += length + int(rng.uniform(0.1, 1.0) * SAMPLE_RATE)
+    return audio
+
+
+def sample_audio(path: Path, seconds: float) -> np.ndarray:
+    """A recording repeated or trimmed to the requested length."""
+    audio = decode_audio_file(path)
+    frames = int(seconds * SAMPLE_RATE)
+    return np.resize(audio, frames).astype(np.float32)
+
+
+def best_of(func: Callable[[], None], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_capture(audio: np.ndarray, repeat: int) -> dict:
+    """The capture path: callback copy into the queue, then drain to the buffer."""
+    try:
+        from core.audio import AudioBuffer, BlockQueue
+    except OSError as e:
+        raise Skipped(f"PortAudio unavailable ({e})")
+
+    blocks = [
+        audio[i : i + BLOCK_FRAMES, None] for i in range(0, len(audio), BLOCK_FRAMES)
+    ]
+
+    def run():
+        queue, buffer = BlockQueue(), AudioBuffer()
+        for index, block in enumerate(blocks):
+            queue.put(block.copy())
+            # The UI drains roughly every 30 ms, i.e. every block or so
+            if index % 2:
+                for queued in queue.get_all():
+                    buffer.append(queued)
+        for queued in queue.get_all():
+            buffer.append(queued)
+        buffer.consolidate()
+
+    seconds = best_of(run, repeat)
+    return {"seconds": seconds, "per_callback_us": seconds / len(blocks) * 1e6}
+
+
+def bench_speakers(audio: np.ndarray, repeat: int) -> dict:
+    """Speaker assignment as the processor and ``render`` run it."""
+    duration = len(audio) / SAMPLE_RATE
+    rng = random.Random(0)
+    segments = SegmentStore.from_segments(
+        Segment(s.start, s.end, "", None) for s in synthetic_segments(duration, rng)
+    )
+    turns = TurnStore.from_turns(synthetic_turns(duration, 6, rng))
+    seconds = best_of(lambda: segments.assign_speakers(turns), repeat)
+    return {"seconds": seconds, "segments": len(segments), "turns": len(turns)}
+
+
+def bench_flac(audio: np.ndarray, repeat: int) -> dict:
+    import soundfile as sf
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "recording.flac"
+        encode = best_of(
+            lambda: sf.write(path, audio, SAMPLE_RATE, format="FLAC"), repeat
+        )
+        decode = best_of(lambda: decode_audio_file(path), repeat)
+        size = path.stat().st_size
+    return {
+        "seconds": encode + decode,
+        "encode_seconds": encode,
+        "decode_seconds": decode,
+        "compression_ratio": audio.nbytes / 2 / size,
+    }
+
+
+def bench_asr(audio: np.ndarray, repeat: int, model=None) -> dict:
+    segments_count = 0
+
+    def run():
+        nonlocal segments_count
+        segments, _ = model.transcribe(audio, beam_size=1, language="en")
+        segments_count = sum(1 for _ in segments)
+
+    return {"seconds": best_of(run, repeat), "segments": segments_count}
+
+
+def bench_diarization(audio: np.ndarray, repeat: int, pipeline=None) -> dict:
+    import torch
+
+    waveform = {"waveform": torch.from_numpy(audio)[None, :], "sample_rate": 16000}
+    return {"seconds": best_of(lambda: pipeline(waveform), repeat)}
+
+
+def load_models(cases, whisper_model: str) -> Dict[str, object]:
+    """Load the cached models the requested cases need; never downloads."""
+    from core.models import hub_offline, load_diarization_pipeline
+
+    models = {}
+    with hub_offline():
+        if "asr" in cases:
+            try:
+                from faster_whisper import WhisperModel
+
+                models["asr"] = WhisperModel(
+                    whisper_model,
+                    device="cpu",
+                    compute_type="int8",
+                    local_files_only=True,
+                )
+            except Exception as e:
+                models["asr"] = Skipped(f"Whisper {whisper_model} unavailable: {e!r}")
+        if "diarization" in cases:
+            try:
+                models["diarization"] = load_diarization_pipeline(os.getenv("HF_TOKEN"))
+            except Exception as e:
+                models["diarization"] = Skipped(f"pyannote unavailable: {e!r}")
+    return models
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "commit": commit,
+    }
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float, min_delta: float = 0.0
+) -> list:
+    """Print each case against the baseline; returns the regressed keys.
+
+    A case regresses when it is slower by more than ``tolerance`` and by more
+    than ``min_delta`` seconds, so timer noise on tiny cases is ignored.
+    """
+    regressions = []
+    print(f"\n{'case':<24} {'baseline':>13} {'current':>13} {'change':>7}")
+    for key, result in results.items():
+        previous = baseline.get("results", {}).get(key)
+        if previous is None or "seconds" not in result:
+            continue
+        change = result["seconds"] / previous["seconds"] - 1
+        flag = ""
+        if change > tolerance and result["seconds"] - previous["seconds"] > min_delta:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(
+            f"{key:<24} {previous['seconds'] * 1000:10.1f} ms "
+            f"{result['seconds'] * 1000:10.1f} ms "
+            f"{change:+7.0%}{flag}"
+        )
+    return regressions
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--cases", nargs="+", choices=CASES, default=CASES)
+    parser.add_argument(
+        "--lengths", nargs="+", choices=list(LENGTHS), default=list(LENGTHS)
+    )
+    parser.add_argument("--sample", type=Path, help="recording to use for all cases")
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs")
+    parser.add_argument("--whisper-model", default="tiny")
+    parser.add_argument(
+        "--model-max-length",
+        choices=list(LENGTHS),
+        default="30min",
+        help="longest length the model cases run on",
+    )
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="compare with stored results")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)"
+    )
+    parser.add_argument(
+        "--min-delta-ms",
+        type=float,
+        default=10.0,
+        help="ignore slowdowns smaller than this",
+    )
+    args = parser.parse_args(argv)
+
+    benches = {
+        "capture": bench_capture,
+        "speakers": bench_speakers,
+        "flac": bench_flac,
+        "asr": bench_asr,
+        "diarization": bench_diarization,
+    }
+    models = load_models(set(args.cases) & MODEL_CASES, args.whisper_model)
+    results, skipped = {}, {}
+    for label in args.lengths:
+        seconds = LENGTHS[label]
+        if args.sample:
+            audio = sample_audio(args.sample, seconds)
+        else:
+            audio = synthetic_speech(seconds)
+        for case in args.cases:
+            key = f"{case}/{label}"
+            kwargs = {}
+            if case in MODEL_CASES:
+                if seconds > LENGTHS[args.model_max_length]:
+                    continue
+                if isinstance(models[case], Skipped):
+                    skipped[key] = str(models[case])
+                    continue
+                kwargs = {"model" if case == "asr" else "pipeline": models[case]}
+            # Long recordings are timed once; they dominate the run time
+            repeat = args.repeat if seconds <= 60 else 1
+            try:
+                result = benches[case](audio, repeat, **kwargs)
+            except Skipped as e:
+                skipped[key] = str(e)
+                continue
+            result["real_time_factor"] = result["seconds"] / seconds
+            results[key] = result
+            print(
+                f"{key:<24} {result['seconds'] * 1000:10.1f} ms  "
+                f"RTF {result['real_time_factor']:.5f}"
+            )
+    for key, reason in skipped.items():
+        print(f"{key:<24} skipped: {reason}")
+
+    report = {
+        "environment": environment(),
+        "source": str(args.sample) if args.sample else "synthetic",
+        "results": results,
+        "skipped": skipped,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nWrote {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(
+            results, baseline, args.tolerance, args.min_delta_ms / 1000
+        )
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed beyond {args.tolerance:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,21 @@
 import os
 import sys
 from pathlib import Path
-import torch
+from config.hardware import (
+    cpu_features,
+    default_cpu_threads,
+    load_calibration,
+    select_compute_type,
+    supported_compute_types,
+)
+from core.writers import WRITERS
 
 
 def check_gpu_availability():
     """Check if GPU is available and properly configured."""
+    # Imported here so that importing the config does not pull in torch
+    import torch
+
     try:
         if torch.cuda.is_available():
             torch.tensor([1.0], device="cuda")
@@ -16,22 +26,107 @@ def check_gpu_availability():
     return "cpu"
 
 
+def output_formats() -> list:
+    """Transcript formats from TRANSCRIBER_FORMATS, e.g. ``["txt", "srt"]``.
+
+    Raises ValueError for unknown formats or an empty list, so a bad value
+    fails at startup rather than after a recording has been processed.
+    """
+    formats = [
+        name.strip().lower()
+        for name in os.getenv("TRANSCRIBER_FORMATS", "txt").split(",")
+        if name.strip()
+    ]
+    if not formats:
+        raise ValueError("TRANSCRIBER_FORMATS lists no transcript formats")
+    unknown = [name for name in formats if name not in WRITERS]
+    if unknown:
+        raise ValueError(
+            f"Unknown transcript format in TRANSCRIBER_FORMATS: {', '.join(unknown)}; "
+            f"choose from {', '.join(WRITERS)}"
+        )
+    return formats
+
+
 def check_environment():
     """Check and validate environment variables and dependencies."""
     hf_token = os.getenv("HF_TOKEN")
     if not hf_token:
         print("Error: HF_TOKEN environment variable not set")
         sys.exit(1)
+    try:
+        formats = output_formats()
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
     device = check_gpu_availability()
-    compute_type = "float16" if device == "cuda" else "float32"
+    whisper_model = os.getenv("WHISPER_MODEL")
+    compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "auto")
+    calibration_path = Path(
+        os.getenv(
+            "TRANSCRIBER_CALIBRATION",
+            Path.home() / ".cache" / "echoes" / "calibration.json",
+        )
+    )
+
+    # A calibration measured on this machine fills in whatever was not set
+    calibration = load_calibration(calibration_path) if device == "cpu" else None
+    if calibration and whisper_model in (None, calibration["whisper_model"]):
+        whisper_model = calibration["whisper_model"]
+        if compute_type == "auto":
+            compute_type = calibration["compute_type"]
+    if compute_type == "auto":
+        compute_type = select_compute_type(
+            device, cpu_features(), supported_compute_types(device)
+        )
+
+    num_workers = int(os.getenv("WHISPER_NUM_WORKERS", "1"))
+    cpu_threads = int(os.getenv("WHISPER_CPU_THREADS", "0"))
 
     config = {
         "hf_token": hf_token,
-        "whisper_model": os.getenv("WHISPER_MODEL", "turbo"),
+        "whisper_model": whisper_model or "turbo",
+        "whisper_batch_size": int(os.getenv("WHISPER_BATCH_SIZE", "8")),
+        "whisper_beam_size": int(os.getenv("WHISPER_BEAM_SIZE", "5")),
         "device": device,
         "compute_type": compute_type,
+        "whisper_num_workers": num_workers,
+        "cpu_threads": cpu_threads or default_cpu_threads(num_workers),
+        "calibration_path": calibration_path,
         "output_dir": Path(os.getenv("TRANSCRIBER_OUTPUT", "output")),
+        "output_formats": formats,
+        "keep_results": os.getenv("TRANSCRIBER_KEEP_RESULTS", "0") == "1",
+        "model_socket": Path(
+            os.getenv(
+                "TRANSCRIBER_MODEL_SOCKET",
+                Path.home() / ".cache" / "echoes" / "models.sock",
+            )
+        ),
+        "inputs": os.getenv("TRANSCRIBER_INPUTS", ""),
+        "streaming": os.getenv("TRANSCRIBER_STREAMING", "0") == "1",
+        "online_diarization": os.getenv("TRANSCRIBER_LIVE_SPEAKERS", "0") == "1",
+        "speaker_threshold": float(os.getenv("TRANSCRIBER_SPEAKER_THRESHOLD", "0.4")),
+        "diarization_backend": os.getenv("TRANSCRIBER_DIARIZATION_BACKEND", "thread"),
+        "diarization_max_mb": int(os.getenv("TRANSCRIBER_DIARIZATION_MAX_MB", "4096")),
+        "max_active_jobs": int(os.getenv("TRANSCRIBER_MAX_ACTIVE_JOBS", "2")),
+        "max_queued_jobs": int(os.getenv("TRANSCRIBER_MAX_QUEUED_JOBS", "4")),
+        "keep_audio": os.getenv("TRANSCRIBER_KEEP_AUDIO", "0") == "1",
+        "spill_to_disk": os.getenv("TRANSCRIBER_SPILL", "0") == "1",
+        "cache_dir": Path(
+            os.getenv(
+                "TRANSCRIBER_CACHE_DIR", Path.home() / ".cache" / "echoes" / "results"
+            )
+        ),
+        "cache_max_mb": int(os.getenv("TRANSCRIBER_CACHE_MAX_MB", "1024")),
+        "trace_path": (
+            Path(os.environ["TRANSCRIBER_TRACE"])
+            if os.getenv("TRANSCRIBER_TRACE")
+            else None
+        ),
+        "show_timings": os.getenv("TRANSCRIBER_SHOW_TIMINGS", "0") == "1",
+        "vad_threshold_db": float(os.getenv("TRANSCRIBER_VAD_THRESHOLD_DB", "-40")),
+        "trim_silence": os.getenv("TRANSCRIBER_TRIM_SILENCE", "0") == "1",
     }
 
     config["output_dir"].mkdir(exist_ok=True)
@@ -0,0 +1,100 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+from pathlib import Path
+from typing import Optional, Set
+
+# Vector extensions that speed up CTranslate2's int8 kernels on x86
+INT8_FEATURES = {"avx2", "avx512f", "avx512_vnni", "avx_vnni"}
+
+
+def cpu_features() -> Set[str]:
+    """Lower-case CPU feature flags, e.g. ``avx2`` or ``avx512f``."""
+    if sys.platform.startswith("linux"):
+        try:
+            with open("/proc/cpuinfo", encoding="utf-8") as f:
+                for line in f:
+                    if line.startswith(("flags", "Features")):
+                        return set(line.split(":", 1)[1].split())
+        except OSError:
+            pass
+    elif sys.platform == "darwin":
+        try:
+            output = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.features", "machdep.cpu.leaf7_features"],
+                capture_output=True,
+                text=True,
+            ).stdout
+            return {flag.lower().replace(".", "_") for flag in output.split()}
+        except OSError:
+            pass
+    return set()
+
+
+def usable_cpus() -> int:
+    """CPUs this process may run on, respecting affinity and cgroup pinning."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def default_cpu_threads(num_workers: int = 1) -> int:
+    """Intra-op threads per Whisper worker so workers do not oversubscribe."""
+    return max(1, usable_cpus() // max(1, num_workers))
+
+
+def supported_compute_types(device: str) -> Set[str]:
+    """Compute types CTranslate2 supports on the device, or none if unknown."""
+    try:
+        import ctranslate2
+
+        return set(ctranslate2.get_supported_compute_types(device))
+    except Exception:
+        return set()
+
+
+def select_compute_type(device: str, features: Set[str], supported: Set[str]) -> str:
+    """The fastest compute type for the device.
+
+    CUDA runs float16. On CPU, int8 is chosen whenever it is supported and the
+    CPU is ARM or has AVX2 or newer, where it is several times faster than
+    float32 at nearly the same accuracy; otherwise float32.
+    """
+    if device == "cuda":
+        return "float16"
+    arm = platform.machine().lower() in ("arm64", "aarch64")
+    if "int8" in supported and (arm or features & INT8_FEATURES):
+        return "int8"
+    return "float32"
+
+
+def machine_fingerprint() -> dict:
+    """What a calibration result depends on; a change invalidates it."""
+    features = cpu_features()
+    return {
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": usable_cpus(),
+        "int8_features": sorted(features & INT8_FEATURES),
+    }
+
+
+def load_calibration(path: Path) -> Optional[dict]:
+    """The persisted calibration, if it was measured on this machine."""
+    try:
+        result = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if result.get("fingerprint") != machine_fingerprint():
+        return None
+    return result
+
+
+def save_calibration(path: Path, result: dict) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    result = dict(result, fingerprint=machine_fingerprint())
+    path.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
@@ -1,9 +1,14 @@
-from typing import Callable, List
+from typing import Callable, Optional
 from datetime import datetime
+from pathlib import Path
 import numpy as np
-from core.audio import AudioDevice
-from core.processor import AudioProcessor
+from core.audio import AudioBuffer, AudioDevice
+from core.capture import MultiChannelCapture, parse_inputs
+from core.processor import AudioProcessor, StreamingTranscriber
+from core.scheduler import Job
+from core.server import ModelClient, RemoteModelManager
 from core.models import ModelManager
+from core.telemetry import Tracer
 
 
 class AudioController:
@@ -13,39 +18,140 @@ class AudioController:
         self,
         config: dict,
         write_log: Callable[[str], None],
-        update_progress: Callable[[float, str], None],
+        update_progress: Callable[..., None],
     ):
         self.config = config
         self.write_log = write_log
         self.update_progress = update_progress
+        self.tracer = Tracer.from_config(config)
 
         # Initialize components
-        self.model_manager = ModelManager(config, write_log, update_progress)
+        # Prefer warm models from a running `echoes serve` instance
+        socket_path = config.get("model_socket")
+        if socket_path and ModelClient(socket_path).available():
+            self.model_manager = RemoteModelManager(
+                config, write_log, update_progress, self.tracer
+            )
+        else:
+            self.model_manager = ModelManager(
+                config, write_log, update_progress, self.tracer
+            )
         self.audio_device = AudioDevice()
+        # Channels to record side by side instead of the default input
+        self.inputs = parse_inputs(config.get("inputs", ""))
         self.audio_processor = AudioProcessor(
-            config, self.model_manager, write_log, update_progress
+            config, self.model_manager, write_log, update_progress, self.tracer
         )
 
         # State
-        self.audio_data: List[np.ndarray] = []
+        self.audio_data = AudioBuffer()
+        self.streamer: Optional[StreamingTranscriber] = None
+        self.capture: Optional[MultiChannelCapture] = None
+        self.spill_path: Optional[Path] = None
         self.is_recording = False
 
     def load_models(self):
         """Load ML models."""
         self.model_manager.load_models()
 
+    def shutdown(self) -> None:
+        """Let queued recordings finish, then release the models."""
+        self.audio_processor.scheduler.shutdown()
+        self.model_manager.shutdown()
+
     def start_recording(self, audio_callback: Callable) -> None:
         """Start recording audio."""
         self.is_recording = True
-        self.audio_data = []
-        self.audio_device.start_recording(audio_callback)
+        self.audio_data = AudioBuffer()
+        if self.inputs:
+            self._start_capture()
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.config.get("streaming"):
+            self.streamer = StreamingTranscriber(
+                self.config,
+                self.model_manager,
+                self.write_log,
+                self.update_progress,
+                timestamp,
+            )
+        elif self.config.get("spill_to_disk"):
+            self.spill_path = self.config["output_dir"] / f"recording_{timestamp}.wav"
+        self.audio_device.start_recording(audio_callback, spill_path=self.spill_path)
 
-    def stop_recording(self) -> None:
-        """Stop recording and process audio."""
-        self.is_recording = False
+    def _start_capture(self) -> None:
+        """Record each configured input channel into its own buffer."""
+        if self.config.get("streaming") or self.config.get("spill_to_disk"):
+            self.write_log(
+                "Streaming and spilling to disk support a single input; "
+                "recording the inputs in memory"
+            )
+        capture = MultiChannelCapture(self.inputs)
+        try:
+            capture.start()
+        except RuntimeError:
+            self.is_recording = False
+            raise
+        self.capture = capture
+
+    def drain_capture(self) -> Optional[float]:
+        """Store audio queued by the input streams; returns the loudest level.
+
+        None when no multichannel capture is running or nothing arrived.
+        """
+        if self.capture is None:
+            return None
+        return self.capture.drain()
+
+    def add_audio(self, block: np.ndarray) -> None:
+        """Store a captured block, or hand it to the streaming transcriber."""
+        if self.streamer is not None:
+            self.streamer.feed(block)
+        elif self.spill_path is not None:
+            self.audio_device.write(block)
+        else:
+            self.audio_data.append(block)
+
+    def stop_recording(self, drain: Optional[Callable[[], None]] = None) -> None:
+        """Stop recording and process audio.
+
+        ``drain`` is called once the stream has stopped, so blocks still queued
+        on their way to ``add_audio`` are stored before processing starts.
+        """
+        if self.capture is not None:
+            self._stop_capture()
+            return
         self.audio_device.stop_recording()
-        if self.audio_data:
+        if drain is not None:
+            drain()
+        self.is_recording = False
+        if self.streamer is not None:
+            self.streamer.finish()
+            self.streamer = None
+        elif self.spill_path is not None:
+            audio_path = self.audio_device.close_spill()
+            timestamp = self.spill_path.stem.removeprefix("recording_")
+            self.spill_path = None
+            self.audio_processor.process_audio(timestamp, audio_path, delete_audio=True)
+        elif len(self.audio_data):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # The processor takes ownership of the filled buffer
+            self.audio_processor.process_audio(timestamp, self.audio_data)
+            self.audio_data = AudioBuffer()
+
+    def _stop_capture(self) -> None:
+        capture, self.capture = self.capture, None
+        recordings = capture.stop()
+        self.is_recording = False
+        if capture.dropped or capture.input_overflows:
+            self.write_log(
+                f"Inputs dropped {capture.dropped} blocks "
+                f"({capture.input_overflows} input overflows)"
+            )
+        if any(len(recording.audio) for recording in recordings):
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            audio = np.concatenate(self.audio_data)
-            self.audio_processor.process_audio(timestamp, audio)
-            self.audio_data = []
+            self.audio_processor.process_channels(timestamp, recordings)
+
+    def cancel_processing(self) -> Optional[Job]:
+        """Cancel the most recently queued processing job."""
+        return self.audio_processor.cancel()
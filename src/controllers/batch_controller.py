@@ -0,0 +1,177 @@
+import glob
+import hashlib
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+from core.models import ModelManager
+from core.processor import AudioProcessor
+from core.scheduler import Job
+from core.server import ModelClient, RemoteModelManager
+from core.telemetry import Tracer
+
+AUDIO_EXTENSIONS = {".wav", ".flac", ".mp3", ".m4a", ".ogg", ".opus", ".aac", ".webm"}
+
+
+class BatchManifest:
+    """Append-only JSON lines record of files that have been transcribed.
+
+    A file counts as done while its path, size and modification time match
+    the recorded entry, so edited or replaced files are processed again.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if self.path.exists():
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries[entry["path"]] = entry
+
+    @staticmethod
+    def _stat(path: Path) -> dict:
+        stat = path.stat()
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    def is_done(self, path: Path) -> bool:
+        entry = self.entries.get(str(path.resolve()))
+        return entry is not None and all(
+            entry.get(key) == value for key, value in self._stat(path).items()
+        )
+
+    def record(self, path: Path, **details) -> None:
+        """Mark a file as done and persist the entry immediately."""
+        entry = {"path": str(path.resolve()), **self._stat(path), **details}
+        with self._lock:
+            self.entries[entry["path"]] = entry
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+class BatchController:
+    """Runs existing audio files through the processing pipeline without a UI."""
+
+    def __init__(
+        self,
+        config: dict,
+        write_log: Callable[[str], None],
+        update_progress: Optional[Callable[..., None]] = None,
+        manifest_path: Optional[Path] = None,
+    ):
+        self.config = config
+        self.write_log = write_log
+        self.update_progress = update_progress or (lambda *args: None)
+        self.tracer = Tracer.from_config(config)
+
+        # Prefer warm models from a running `echoes serve` instance
+        socket_path = config.get("model_socket")
+        if socket_path and ModelClient(socket_path).available():
+            self.model_manager = RemoteModelManager(
+                config, write_log, self.update_progress, self.tracer
+            )
+        else:
+            self.model_manager = ModelManager(
+                config, write_log, self.update_progress, self.tracer
+            )
+        self.audio_processor = AudioProcessor(
+            config, self.model_manager, write_log, self.update_progress, self.tracer
+        )
+        self.manifest = BatchManifest(
+            manifest_path or config["output_dir"] / "batch_manifest.jsonl"
+        )
+
+    @staticmethod
+    def collect(sources: Iterable[str]) -> List[Path]:
+        """Expand directories and glob patterns into a sorted list of audio files."""
+        files = set()
+        for source in sources:
+            path = Path(source)
+            if path.is_dir():
+                candidates = path.rglob("*")
+            elif path.is_file():
+                candidates = [path]
+            else:
+                candidates = (
+                    Path(match) for match in glob.glob(source, recursive=True)
+                )
+            files.update(
+                candidate
+                for candidate in candidates
+                if candidate.is_file() and candidate.suffix.lower() in AUDIO_EXTENSIONS
+            )
+        return sorted(files)
+
+    @staticmethod
+    def output_name(path: Path) -> str:
+        """Name for a file's outputs, unique to its absolute path.
+
+        The stem keeps names readable; a hash of the path keeps files with
+        the same stem in different directories, or in later runs, from
+        overwriting each other's transcripts and results.
+        """
+        digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+        return f"{path.stem}_{digest[:8]}"
+
+    def run(self, sources: Iterable[str]) -> dict:
+        """Transcribe every file not already in the manifest; returns a summary."""
+        files = self.collect(sources)
+        pending = [path for path in files if not self.manifest.is_done(path)]
+        self.write_log(
+            f"Found {len(files)} audio files, {len(files) - len(pending)} already done"
+        )
+        if not pending:
+            return {"processed": 0, "failed": 0, "audio_hours": 0.0, "wall_hours": 0.0}
+
+        self.model_manager.load_models()
+        started = time.perf_counter()
+        jobs = []
+        for path in pending:
+            name = self.output_name(path)
+            # Blocks while the scheduler is full, streaming files through the stages
+            job = self.audio_processor.process_audio(name, path, block=True)
+            job.future.add_done_callback(
+                lambda future, job=job, path=path: self._on_done(job, path, started)
+            )
+            jobs.append(job)
+
+        for job in jobs:
+            try:
+                job.future.result()
+            except Exception:
+                pass
+        self.audio_processor.scheduler.shutdown()
+        self.model_manager.shutdown()
+
+        wall_seconds = time.perf_counter() - started
+        done = [job for job in jobs if job.state == "done"]
+        audio_seconds = sum(job.info.get("audio_seconds", 0.0) for job in done)
+        summary = {
+            "processed": len(done),
+            "failed": len(jobs) - len(done),
+            "audio_hours": audio_seconds / 3600,
+            "wall_hours": wall_seconds / 3600,
+        }
+        throughput = audio_seconds / wall_seconds if wall_seconds else 0.0
+        self.write_log(
+            f"\nProcessed {summary['processed']} files ({summary['failed']} failed): "
+            f"{summary['audio_hours']:.2f} audio-hours in {wall_seconds:.0f}s, "
+            f"{throughput:.1f} audio-hours per wall-hour"
+        )
+        return summary
+
+    def _on_done(self, job: Job, path: Path, started: float) -> None:
+        if job.state != "done":
+            self.write_log(f"Failed: {path}")
+            return
+        transcript = job.future.result()
+        self.manifest.record(
+            path,
+            transcript=str(transcript),
+            audio_seconds=job.info.get("audio_seconds"),
+            finished_after=time.perf_counter() - started,
+        )
+        self.write_log(f"Done: {path} -> {transcript}")
@@ -1,5 +1,203 @@
-from typing import Optional, Callable
+import queue
+import threading
+from pathlib import Path
+from typing import Iterator, List, Optional, Callable
+import numpy as np
 import sounddevice as sd
+import soundfile as sf
+
+
+class AudioBuffer:
+    """Growable capture buffer backed by preallocated fixed-size chunks.
+
+    Appending copies each block into the current chunk, so capture memory stays
+    close to the raw sample size and no per-block arrays are retained. Consumers
+    read the recording through zero-copy views of the filled chunks.
+    """
+
+    def __init__(
+        self,
+        channels: int = 1,
+        chunk_frames: int = 16000 * 30,
+        dtype=np.float32,
+    ):
+        self.channels = channels
+        self.chunk_frames = chunk_frames
+        self.dtype = np.dtype(dtype)
+        self._chunks: List[np.ndarray] = []
+        self._frames = 0
+
+    def __len__(self) -> int:
+        return self._frames
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes allocated for sample storage."""
+        return sum(chunk.nbytes for chunk in self._chunks)
+
+    def append(self, block: np.ndarray) -> None:
+        """Copy a ``(frames, channels)`` block onto the end of the buffer."""
+        block = block.reshape(-1, self.channels)
+        written = 0
+        while written < len(block):
+            offset = self._frames % self.chunk_frames
+            if offset == 0 and self._frames // self.chunk_frames == len(self._chunks):
+                self._chunks.append(
+                    np.empty((self.chunk_frames, self.channels), dtype=self.dtype)
+                )
+            count = min(len(block) - written, self.chunk_frames - offset)
+            chunk = self._chunks[self._frames // self.chunk_frames]
+            chunk[offset : offset + count] = block[written : written + count]
+            written += count
+            self._frames += count
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        """Yield zero-copy views over the recorded audio, in order."""
+        remaining = self._frames
+        for chunk in self._chunks:
+            if remaining <= 0:
+                break
+            yield chunk[: min(remaining, self.chunk_frames)]
+            remaining -= self.chunk_frames
+
+    def consolidate(self) -> np.ndarray:
+        """Move the recording into one contiguous array and empty the buffer.
+
+        Each chunk is released as soon as it has been copied, so peak memory
+        stays near one copy of the recording plus a single chunk. Mono audio is
+        returned as a 1-D array, as the models expect.
+        """
+        out = np.empty((self._frames, self.channels), dtype=self.dtype)
+        position = 0
+        while self._chunks:
+            chunk = self._chunks.pop(0)
+            count = min(self._frames - position, self.chunk_frames)
+            out[position : position + count] = chunk[:count]
+            position += count
+        self._frames = 0
+        return out.reshape(-1) if self.channels == 1 else out
+
+    def read(self, start: int = 0, stop: Optional[int] = None) -> np.ndarray:
+        """Return frames ``[start, stop)``; a view when they lie in one chunk."""
+        stop = self._frames if stop is None else min(stop, self._frames)
+        start = max(0, min(start, stop))
+        if stop == start:
+            return np.empty((0, self.channels), dtype=self.dtype)
+        first, last = start // self.chunk_frames, (stop - 1) // self.chunk_frames
+        if first == last:
+            offset = first * self.chunk_frames
+            return self._chunks[first][start - offset : stop - offset]
+
+        out = np.empty((stop - start, self.channels), dtype=self.dtype)
+        position = start
+        while position < stop:
+            index, offset = divmod(position, self.chunk_frames)
+            count = min(stop - position, self.chunk_frames - offset)
+            out[position - start : position - start + count] = self._chunks[index][
+                offset : offset + count
+            ]
+            position += count
+        return out
+
+
+class BlockQueue:
+    """Lock-free single-producer/single-consumer handoff for audio blocks.
+
+    The PortAudio callback only ever advances ``_head`` and the consumer only
+    ever advances ``_tail``; slot and index stores are atomic under the GIL, so
+    neither side takes a lock. When the consumer falls behind, new blocks are
+    dropped and counted rather than blocking the real-time thread.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._slots: List[Optional[np.ndarray]] = [None] * capacity
+        self._head = 0
+        self._tail = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def put(self, block: np.ndarray) -> bool:
+        """Enqueue a block from the producer; returns False if it was dropped."""
+        if self._head - self._tail >= self.capacity:
+            self.dropped += 1
+            return False
+        self._slots[self._head % self.capacity] = block
+        self._head += 1
+        return True
+
+    def get_all(self) -> List[np.ndarray]:
+        """Dequeue every available block on the consumer side."""
+        head = self._head
+        blocks = []
+        for index in range(self._tail, head):
+            slot = index % self.capacity
+            blocks.append(self._slots[slot])
+            self._slots[slot] = None
+        self._tail = head
+        return blocks
+
+
+class AudioFileWriter:
+    """Streams audio blocks to disk from a background writer thread.
+
+    Blocks are written as float32 RF64 (WAV without the 4 GB limit), which
+    libsndfile can reopen for appending, so an existing file is extended
+    rather than overwritten.
+    """
+
+    def __init__(self, path: Path, samplerate: int = 16000, channels: int = 1):
+        self.path = Path(path)
+        self.samplerate = samplerate
+        self.channels = channels
+        self.frames_written = 0
+        self._queue: "queue.Queue[Optional[np.ndarray]]" = queue.Queue()
+        self._error: Optional[Exception] = None
+        self._file = self._open()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _open(self) -> sf.SoundFile:
+        if self.path.exists():
+            f = sf.SoundFile(self.path, "r+")
+            f.seek(0, sf.SEEK_END)
+            return f
+        return sf.SoundFile(
+            self.path,
+            "w",
+            self.samplerate,
+            self.channels,
+            subtype="FLOAT",
+            format="RF64",
+        )
+
+    def write(self, block: np.ndarray) -> None:
+        """Queue a block for writing; the caller must not reuse it afterwards."""
+        self._queue.put(block)
+
+    def close(self) -> Path:
+        """Flush queued blocks, close the file and return its path."""
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        if self._error is not None:
+            raise RuntimeError(f"Error writing audio: {str(self._error)}")
+        return self.path
+
+    def _run(self) -> None:
+        while True:
+            block = self._queue.get()
+            if block is None:
+                break
+            if self._error is not None:
+                continue
+            try:
+                self._file.write(block)
+                self.frames_written += len(block)
+            except Exception as e:
+                self._error = e
 
 
 class AudioDevice:
@@ -7,20 +205,46 @@ class AudioDevice:
 
     def __init__(self):
         self._stream: Optional[sd.InputStream] = None
+        self._writer: Optional[AudioFileWriter] = None
+
+    @property
+    def spilling(self) -> bool:
+        """Whether captured blocks are being written to disk."""
+        return self._writer is not None
 
-    def start_recording(self, callback: Callable) -> None:
-        """Start recording audio using the provided callback."""
+    def start_recording(
+        self, callback: Callable, spill_path: Optional[Path] = None
+    ) -> None:
+        """Start recording audio using the provided callback.
+
+        With ``spill_path`` set, blocks passed to ``write`` are streamed to that
+        file until ``close_spill`` is called.
+        """
         try:
+            if spill_path is not None:
+                self._writer = AudioFileWriter(spill_path)
             self._stream = sd.InputStream(
                 callback=callback, channels=1, samplerate=16000
             )
             self._stream.start()
         except Exception as e:
+            self.close_spill()
             raise RuntimeError(f"Error starting recording: {str(e)}") from e
 
+    def write(self, block: np.ndarray) -> None:
+        """Append a captured block to the spill file."""
+        self._writer.write(block)
+
     def stop_recording(self) -> None:
         """Stop the current recording."""
         if self._stream is not None:
             self._stream.stop()
             self._stream.close()
             self._stream = None
+
+    def close_spill(self) -> Optional[Path]:
+        """Finish writing the spill file and return its path, if any."""
+        if self._writer is None:
+            return None
+        writer, self._writer = self._writer, None
+        return writer.close()
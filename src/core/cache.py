@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import zipfile
+import zlib
+from pathlib import Path
+from typing import List, Optional, Tuple
+import numpy as np
+from core.results import Segment, Word
+from core.speakers import Turn
+
+# Bump when a change to decoding or diarization makes cached results stale
+PIPELINE_VERSION = 1
+
+
+def audio_digest(waveform: np.ndarray) -> str:
+    """Content hash of a float32 waveform."""
+    waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+    return hashlib.blake2b(memoryview(waveform).cast("B"), digest_size=20).hexdigest()
+
+
+def _pack_segments(segments, language: str) -> dict:
+    """Flatten segments and their words into parallel arrays."""
+    segment_words = [getattr(segment, "words", None) for segment in segments]
+    words = [word for group in segment_words for word in (group or [])]
+    return {
+        "language": np.array(language or ""),
+        "start": np.array([s.start for s in segments], dtype=np.float64),
+        "end": np.array([s.end for s in segments], dtype=np.float64),
+        "text": np.array([s.text for s in segments], dtype=np.str_),
+        # -1 marks a segment decoded without word timestamps
+        "word_count": np.array(
+            [-1 if group is None else len(group) for group in segment_words],
+            dtype=np.int32,
+        ),
+        "word_start": np.array([w.start for w in words], dtype=np.float64),
+        "word_end": np.array([w.end for w in words], dtype=np.float64),
+        "word": np.array([w.word for w in words], dtype=np.str_),
+        "word_probability": np.array([w.probability for w in words], dtype=np.float64),
+    }
+
+
+def _unpack_segments(data) -> Tuple[List[Segment], str]:
+    words = [
+        Word(float(start), float(end), str(word), float(probability))
+        for start, end, word, probability in zip(
+            data["word_start"], data["word_end"], data["word"], data["word_probability"]
+        )
+    ]
+    segments, offset = [], 0
+    for start, end, text, count in zip(
+        data["start"], data["end"], data["text"], data["word_count"]
+    ):
+        segment_words = None
+        if count >= 0:
+            segment_words = words[offset : offset + count]
+            offset += count
+        segments.append(Segment(float(start), float(end), str(text), segment_words))
+    return segments, str(data["language"])
+
+
+def _pack_turns(turns) -> dict:
+    return {
+        "start": np.array([t.start for t in turns], dtype=np.float64),
+        "end": np.array([t.end for t in turns], dtype=np.float64),
+        "speaker": np.array([t.speaker for t in turns], dtype=np.str_),
+    }
+
+
+def _unpack_turns(data) -> List[Turn]:
+    return [
+        Turn(float(start), float(end), str(speaker))
+        for start, end, speaker in zip(data["start"], data["end"], data["speaker"])
+    ]
+
+
+class ResultCache:
+    """Content-addressed store of transcriptions and diarizations.
+
+    Entries are keyed by the audio's content hash, the settings that produced
+    them and ``PIPELINE_VERSION``, and stored as compressed ``.npz`` arrays.
+    Transcripts and diarizations are cached separately, so re-running only
+    the merge step reuses both. Reads refresh an entry's modification time,
+    and writes evict the least recently used entries beyond ``max_bytes``.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def get_segments(
+        self, digest: str, **settings
+    ) -> Optional[Tuple[List[Segment], str]]:
+        """Cached ``(segments, language)`` for the audio, or None."""
+        data = self._load(self._path("asr", digest, settings))
+        return None if data is None else _unpack_segments(data)
+
+    def put_segments(self, digest: str, segments, language: str, **settings) -> None:
+        self._store(
+            self._path("asr", digest, settings), _pack_segments(segments, language)
+        )
+
+    def get_turns(self, digest: str, **settings) -> Optional[List[Turn]]:
+        """Cached diarization turns for the audio, or None."""
+        data = self._load(self._path("diarization", digest, settings))
+        return None if data is None else _unpack_turns(data)
+
+    def put_turns(self, digest: str, turns, **settings) -> None:
+        self._store(self._path("diarization", digest, settings), _pack_turns(turns))
+
+    def size(self) -> int:
+        """Total bytes held by cache entries."""
+        return sum(path.stat().st_size for path in self.root.glob("*.npz"))
+
+    def _path(self, kind: str, digest: str, settings: dict) -> Path:
+        settings = json.dumps(
+            dict(settings, pipeline_version=PIPELINE_VERSION), sort_keys=True
+        )
+        key = hashlib.blake2b(
+            f"{digest}:{settings}".encode("utf-8"), digest_size=16
+        ).hexdigest()
+        return self.root / f"{kind}-{key}.npz"
+
+    def _load(self, path: Path) -> Optional[dict]:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                arrays = {name: data[name] for name in data.files}
+            os.utime(path)
+            return arrays
+        except (
+            OSError,
+            ValueError,
+            KeyError,
+            EOFError,
+            zipfile.BadZipFile,
+            zlib.error,
+        ):
+            # Missing, evicted mid-read or corrupt entries count as misses
+            return None
+
+    def _store(self, path: Path, arrays: dict) -> None:
+        fd, tmp_name = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = []
+            for entry in self.root.glob("*.npz"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry))
+            total = sum(size for _, size, _ in entries)
+            for _, size, entry in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
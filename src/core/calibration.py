@@ -0,0 +1,101 @@
+import time
+from typing import Callable, List, Optional, Sequence, Tuple
+import numpy as np
+
+# Tried from most to least accurate; the first also provides the reference
+DEFAULT_MODELS = ["turbo", "small", "base"]
+CPU_COMPUTE_TYPES = ["int8", "int8_float32", "float32"]
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance divided by the reference length."""
+    ref, hyp = reference.lower().split(), hypothesis.lower().split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def measure(model, audio: np.ndarray, beam_size: int = 5) -> Tuple[float, str]:
+    """Real-time factor and transcript of one full decode of ``audio``."""
+    start = time.perf_counter()
+    segments, _ = model.transcribe(audio, beam_size=beam_size)
+    text = " ".join(segment.text.strip() for segment in segments)
+    return (time.perf_counter() - start) / (len(audio) / 16000), text
+
+
+def calibrate(
+    audio: np.ndarray,
+    candidates: Sequence[Tuple[str, str]],
+    max_rtf: float,
+    max_wer: float,
+    reference: Optional[str] = None,
+    device: str = "cpu",
+    cpu_threads: int = 0,
+    beam_size: int = 5,
+    log: Callable[[str], None] = print,
+) -> dict:
+    """Pick the fastest (model, compute type) meeting both targets.
+
+    Without a ``reference`` transcript, accuracy is measured against the
+    first candidate that loads, so list candidates from most to least
+    accurate. Raises RuntimeError if no candidate meets the targets.
+    """
+    from faster_whisper import WhisperModel
+
+    results: List[dict] = []
+    for model_name, compute_type in candidates:
+        try:
+            model = WhisperModel(
+                model_name,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+            )
+            # Warm up so one-off allocation does not count against the model
+            measure(model, audio[: 16000 * 5], beam_size)
+            rtf, text = measure(model, audio, beam_size)
+        except Exception as e:
+            log(f"Skipping {model_name} {compute_type}: {e}")
+            continue
+        del model
+        if reference is None:
+            reference = text
+        result = {
+            "whisper_model": model_name,
+            "compute_type": compute_type,
+            "rtf": rtf,
+            "wer": word_error_rate(reference, text),
+        }
+        log(
+            f"{model_name:<10} {compute_type:<13} RTF {rtf:6.3f}  "
+            f"WER {result['wer']:6.1%}"
+        )
+        results.append(result)
+
+    eligible = [r for r in results if r["rtf"] <= max_rtf and r["wer"] <= max_wer]
+    if not eligible:
+        raise RuntimeError(
+            f"No model meets RTF <= {max_rtf} and WER <= {max_wer:.0%}; "
+            "relax the targets or try smaller models"
+        )
+    best = min(eligible, key=lambda r: r["rtf"])
+    return dict(
+        best,
+        max_rtf=max_rtf,
+        max_wer=max_wer,
+        cpu_threads=cpu_threads,
+        candidates=results,
+        calibrated_at=time.strftime("%Y-%m-%dT%H:%M:%S"),
+    )
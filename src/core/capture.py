@@ -0,0 +1,214 @@
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+import numpy as np
+import sounddevice as sd
+from core.audio import AudioBuffer, BlockQueue
+
+SAMPLE_RATE = 16000
+
+
+class InputChannel(NamedTuple):
+    """One channel of an input device, recorded and transcribed on its own."""
+
+    # PortAudio device index or name substring; None for the default input
+    device: Union[int, str, None]
+    # Zero-based channel of the device
+    channel: int
+    name: str
+
+
+class ChannelRecording(NamedTuple):
+    """A captured channel at its device's native sample rate."""
+
+    name: str
+    audio: np.ndarray
+    sample_rate: int
+    # Seconds between the first device starting and this channel's device
+    offset: float
+
+
+class _DeviceState:
+    """What one device's stream callback records, written only by its thread."""
+
+    def __init__(self, rate: int):
+        self.rate = rate
+        self.blocks = BlockQueue()
+        # Monotonic time the first block was sampled, once it arrives
+        self.started: Optional[float] = None
+        self.input_overflows = 0
+
+
+def parse_inputs(spec: str) -> List[InputChannel]:
+    """Parse comma-separated ``DEVICE:CHANNEL[=NAME]`` entries.
+
+    Devices are PortAudio indices or name substrings, or empty for the
+    default input; channels count from 1. Unnamed channels are called
+    ``Channel N`` after their position in the list. Names may not contain
+    path separators.
+    """
+    inputs: List[InputChannel] = []
+    for position, entry in enumerate(
+        (entry.strip() for entry in spec.split(",") if entry.strip()), start=1
+    ):
+        source, _, name = entry.partition("=")
+        device, separator, channel = source.strip().rpartition(":")
+        if not separator or not channel.strip().isdigit() or int(channel) < 1:
+            raise ValueError(
+                f"Invalid input {entry!r}; expected DEVICE:CHANNEL[=NAME], "
+                "with channels counted from 1"
+            )
+        name = name.strip()
+        if any(character in name for character in "/\\\0"):
+            raise ValueError(f"Input name {name!r} may not contain / or \\")
+        device = device.strip()
+        inputs.append(
+            InputChannel(
+                int(device) if device.isdigit() else (device or None),
+                int(channel) - 1,
+                name or f"Channel {position}",
+            )
+        )
+    names = [entry.name for entry in inputs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate input name: {', '.join(duplicates)}")
+    seen = set()
+    for entry in inputs:
+        if (entry.device, entry.channel) in seen:
+            raise ValueError(
+                f"Input {entry.device}:{entry.channel + 1} is listed more than once"
+            )
+        seen.add((entry.device, entry.channel))
+    return inputs
+
+
+class MultiChannelCapture:
+    """Records several channels from one or more input devices at once.
+
+    Each device gets a single stream carrying the channels it needs, opened
+    at 16 kHz when the device supports it and at its native rate otherwise,
+    so audio is only resampled when the hardware requires it. Stream
+    callbacks only queue blocks; ``drain`` splits them into one buffer per
+    channel. Devices start at slightly different moments, so each
+    recording carries its device's offset from the first one.
+    """
+
+    def __init__(self, inputs: Sequence[InputChannel], sample_rate: int = SAMPLE_RATE):
+        self.inputs = list(inputs)
+        self.sample_rate = sample_rate
+        self._devices: Dict[Union[int, str, None], List[InputChannel]] = {}
+        for entry in self.inputs:
+            self._devices.setdefault(entry.device, []).append(entry)
+        self._streams: list = []
+        # Filled in before any stream starts, so callbacks never resize it
+        self._states: Dict[Union[int, str, None], _DeviceState] = {}
+        self._buffers: Dict[str, AudioBuffer] = {}
+
+    @property
+    def dropped(self) -> int:
+        """Blocks discarded because ``drain`` fell behind the callbacks."""
+        return sum(state.blocks.dropped for state in self._states.values())
+
+    @property
+    def input_overflows(self) -> int:
+        return sum(state.input_overflows for state in self._states.values())
+
+    def start(self) -> None:
+        """Open and start one stream per device."""
+        try:
+            for device, entries in self._devices.items():
+                channels = max(entry.channel for entry in entries) + 1
+                state = self._states[device] = _DeviceState(
+                    self._device_rate(device, channels)
+                )
+                for entry in entries:
+                    self._buffers[entry.name] = AudioBuffer(
+                        chunk_frames=state.rate * 30
+                    )
+                stream = sd.InputStream(
+                    device=device,
+                    channels=channels,
+                    samplerate=state.rate,
+                    callback=self._callback(state),
+                )
+                self._streams.append(stream)
+                stream.start()
+        except Exception as e:
+            self._close_streams()
+            raise RuntimeError(f"Error starting recording: {str(e)}") from e
+
+    def _device_rate(self, device, channels: int) -> int:
+        """16 kHz if the device can capture at it, else its default rate."""
+        try:
+            sd.check_input_settings(
+                device=device, channels=channels, samplerate=self.sample_rate
+            )
+            return self.sample_rate
+        except Exception:
+            return int(sd.query_devices(device, "input")["default_samplerate"])
+
+    @staticmethod
+    def _callback(state: _DeviceState):
+        def callback(indata, frames, time_info, status):
+            # Runs on this device's PortAudio thread and only touches its state
+            if status and status.input_overflow:
+                state.input_overflows += 1
+            if state.started is None:
+                # How long ago the first sample hit the ADC, in stream time
+                latency = time_info.currentTime - time_info.inputBufferAdcTime
+                if not time_info.inputBufferAdcTime or latency < 0:
+                    # Some host APIs leave the ADC time unset
+                    latency = frames / state.rate
+                state.started = time.monotonic() - latency
+            state.blocks.put(indata.copy())
+
+        return callback
+
+    def drain(self) -> Optional[float]:
+        """Move queued blocks into the channel buffers.
+
+        Returns the RMS level of the loudest channel, or None if no audio
+        arrived since the last call.
+        """
+        level = None
+        for device, entries in self._devices.items():
+            state = self._states.get(device)
+            blocks = state.blocks.get_all() if state is not None else []
+            if not blocks:
+                continue
+            columns = [entry.channel for entry in entries]
+            energy = np.zeros(len(columns))
+            for block in blocks:
+                for entry in entries:
+                    self._buffers[entry.name].append(block[:, entry.channel])
+                energy += np.square(block[:, columns], dtype=np.float64).sum(axis=0)
+            frames = sum(len(block) for block in blocks)
+            loudest = float(np.sqrt(energy.max() / max(frames, 1)))
+            level = loudest if level is None else max(level, loudest)
+        return level
+
+    def stop(self) -> List[ChannelRecording]:
+        """Stop every stream and return each channel's recording."""
+        self._close_streams()
+        self.drain()
+        started = [s.started for s in self._states.values() if s.started is not None]
+        first = min(started, default=0.0)
+        recordings = []
+        for entry in self.inputs:
+            buffer = self._buffers.pop(entry.name, None)
+            if buffer is None:
+                continue
+            state = self._states[entry.device]
+            start = first if state.started is None else state.started
+            recordings.append(
+                ChannelRecording(
+                    entry.name, buffer.consolidate(), state.rate, start - first
+                )
+            )
+        return recordings
+
+    def _close_streams(self) -> None:
+        while self._streams:
+            stream = self._streams.pop()
+            stream.stop()
+            stream.close()
@@ -0,0 +1,224 @@
+import math
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from core.speakers import Turn
+
+# pyannote 3.1 slides a 10 s segmentation window in 1 s steps and embeds up to
+# three local speakers per window, then clusters all of those embeddings at
+# once, so its memory grows with the square of the recording length.
+LOCAL_SPEAKERS_PER_SECOND = 3
+EMBEDDING_DIM = 256
+MIN_CHUNK_SECONDS = 120.0
+OVERLAP_SECONDS = 30.0
+
+# The pipeline returns, for one chunk, its turns and an embedding per label
+ChunkDiarizer = Callable[[np.ndarray], Tuple[List[Turn], Dict[str, np.ndarray]]]
+
+
+def estimate_memory_mb(seconds: float, sample_rate: int = 16000) -> float:
+    """Approximate peak memory of diarizing ``seconds`` of audio in one pass."""
+    embeddings = LOCAL_SPEAKERS_PER_SECOND * seconds
+    audio_bytes = seconds * sample_rate * 4
+    embedding_bytes = embeddings * EMBEDDING_DIM * 4
+    # Condensed pairwise distances between all embeddings, as float64
+    distance_bytes = embeddings * (embeddings - 1) / 2 * 8
+    return (audio_bytes + embedding_bytes + distance_bytes) / 2**20
+
+
+def chunk_seconds(max_mb: float, sample_rate: int = 16000) -> float:
+    """The longest chunk whose estimated memory stays under ``max_mb``."""
+    # Solve estimate_memory_mb(s) == max_mb, a quadratic in s
+    n = LOCAL_SPEAKERS_PER_SECOND
+    a = 4 * n * n
+    b = sample_rate * 4 + n * EMBEDDING_DIM * 4 - 4 * n
+    c = -max_mb * 2**20
+    seconds = (-b + math.sqrt(b * b - 4 * a * c)) / (2 * a)
+    return max(seconds, MIN_CHUNK_SECONDS)
+
+
+def plan_chunks(
+    frames: int, chunk_frames: int, overlap_frames: int
+) -> List[Tuple[int, int, int, int]]:
+    """Split ``frames`` into overlapping chunks.
+
+    Returns ``(start, end, keep_start, keep_end)`` for each chunk, where the
+    keep ranges tile the recording exactly: each overlap is split halfway,
+    so every turn comes from the chunk that saw the most context around it.
+    """
+    if frames <= chunk_frames:
+        return [(0, frames, 0, frames)]
+    step = chunk_frames - overlap_frames
+    starts = list(range(0, frames - overlap_frames, step))
+    chunks = []
+    for index, start in enumerate(starts):
+        last = index == len(starts) - 1
+        end = frames if last else start + chunk_frames
+        keep_start = 0 if index == 0 else start + overlap_frames // 2
+        keep_end = frames if last else end - overlap_frames // 2
+        chunks.append((start, end, keep_start, keep_end))
+    return chunks
+
+
+class SpeakerStitcher:
+    """Maps each chunk's local speaker labels onto recording-wide speakers.
+
+    A local speaker joins the known speaker with the most similar centroid
+    (cosine similarity of at least ``threshold``), each known speaker taking
+    at most one local speaker per chunk. Speakers without a usable embedding
+    fall back to whoever they overlap most in the previous chunk's overlap.
+    """
+
+    def __init__(self, threshold: float = 0.4):
+        self.threshold = threshold
+        # None for speakers only ever matched by overlap
+        self._centroids: List[Optional[np.ndarray]] = []
+        self._weights: List[float] = []
+
+    @property
+    def speakers(self) -> int:
+        return len(self._centroids)
+
+    def assign(
+        self,
+        turns: Sequence[Turn],
+        embeddings: Dict[str, np.ndarray],
+        previous: Sequence[Turn] = (),
+    ) -> Dict[str, int]:
+        """Return the global speaker index for each local label in ``turns``.
+
+        ``previous`` holds the last chunk's turns inside this chunk's overlap,
+        already labelled with global indices.
+        """
+        durations: Dict[str, float] = {}
+        for turn in turns:
+            durations[turn.speaker] = durations.get(turn.speaker, 0.0) + (
+                turn.end - turn.start
+            )
+        usable = {}
+        for label in durations:
+            if embeddings.get(label) is None:
+                continue
+            vector = np.asarray(embeddings[label], dtype=np.float64).reshape(-1)
+            norm = np.linalg.norm(vector)
+            if np.isfinite(norm) and norm > 0:
+                usable[label] = vector / norm
+
+        mapping: Dict[str, int] = {}
+        known = [i for i, c in enumerate(self._centroids) if c is not None]
+        if usable and known:
+            labels = list(usable)
+            centroids = np.stack([self._centroids[i] for i in known])
+            centroids /= np.linalg.norm(centroids, axis=1, keepdims=True)
+            similarity = np.stack([usable[label] for label in labels]) @ centroids.T
+            taken = set()
+            # Greedily take the most similar pairs first
+            for flat in np.argsort(similarity, axis=None)[::-1]:
+                row, column = np.unravel_index(flat, similarity.shape)
+                if similarity[row, column] < self.threshold:
+                    break
+                if labels[row] in mapping or known[column] in taken:
+                    continue
+                mapping[labels[row]] = known[column]
+                taken.add(known[column])
+
+        for label in durations:
+            if label in mapping:
+                continue
+            if label not in usable:
+                speaker = self._by_overlap(label, turns, previous)
+                if speaker is not None:
+                    mapping[label] = speaker
+                    continue
+            self._centroids.append(None)
+            self._weights.append(0.0)
+            mapping[label] = len(self._centroids) - 1
+
+        for label, speaker in mapping.items():
+            if label in usable:
+                self._update(speaker, usable[label], durations[label])
+        return mapping
+
+    @staticmethod
+    def _by_overlap(
+        label: str, turns: Sequence[Turn], previous: Sequence[Turn]
+    ) -> Optional[int]:
+        overlaps: Dict[int, float] = {}
+        for turn in turns:
+            if turn.speaker != label:
+                continue
+            for other in previous:
+                overlap = min(turn.end, other.end) - max(turn.start, other.start)
+                if overlap > 0:
+                    overlaps[other.speaker] = overlaps.get(other.speaker, 0.0) + overlap
+        if not overlaps:
+            return None
+        return max(overlaps, key=overlaps.get)
+
+    def _update(self, speaker: int, vector: np.ndarray, duration: float) -> None:
+        centroid = self._centroids[speaker]
+        if centroid is None or len(centroid) != len(vector):
+            self._centroids[speaker] = vector.copy()
+            self._weights[speaker] = duration
+            return
+        # Running mean weighted by how much speech each chunk contributed
+        weight = self._weights[speaker] + duration
+        centroid += (vector - centroid) * (duration / max(weight, 1e-9))
+        self._weights[speaker] = weight
+
+
+def diarize_in_chunks(
+    waveform: np.ndarray,
+    diarize_chunk: ChunkDiarizer,
+    chunk_frames: int,
+    overlap_frames: int,
+    threshold: float = 0.4,
+    sample_rate: int = 16000,
+    on_chunk: Optional[Callable[[int, int], None]] = None,
+) -> List[Turn]:
+    """Diarize a long recording chunk by chunk, with stitched speaker labels.
+
+    Only one chunk is diarized at a time, so peak memory is bounded by the
+    chunk length rather than the recording's. ``on_chunk(index, total)`` is
+    called before each chunk, e.g. to report progress or cancel.
+    """
+    chunks = plan_chunks(len(waveform), chunk_frames, overlap_frames)
+    stitcher = SpeakerStitcher(threshold)
+    turns: List[Turn] = []
+    previous: List[Turn] = []
+    # Turns cut at the end of the previous chunk's keep range, by speaker
+    cut: Dict[int, int] = {}
+    for index, (start, end, keep_start, keep_end) in enumerate(chunks):
+        if on_chunk is not None:
+            on_chunk(index, len(chunks))
+        offset = start / sample_rate
+        local_turns, embeddings = diarize_chunk(waveform[start:end])
+        local_turns = [
+            Turn(offset + t.start, offset + t.end, t.speaker) for t in local_turns
+        ]
+        labels = stitcher.assign(local_turns, embeddings, previous)
+
+        keep_from, keep_to = keep_start / sample_rate, keep_end / sample_rate
+        previous = [
+            Turn(t.start, t.end, labels[t.speaker])
+            for t in local_turns
+            if t.end > keep_to
+        ]
+        next_cut: Dict[int, int] = {}
+        for turn in local_turns:
+            turn_start, turn_end = max(turn.start, keep_from), min(turn.end, keep_to)
+            if turn_end <= turn_start:
+                continue
+            speaker = labels[turn.speaker]
+            if turn_start == keep_from and speaker in cut:
+                # Rejoin a turn that was split at the boundary between chunks
+                joined = cut.pop(speaker)
+                turns[joined] = Turn(turns[joined].start, turn_end, speaker)
+                position = joined
+            else:
+                turns.append(Turn(turn_start, turn_end, speaker))
+                position = len(turns) - 1
+            if turn_end == keep_to:
+                next_cut[speaker] = position
+        cut = next_cut
+    turns.sort(key=lambda t: t.start)
+    return [Turn(t.start, t.end, f"SPEAKER_{t.speaker:02d}") for t in turns]
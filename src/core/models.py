@@ -1,6 +1,44 @@
-from typing import Callable
-from faster_whisper import WhisperModel
-from pyannote.audio import Pipeline
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, Optional, Tuple
+from core.telemetry import Span, Tracer
+
+DIARIZATION_MODEL = "pyannote/speaker-diarization"
+
+
+@contextmanager
+def hub_offline():
+    """Resolve Hugging Face Hub files from the local cache, without network calls."""
+    from huggingface_hub import constants
+
+    previous = constants.HF_HUB_OFFLINE
+    constants.HF_HUB_OFFLINE = True
+    try:
+        yield
+    finally:
+        constants.HF_HUB_OFFLINE = previous
+
+
+def load_diarization_pipeline(token: Optional[str]):
+    """Load the pyannote pipeline, which may come from the local cache.
+
+    pyannote.audio 3.x names the token ``use_auth_token`` and passes it on to
+    ``hf_hub_download``, which huggingface_hub 1.0 no longer accepts; later
+    pyannote releases call it ``token``.
+    """
+    from pyannote.audio import Pipeline
+
+    parameters = inspect.signature(Pipeline.from_pretrained).parameters
+    argument = "token" if "token" in parameters else "use_auth_token"
+    pipeline = Pipeline.from_pretrained(DIARIZATION_MODEL, **{argument: token})
+    if pipeline is None:
+        raise RuntimeError(
+            f"{DIARIZATION_MODEL} is unavailable; check HF_TOKEN "
+            "and that the model's user conditions have been accepted"
+        )
+    return pipeline
 
 
 class ModelManager:
@@ -11,58 +49,177 @@ class ModelManager:
         config: dict,
         log_callback: Callable[[str], None],
         progress_callback: Callable[[float, str], None],
+        tracer: Optional[Tracer] = None,
     ):
         self.config = config
         self.write_log = log_callback
         self.update_progress = progress_callback
+        self.tracer = tracer or Tracer()
+        self._load_span: Optional[Span] = None
         self.whisper_model = None
+        self.whisper_pipeline = None
         self.diarization_pipeline = None
+        self.diarization_workers = None
+        self.load_seconds = None
+
+    @property
+    def speaker_embedding(self):
+        """The loaded pipeline's speaker embedding model, for live diarization."""
+        return getattr(self.diarization_pipeline, "_embedding", None)
 
     def load_models(self):
         """Load and initialize Whisper and Pyannote models."""
+        started = time.perf_counter()
         try:
-            self._load_whisper()
-            self._load_pyannote()
-            self.write_log("\nAll models loaded successfully! Ready to record.")
+            with self.tracer.span("models.load") as self._load_span:
+                self.load_cached_first([self._load_whisper, self._load_diarization])
+            self.load_seconds = time.perf_counter() - started
+            self.write_log(
+                f"\nAll models loaded in {self.load_seconds:.1f}s! Ready to record."
+            )
             self.update_progress(1.0, "Ready to record")
         except Exception as e:
+            # Workers started by a loader that succeeded are not used
+            self.shutdown()
             error_msg = f"Failed to load models: {str(e)}"
             self.write_log(f"Error: {error_msg}")
             raise RuntimeError(error_msg)
 
-    def _load_whisper(self):
-        """Load the Whisper model."""
-        self.write_log(
-            f"Using Whisper model: {self.config['whisper_model']} on "
-            f"{self.config['device']}"
+    def load_cached_first(self, loaders: List[Callable[[bool], None]]) -> None:
+        """Run loaders concurrently, resolving weights from the local cache first.
+
+        Only loaders whose weights are missing from the cache are retried with
+        network access, so a populated cache never touches the Hub.
+        """
+        # The Hub's offline flag is process-wide, so it is only switched
+        # between rounds, never while a loader is running
+        with hub_offline():
+            failed = self._run_concurrently(loaders, local_files_only=True)
+        if not failed:
+            return
+        self.write_log("Some models are not cached yet; downloading...")
+        failed = self._run_concurrently(
+            [loader for loader, _ in failed], local_files_only=False
         )
-        self.write_log("Downloading Whisper model (this may take a while)...")
-        self.update_progress(0.2, "Downloading Whisper model...")
+        if failed:
+            raise failed[0][1]
 
-        try:
-            self.whisper_model = WhisperModel(
-                self.config["whisper_model"],
-                device=self.config["device"],
-                compute_type=self.config["compute_type"],
-                local_files_only=False,
-                download_root=None,
-            )
-            self.write_log("✓ Whisper model loaded successfully")
-        except Exception as e:
-            self.write_log(f"Error loading Whisper model: {str(e)}")
-            raise
+    @staticmethod
+    def _run_concurrently(
+        loaders: List[Callable[[bool], None]], local_files_only: bool
+    ) -> List[Tuple[Callable[[bool], None], BaseException]]:
+        with ThreadPoolExecutor(max_workers=len(loaders)) as pool:
+            futures = [
+                (loader, pool.submit(loader, local_files_only)) for loader in loaders
+            ]
+        return [
+            (loader, future.exception())
+            for loader, future in futures
+            if future.exception() is not None
+        ]
+
+    def _load_whisper(self, local_files_only: bool = False):
+        """Load the Whisper model."""
+        from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+        with self.tracer.span(
+            "models.load.whisper",
+            self._load_span,
+            model=self.config["whisper_model"],
+            local_files_only=local_files_only,
+        ):
+            if local_files_only:
+                self.write_log(
+                    f"Using Whisper model: {self.config['whisper_model']} on "
+                    f"{self.config['device']} ({self.config['compute_type']})"
+                )
+                self.update_progress(0.2, "Loading Whisper model...")
+            else:
+                self.write_log("Downloading Whisper model (this may take a while)...")
+                self.update_progress(0.2, "Downloading Whisper model...")
+
+            try:
+                self.whisper_model = WhisperModel(
+                    self.config["whisper_model"],
+                    device=self.config["device"],
+                    compute_type=self.config["compute_type"],
+                    cpu_threads=self.config.get("cpu_threads", 0),
+                    # One worker per concurrent transcription on the asr stage
+                    num_workers=max(
+                        self.config.get("whisper_num_workers", 1),
+                        self.config.get("asr_workers", 1),
+                    ),
+                    local_files_only=local_files_only,
+                    download_root=None,
+                )
+                if self.config.get("whisper_batch_size", 1) > 1:
+                    # Decodes a recording's VAD chunks in batches instead of one by one
+                    self.whisper_pipeline = BatchedInferencePipeline(self.whisper_model)
+                self.write_log("✓ Whisper model loaded successfully")
+            except Exception as e:
+                if not local_files_only:
+                    self.write_log(f"Error loading Whisper model: {str(e)}")
+                raise
+
+    def _load_diarization(self, local_files_only: bool = False):
+        """Load the diarization backend selected in the config."""
+        if self.config.get("diarization_backend") == "process":
+            # Worker processes resolve their own cache; see core.workers
+            self._start_diarization_workers()
+        else:
+            self._load_pyannote(local_files_only)
 
-    def _load_pyannote(self):
+    def _load_pyannote(self, local_files_only: bool = False):
         """Load the Pyannote diarization model."""
-        self.write_log("\nInitializing Pyannote diarization model...")
-        self.write_log("Note: First run will download several GB of model files...")
-        self.update_progress(0.5, "Loading Pyannote model...")
+        with self.tracer.span(
+            "models.load.pyannote",
+            self._load_span,
+            model=DIARIZATION_MODEL,
+            local_files_only=local_files_only,
+        ):
+            if local_files_only:
+                self.write_log("\nInitializing Pyannote diarization model...")
+                self.update_progress(0.5, "Loading Pyannote model...")
+            else:
+                self.write_log(
+                    "Note: First run will download several GB of model files..."
+                )
+                self.update_progress(0.5, "Downloading Pyannote model...")
 
-        try:
-            self.diarization_pipeline = Pipeline.from_pretrained(
-                "pyannote/speaker-diarization", use_auth_token=self.config["hf_token"]
-            )
-            self.write_log("✓ Pyannote model loaded successfully")
-        except Exception as e:
-            self.write_log(f"Error loading Pyannote model: {str(e)}")
-            raise
+            try:
+                self.diarization_pipeline = load_diarization_pipeline(
+                    self.config["hf_token"]
+                )
+                self.write_log("✓ Pyannote model loaded successfully")
+            except Exception as e:
+                if not local_files_only:
+                    self.write_log(f"Error loading Pyannote model: {str(e)}")
+                raise
+
+    def _start_diarization_workers(self):
+        """Load the Pyannote model inside dedicated worker processes."""
+        from core.workers import DiarizationWorkerPool
+
+        if self.diarization_workers is not None:
+            # Already warm; a second pool would leave the first one's processes
+            return
+        with self.tracer.span("models.load.diarization_workers", self._load_span):
+            self.write_log("\nStarting diarization worker process...")
+            self.update_progress(0.5, "Loading Pyannote model in worker...")
+
+            try:
+                self.diarization_workers = DiarizationWorkerPool(
+                    self.config, workers=self.config.get("diarization_workers", 1)
+                )
+                self.diarization_workers.warm_up().result()
+                self.write_log("✓ Pyannote model loaded in worker process")
+            except Exception as e:
+                self.write_log(f"Error loading Pyannote model: {str(e)}")
+                self.shutdown()
+                raise
+
+    def shutdown(self) -> None:
+        """Stop the diarization worker processes, if any were started."""
+        if self.diarization_workers is not None:
+            self.diarization_workers.shutdown()
+            self.diarization_workers = None
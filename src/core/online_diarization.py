@@ -0,0 +1,126 @@
+import bisect
+from typing import Callable, List, Optional
+import numpy as np
+from core.speakers import Turn
+from core.vad import frame_energy_db
+
+
+def pyannote_embedder(embedding) -> Callable[[np.ndarray], np.ndarray]:
+    """Adapt a pyannote ``PretrainedSpeakerEmbedding`` to one mono window."""
+    import torch
+
+    def embed(audio: np.ndarray) -> np.ndarray:
+        return embedding(torch.from_numpy(audio)[None, None, :])[0]
+
+    return embed
+
+
+class OnlineDiarizer:
+    """Labels speakers live by embedding fixed windows and clustering them.
+
+    Every ``step_s`` of audio, the most recent ``window_s`` is embedded and
+    assigned to the closest speaker centroid by cosine similarity, or to a new
+    speaker when none is within ``threshold``. Centroids only ever absorb new
+    embeddings, so a label never changes once given. Work per step and memory
+    are fixed, so the cost per hour of audio is constant.
+    """
+
+    def __init__(
+        self,
+        embed: Callable[[np.ndarray], np.ndarray],
+        sample_rate: int = 16000,
+        window_s: float = 2.0,
+        step_s: float = 1.0,
+        threshold: float = 0.4,
+        threshold_db: float = -40.0,
+        max_speakers: Optional[int] = None,
+    ):
+        self.embed = embed
+        self.sample_rate = sample_rate
+        self.window_frames = int(window_s * sample_rate)
+        self.step_frames = int(step_s * sample_rate)
+        self.threshold = threshold
+        self.threshold_db = threshold_db
+        self.max_speakers = max_speakers
+
+        self.turns: List[Turn] = []
+        self._turn_starts: List[float] = []
+        self._centroids: List[np.ndarray] = []
+        self._window = np.zeros(self.window_frames, dtype=np.float32)
+        self._received = 0
+        self._since_step = 0
+
+    @property
+    def speakers(self) -> int:
+        return len(self._centroids)
+
+    def push(self, block: np.ndarray) -> List[Turn]:
+        """Add captured samples; returns the turns started or extended by them."""
+        block = block.reshape(-1)
+        updated: List[Turn] = []
+        position = 0
+        while position < len(block):
+            take = min(self.step_frames - self._since_step, len(block) - position)
+            # Slide the window left rather than keeping the whole recording
+            self._window[:-take] = self._window[take:]
+            self._window[-take:] = block[position : position + take]
+            position += take
+            self._received += take
+            self._since_step += take
+            if self._since_step == self.step_frames:
+                self._since_step = 0
+                turn = self._label_step()
+                if turn is not None:
+                    updated.append(turn)
+        return updated
+
+    def speaker_at(self, start: float, end: float) -> Optional[str]:
+        """The speaker overlapping ``[start, end]`` the most, or None."""
+        best, best_overlap = None, 0.0
+        # Turns are in time order and never overlap, so only a few can match
+        index = max(0, bisect.bisect_right(self._turn_starts, start) - 1)
+        for turn in self.turns[index:]:
+            if turn.start >= end:
+                break
+            overlap = min(end, turn.end) - max(start, turn.start)
+            if overlap > best_overlap:
+                best, best_overlap = turn.speaker, overlap
+        return best
+
+    def _label_step(self) -> Optional[Turn]:
+        available = min(self._received, self.window_frames)
+        audio = self._window[-available:]
+        frame_size = self.sample_rate * 30 // 1000
+        levels = frame_energy_db(audio[-self.step_frames :], frame_size)
+        if not len(levels) or np.median(levels) < self.threshold_db:
+            return None
+
+        embedding = np.asarray(self.embed(audio), dtype=np.float64).reshape(-1)
+        norm = np.linalg.norm(embedding)
+        if not np.isfinite(norm) or norm == 0:
+            return None
+        speaker = self._assign(embedding / norm)
+
+        end = self._received / self.sample_rate
+        start = end - self.step_frames / self.sample_rate
+        if self.turns and self.turns[-1].speaker == speaker:
+            previous = self.turns[-1]
+            if abs(previous.end - start) < 1e-6:
+                self.turns[-1] = Turn(previous.start, end, speaker)
+                return self.turns[-1]
+        self.turns.append(Turn(start, end, speaker))
+        self._turn_starts.append(start)
+        return self.turns[-1]
+
+    def _assign(self, embedding: np.ndarray) -> str:
+        if self._centroids:
+            centroids = np.stack(self._centroids)
+            norms = np.linalg.norm(centroids, axis=1)
+            similarity = centroids @ embedding / norms
+            best = int(np.argmax(similarity))
+            full = self.max_speakers is not None and self.speakers >= self.max_speakers
+            if similarity[best] >= self.threshold or full:
+                self._centroids[best] += embedding
+                return f"SPEAKER_{best:02d}"
+        self._centroids.append(embedding.copy())
+        return f"SPEAKER_{len(self._centroids) - 1:02d}"
@@ -1,9 +1,126 @@
-import time
 import traceback
-from concurrent.futures import ThreadPoolExecutor
-from typing import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from math import gcd
+from typing import TYPE_CHECKING, Callable, List, Optional, Sequence, Union
 import numpy as np
 import soundfile as sf
+from core.cache import ResultCache, audio_digest
+from core.chunked_diarization import (
+    OVERLAP_SECONDS,
+    chunk_seconds,
+    diarize_in_chunks,
+    estimate_memory_mb,
+)
+from core.models import DIARIZATION_MODEL
+from core.online_diarization import OnlineDiarizer, pyannote_embedder
+from core.scheduler import Job, JobCancelledError, JobScheduler
+from core.speakers import annotation_to_turns
+from core.store import SegmentStore, TurnStore, merge_channels, save_results
+from core.telemetry import Tracer
+from core.results import shift_segment
+from core.vad import SpeechTimeline, UtteranceSegmenter
+from core.writers import LogBatcher, TranscriptWriters, transcript_line
+
+if TYPE_CHECKING:
+    # Imported for annotations only, so processing does not require PortAudio
+    from core.audio import AudioBuffer
+    from core.capture import ChannelRecording
+
+
+def decode_audio_file(path: Path, sample_rate: int = 16000) -> np.ndarray:
+    """Decode an audio file to contiguous mono float32 at ``sample_rate``.
+
+    Mono float32 WAV/RF64 files, such as spilled recordings, are memory-mapped
+    rather than read, so they are paged in from disk as they are used. Other
+    files libsndfile can read are mixed down block by block.
+    """
+    info = sf.info(path) if sf.check_format(path.suffix.lstrip(".").upper()) else None
+    if info is not None and info.samplerate == sample_rate:
+        offset = _float_wav_data_offset(path, info)
+        if offset is not None and info.frames:
+            # Copy-on-write, so callers may modify the array but not the file
+            mapped = np.memmap(path, np.float32, "c", offset, (info.frames,))
+            return mapped.view(np.ndarray)
+        waveform = np.empty(info.frames, dtype=np.float32)
+        position = 0
+        for block in sf.blocks(
+            path, blocksize=1 << 20, dtype="float32", always_2d=True
+        ):
+            block.mean(axis=1, dtype=np.float32, out=waveform[position:][: len(block)])
+            position += len(block)
+        return waveform[:position]
+    # Compressed or resampled input goes through PyAV, as faster-whisper does
+    from faster_whisper.audio import decode_audio
+
+    return decode_audio(str(path), sampling_rate=sample_rate)
+
+
+def _float_wav_data_offset(path: Path, info) -> Optional[int]:
+    """Byte offset of the samples in a mono float32 WAV or RF64 file, else None."""
+    if (
+        info.format not in ("WAV", "RF64")
+        or info.subtype != "FLOAT"
+        or info.endian not in ("FILE", "LITTLE")
+        or info.channels != 1
+    ):
+        return None
+    with open(path, "rb") as f:
+        if f.read(4) not in (b"RIFF", b"RF64") or f.read(8)[4:] != b"WAVE":
+            return None
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                return None
+            if header[:4] == b"data":
+                return f.tell()
+            # Chunks are padded to an even length
+            size = int.from_bytes(header[4:], "little")
+            f.seek(size + size % 2, 1)
+
+
+def resample_audio(
+    audio: np.ndarray, rate: int, sample_rate: int = 16000
+) -> np.ndarray:
+    """Resample mono float32 audio to ``sample_rate``; a no-op if already there.
+
+    A polyphase filter only computes the samples it keeps, so 48 kHz input
+    costs one filtered output per three input samples.
+    """
+    if rate == sample_rate:
+        return audio
+    from scipy.signal import resample_poly
+
+    factor = gcd(rate, sample_rate)
+    resampled = resample_poly(audio, sample_rate // factor, rate // factor)
+    return resampled.astype(np.float32, copy=False)
+
+
+def results_path(output_dir: Path, timestamp: str) -> Path:
+    return Path(output_dir) / f"results_{timestamp}.npz"
+
+
+def wants_word_timestamps(config: dict) -> bool:
+    """Whether to decode words: for JSONL now, or for re-rendering it later."""
+    return "jsonl" in config.get("output_formats", ()) or bool(
+        config.get("keep_results")
+    )
+
+
+def keep_results(
+    output_dir: Path,
+    timestamp: str,
+    segments: SegmentStore,
+    turns: TurnStore,
+    write_log: Callable[[str], None],
+) -> None:
+    """Save raw segments and turns next to the transcript, for ``render``."""
+    path = results_path(output_dir, timestamp)
+    try:
+        save_results(path, segments, turns)
+        write_log(f"Saved raw results to {path}")
+    except Exception as e:
+        write_log(f"Error saving raw results: {str(e)}")
 
 
 class AudioProcessor:
@@ -14,88 +131,666 @@ class AudioProcessor:
         config: dict,
         model_manager,
         log_callback: Callable[[str], None],
-        progress_callback: Callable[[float, str], None],
+        progress_callback: Callable[..., None],
+        tracer: Optional[Tracer] = None,
     ):
         self.config = config
         self.models = model_manager
         self.write_log = log_callback
         self.update_progress = progress_callback
-        self.thread_pool = ThreadPoolExecutor(max_workers=3)
+        self.tracer = tracer or Tracer()
+        self.scheduler = JobScheduler(
+            stages={
+                "io": config.get("io_workers", 1),
+                "asr": config.get("asr_workers", 1),
+                "diarization": config.get("diarization_workers", 1),
+            },
+            max_active_jobs=config.get("max_active_jobs", 2),
+            max_queued_jobs=config.get("max_queued_jobs", 4),
+        )
+        self.cache: Optional[ResultCache] = None
+        if config.get("cache_dir") and config.get("cache_max_mb"):
+            self.cache = ResultCache(
+                config["cache_dir"], config["cache_max_mb"] * 1024 * 1024
+            )
 
-    def process_audio(self, timestamp: str, audio: np.ndarray) -> None:
-        """Process and save a recording."""
-        self.thread_pool.submit(self._process_audio_task, timestamp, audio)
+    def process_audio(
+        self,
+        timestamp: str,
+        audio: Union["AudioBuffer", Path],
+        block: bool = False,
+        delete_audio: bool = False,
+    ) -> Optional[Job]:
+        """Queue a recording held in memory or already on disk for processing.
 
-    def _process_audio_task(self, timestamp: str, audio: np.ndarray) -> None:
-        """Task to process and save a recording."""
+        Files are deleted afterwards only when ``delete_audio`` is set. Returns
+        None if the job queue is full, after saving the audio to disk.
+        """
         try:
-            self.write_log("Processing audio data...")
-            self.update_progress(0.1, "Preparing audio data...")
-
-            # Save audio file
-            output_dir = self.config["output_dir"]
-            audio_path = output_dir / f"recording_{timestamp}.flac"
-            sf.write(audio_path, audio, 16000, format="FLAC")
-            self.write_log(f"Saved audio to {audio_path}")
-            self.update_progress(0.2, "Audio saved...")
-
-            # Process audio with models
-            future_transcribe = self.thread_pool.submit(
-                self._transcribe_audio, audio_path
+            job = self.scheduler.submit(
+                f"recording_{timestamp}",
+                self._process_audio_task,
+                timestamp,
+                audio,
+                delete_audio,
+                block=block,
             )
-            future_diarize = self.thread_pool.submit(self._diarize_audio, audio_path)
+        except RuntimeError:
+            self.write_log("Processing queue is full; saving the recording instead")
+            if not isinstance(audio, Path):
+                self.scheduler.run_stage(
+                    None, "io", self._archive_recording, timestamp, audio
+                )
+            else:
+                self.write_log(f"Recording kept at {audio}")
+            return None
+        self.write_log(f"Queued job {job.id} for recording {timestamp}")
+        return job
 
-            segments_list = future_transcribe.result()
-            diarization = future_diarize.result()
+    def process_channels(
+        self,
+        timestamp: str,
+        recordings: Sequence["ChannelRecording"],
+        block: bool = False,
+    ) -> Optional[Job]:
+        """Queue channels recorded side by side, one speaker per channel.
 
-            # Save results
-            self._save_results(segments_list, diarization, timestamp)
+        Returns None if the job queue is full, after saving the channels.
+        """
+        try:
+            job = self.scheduler.submit(
+                f"recording_{timestamp}",
+                self._process_channels_task,
+                timestamp,
+                recordings,
+                block=block,
+            )
+        except RuntimeError:
+            self.write_log("Processing queue is full; saving the recording instead")
+            self.scheduler.run_stage(
+                None, "io", self._archive_channels, timestamp, recordings
+            )
+            return None
+        self.write_log(
+            f"Queued job {job.id} for {len(recordings)} channels of "
+            f"recording {timestamp}"
+        )
+        return job
 
-        except Exception as e:
-            self.write_log(f"\nError processing audio: {str(e)}")
-            self.update_progress(1.0, "Error during processing!")
-            traceback.print_exc()
-        finally:
-            # Delete audio file
-            if audio_path.exists():
-                audio_path.unlink()
-                self.write_log(f"Deleted audio file {audio_path}")
+    def cancel(self, job_id: Optional[str] = None) -> Optional[Job]:
+        """Cancel a job, or the most recently queued one if no ID is given."""
+        jobs = self.scheduler.active_jobs()
+        if job_id is not None:
+            jobs = [job for job in jobs if job.id == job_id]
+        if not jobs or not self.scheduler.cancel(jobs[-1].id):
+            return None
+        return jobs[-1]
+
+    def _report(self, job: Job, progress: float, status: str) -> None:
+        """Record a job's progress and forward it to the UI."""
+        job.progress = progress
+        job.status = status
+        self.update_progress(progress, status, job.id)
+
+    def _span(self, job: Optional[Job], name: str, **attributes):
+        """Open a telemetry span nested under the job's span, if there is one."""
+        parent = job.info.get("span") if job is not None else None
+        if job is not None and "audio_seconds" in job.info:
+            attributes.setdefault("audio_seconds", job.info["audio_seconds"])
+        return self.tracer.span(name, parent, **attributes)
+
+    def _process_audio_task(
+        self,
+        job: Job,
+        timestamp: str,
+        audio: Union["AudioBuffer", Path],
+        delete_audio: bool = False,
+    ) -> Path:
+        """Task to process and save a recording."""
+        with self.tracer.span("job", job_id=job.id, recording=timestamp) as span:
+            job.info["span"] = span
+            try:
+                self.write_log(f"Processing audio data for job {job.id}...")
+                self._report(job, 0.1, "Preparing audio data...")
+
+                # Decode once; both models share the same float32 samples
+                waveform = self.scheduler.run_stage(
+                    job, "io", self._load_audio, job, audio
+                ).result()
+                job.info["audio_seconds"] = len(waveform) / 16000
+                span.set(audio_seconds=job.info["audio_seconds"])
+                if self.cache is not None:
+                    job.info["audio_digest"] = audio_digest(waveform)
+                if self.config.get("keep_audio"):
+                    self.scheduler.run_stage(
+                        job, "io", self._archive_audio, job, timestamp, waveform
+                    )
+                speech = waveform
+                if self.config.get("trim_silence"):
+                    speech = self._trim_silence(job, waveform)
+                self._report(job, 0.2, "Audio ready...")
+
+                if len(speech):
+                    # Process audio with models on their own stage pools
+                    future_transcribe = self.scheduler.run_stage(
+                        job, "asr", self._transcribe_audio, job, speech
+                    )
+                    future_diarize = self.scheduler.run_stage(
+                        job, "diarization", self._diarize_audio, job, speech
+                    )
+
+                    segments_list = future_transcribe.result()
+                    turns = future_diarize.result()
+                else:
+                    self.write_log("No speech detected")
+                    segments_list, turns = [], []
+
+                # Save results
+                output_path = self.scheduler.run_stage(
+                    job, "io", self._save_results, job, segments_list, turns, timestamp
+                ).result()
+
+            except JobCancelledError:
+                self.write_log(f"\nJob {job.id} cancelled")
+                self._report(job, 1.0, "Cancelled")
+                self._keep_recording(audio, delete_audio)
+                raise
+            except Exception as e:
+                self.write_log(f"\nError processing audio: {str(e)}")
+                self._report(job, 1.0, "Error during processing!")
+                traceback.print_exc()
+                self._keep_recording(audio, delete_audio)
+                raise
+
+            # The spilled recording is only deleted once its transcript exists
+            if delete_audio and audio.exists():
+                audio.unlink()
+                self.write_log(f"Deleted audio file {audio}")
+            return output_path
+
+    def _keep_recording(self, audio: Union["AudioBuffer", Path], delete_audio: bool):
+        """Point at a spilled recording that was not transcribed."""
+        if delete_audio and isinstance(audio, Path) and audio.exists():
+            self.write_log(f"Recording kept at {audio}")
+
+    def _process_channels_task(
+        self, job: Job, timestamp: str, recordings: Sequence["ChannelRecording"]
+    ) -> Path:
+        """Task to transcribe each channel and merge them into one transcript.
+
+        Each channel holds one speaker, so channels are transcribed in
+        parallel on the ASR pool and diarization is skipped.
+        """
+        with self.tracer.span(
+            "job", job_id=job.id, recording=timestamp, channels=len(recordings)
+        ) as span:
+            job.info["span"] = span
+            try:
+                self.write_log(
+                    f"Processing {len(recordings)} channels for job {job.id}..."
+                )
+                self._report(job, 0.1, "Preparing audio data...")
+                waveforms = self.scheduler.run_stage(
+                    job, "io", self._load_channels, job, recordings
+                ).result()
+                job.info["audio_seconds"] = max(
+                    (len(waveform) / 16000 for waveform in waveforms), default=0.0
+                )
+                span.set(audio_seconds=job.info["audio_seconds"])
+                self._report(job, 0.2, "Audio ready...")
+
+                futures = [
+                    self.scheduler.run_stage(
+                        job, "asr", self._transcribe_audio, job, waveform
+                    )
+                    for waveform in waveforms
+                ]
+                channels = [
+                    (
+                        recording.name,
+                        [
+                            shift_segment(segment, recording.offset)
+                            for segment in future.result()
+                        ],
+                    )
+                    for recording, future in zip(recordings, futures)
+                ]
+
+                return self.scheduler.run_stage(
+                    job, "io", self._save_channels, job, channels, timestamp
+                ).result()
+
+            except JobCancelledError:
+                self.write_log(f"\nJob {job.id} cancelled")
+                self._report(job, 1.0, "Cancelled")
+                raise
+            except Exception as e:
+                self.write_log(f"\nError processing audio: {str(e)}")
+                self._report(job, 1.0, "Error during processing!")
+                traceback.print_exc()
+                raise
+
+    def _load_channels(
+        self, job: Optional[Job], recordings: Sequence["ChannelRecording"]
+    ) -> List[np.ndarray]:
+        """Each channel as mono float32 at 16 kHz, resampling only if needed."""
+        waveforms = []
+        for recording in recordings:
+            with self._span(
+                job,
+                "audio.load",
+                source="channel",
+                channel=recording.name,
+                sample_rate=recording.sample_rate,
+            ) as span:
+                waveform = resample_audio(recording.audio, recording.sample_rate)
+                span.set(audio_seconds=len(waveform) / 16000)
+            waveforms.append(waveform)
+        return waveforms
+
+    def _load_audio(
+        self, job: Optional[Job], audio: Union["AudioBuffer", Path]
+    ) -> np.ndarray:
+        """Return the recording as one contiguous mono float32 array."""
+        source = "file" if isinstance(audio, Path) else "memory"
+        with self._span(job, "audio.load", source=source) as span:
+            if isinstance(audio, Path):
+                waveform = decode_audio_file(audio)
+            else:
+                waveform = audio.consolidate()
+            span.set(audio_seconds=len(waveform) / 16000)
+            return waveform
+
+    def _trim_silence(self, job: Job, waveform: np.ndarray) -> np.ndarray:
+        """Drop long silences so both models only process speech.
+
+        The timeline is kept in ``job.info`` to map results back to
+        recording time.
+        """
+        with self._span(job, "vad") as span:
+            timeline = SpeechTimeline.detect(
+                waveform, threshold_db=self.config.get("vad_threshold_db", -40.0)
+            )
+            speech = timeline.compact(waveform)
+            span.set(regions=len(timeline.regions), speech_ratio=timeline.speech_ratio)
+        job.info["timeline"] = timeline
+        removed = (len(waveform) - len(speech)) / 16000
+        if removed:
+            self.write_log(f"Skipping {removed:.1f}s of silence")
+        return speech
+
+    def _result_settings(self, job: Job, **settings) -> dict:
+        """Cache settings for a stage, including the silence trimming applied."""
+        if "timeline" in job.info:
+            settings["trim_silence_db"] = self.config.get("vad_threshold_db", -40.0)
+        return settings
+
+    def _archive_recording(self, timestamp: str, audio: "AudioBuffer") -> None:
+        """Save a recording that could not be queued for processing."""
+        self._archive_audio(None, timestamp, audio.consolidate())
 
-    def _transcribe_audio(self, audio_path):
+    def _archive_channels(
+        self, timestamp: str, recordings: Sequence["ChannelRecording"]
+    ) -> None:
+        """Save each channel of a recording that could not be queued.
+
+        Files are numbered by channel rather than named, so names never
+        become part of a path.
+        """
+        for index, recording in enumerate(recordings, start=1):
+            self.write_log(f"Channel {index} is {recording.name}")
+            self._archive_audio(
+                None,
+                f"{timestamp}_channel{index}",
+                recording.audio,
+                recording.sample_rate,
+            )
+
+    def _archive_audio(
+        self,
+        job: Optional[Job],
+        timestamp: str,
+        waveform: np.ndarray,
+        sample_rate: int = 16000,
+    ) -> None:
+        """Write the recording to FLAC for safekeeping."""
+        audio_path = self.config["output_dir"] / f"recording_{timestamp}.flac"
+        seconds = len(waveform) / sample_rate
+        with self._span(job, "audio.archive", audio_seconds=seconds):
+            try:
+                sf.write(audio_path, waveform, sample_rate, format="FLAC")
+                self.write_log(f"Saved audio to {audio_path}")
+            except Exception as e:
+                self.write_log(f"Error saving audio: {str(e)}")
+
+    def _transcribe_audio(self, job: Job, waveform: np.ndarray):
         """Transcribe audio using Whisper model."""
-        self.update_progress(0.3, "Transcribing...")
-        segments, info = self.models.whisper_model.transcribe(audio_path)
+        self._report(job, 0.3, "Transcribing...")
+        model, options = self._whisper_for_batch()
+        digest = job.info.get("audio_digest")
+        settings = self._result_settings(
+            job,
+            **options,
+            model=self.config.get("whisper_model"),
+            compute_type=self.config.get("compute_type"),
+        )
+        with self._span(job, "asr", **settings) as span:
+            cached = None
+            if digest is not None:
+                cached = self.cache.get_segments(digest, **settings)
+            if cached is not None:
+                segments_list, language = cached
+                span.set(cached=True, segments=len(segments_list), language=language)
+                self.write_log(f"Reused cached transcription with language: {language}")
+                self._report(job, 0.6, "Transcription complete...")
+                return segments_list
+
+            segments, info = model.transcribe(waveform, **options)
+            # Segments are decoded lazily, so cancellation is honoured between them
+            segments_list = []
+            for segment in segments:
+                job.check_cancelled()
+                segments_list.append(segment)
+            if "timeline" in job.info:
+                segments_list = job.info["timeline"].restore_segments(segments_list)
+            span.set(cached=False, segments=len(segments_list), language=info.language)
+            if digest is not None:
+                self.cache.put_segments(
+                    digest, segments_list, info.language, **settings
+                )
         self.write_log(f"Transcription completed with language: {info.language}")
-        self.update_progress(0.6, "Transcription complete...")
-        return list(segments)
+        self._report(job, 0.6, "Transcription complete...")
+        return segments_list
 
-    def _diarize_audio(self, audio_path):
+    def _whisper_for_batch(self):
+        """Pick the batched pipeline when enabled, with the configured options."""
+        options = {"beam_size": self.config.get("whisper_beam_size", 5)}
+        if wants_word_timestamps(self.config):
+            options["word_timestamps"] = True
+        batch_size = self.config.get("whisper_batch_size", 1)
+        if batch_size > 1 and self.models.whisper_pipeline is not None:
+            # The pipeline defaults to one segment per 30 s speech chunk, which
+            # leaves too few segments to split between speakers
+            return self.models.whisper_pipeline, dict(
+                options, batch_size=batch_size, without_timestamps=False
+            )
+        return self.models.whisper_model, options
+
+    def _diarize_audio(self, job: Job, waveform: np.ndarray):
         """Perform speaker diarization."""
-        self.update_progress(0.4, "Diarizing...")
-        diarization = self.models.diarization_pipeline(audio_path)
+        self._report(job, 0.4, "Diarizing...")
+        digest = job.info.get("audio_digest")
+        backend = "thread" if self.models.diarization_workers is None else "worker"
+        settings = self._result_settings(job, pipeline=DIARIZATION_MODEL)
+        chunk_frames = self._diarization_chunk_frames(len(waveform))
+        if chunk_frames is not None:
+            backend = "chunked"
+            # Chunks are stitched by voice, so the threshold shapes the turns
+            settings["chunk_seconds"] = chunk_frames / 16000
+            settings["speaker_threshold"] = self.config.get("speaker_threshold", 0.4)
+        with self._span(job, "diarization", backend=backend) as span:
+            if digest is not None:
+                turns = self.cache.get_turns(digest, **settings)
+                if turns is not None:
+                    span.set(cached=True, turns=len(turns))
+                    self.write_log("Reused cached diarization")
+                    self._report(job, 0.7, "Diarization complete...")
+                    return turns
+
+            if self.models.diarization_workers is not None:
+                turns = self.models.diarization_workers.diarize(waveform)
+            elif chunk_frames is not None:
+                turns = self._diarize_chunks(job, waveform, chunk_frames)
+            else:
+                import torch
+
+                # torch.from_numpy shares the array's memory rather than copying it
+                audio = {
+                    "waveform": torch.from_numpy(waveform)[None, :],
+                    "sample_rate": 16000,
+                }
+                turns = annotation_to_turns(self.models.diarization_pipeline(audio))
+            if "timeline" in job.info:
+                turns = job.info["timeline"].restore_turns(turns)
+            span.set(cached=False, turns=len(turns))
+            if digest is not None:
+                self.cache.put_turns(digest, turns, **settings)
         self.write_log("Diarization completed")
-        self.update_progress(0.7, "Diarization complete...")
-        return diarization
+        self._report(job, 0.7, "Diarization complete...")
+        return turns
+
+    def _diarization_chunk_frames(self, frames: int) -> Optional[int]:
+        """Chunk length that keeps diarization under the memory ceiling.
+
+        None when the recording fits in one pass, no ceiling is set, or
+        diarization runs in worker processes.
+        """
+        max_mb = self.config.get("diarization_max_mb", 0)
+        if not max_mb or self.models.diarization_workers is not None:
+            return None
+        if estimate_memory_mb(frames / 16000) <= max_mb:
+            return None
+        return int(chunk_seconds(max_mb) * 16000)
+
+    def _diarize_chunks(self, job: Job, waveform: np.ndarray, chunk_frames: int):
+        """Diarize overlapping chunks with the loaded pipeline and stitch them."""
+        import torch
 
-    def _save_results(self, segments_list, diarization, timestamp):
+        def diarize_chunk(audio: np.ndarray):
+            annotation, embeddings = self.models.diarization_pipeline(
+                {"waveform": torch.from_numpy(audio)[None, :], "sample_rate": 16000},
+                return_embeddings=True,
+            )
+            # One embedding per speaker, in the order of annotation.labels()
+            labels = annotation.labels()
+            embeddings = [] if embeddings is None else embeddings
+            return annotation_to_turns(annotation), dict(zip(labels, embeddings))
+
+        def on_chunk(index: int, total: int) -> None:
+            job.check_cancelled()
+            if index == 0:
+                self.write_log(
+                    f"Diarizing in {total} chunks of up to "
+                    f"{chunk_frames / 16000 / 60:.0f} min to stay under "
+                    f"{self.config['diarization_max_mb']} MB"
+                )
+            self._report(
+                job,
+                0.4 + 0.3 * index / total,
+                f"Diarizing chunk {index + 1}/{total}...",
+            )
+
+        return diarize_in_chunks(
+            waveform,
+            diarize_chunk,
+            chunk_frames,
+            int(OVERLAP_SECONDS * 16000),
+            threshold=self.config.get("speaker_threshold", 0.4),
+            on_chunk=on_chunk,
+        )
+
+    def _save_results(self, job: Job, segments_list, turns, timestamp) -> Path:
         """Save combined transcription and diarization results."""
-        self.update_progress(0.8, "Combining results...")
-        output_path = self.config["output_dir"] / f"transcript_{timestamp}.txt"
-
-        with open(output_path, "w", encoding="utf-8") as f:
-            for segment in segments_list:
-                # Find speaker for this segment
-                start_time = segment.start
-                speaker = "Unknown"
-                for turn, _, speaker_id in diarization.itertracks(yield_label=True):
-                    if turn.start <= start_time <= turn.end:
-                        speaker = f"Speaker {speaker_id}"
-                        break
-
-                timestamp_str = time.strftime("%H:%M:%S", time.gmtime(segment.start))
-                line = f"[{timestamp_str}] {speaker}: " f"{segment.text.strip()}"
-                f.write(line + "\n")
-                self.write_log(line)
-
-        self.write_log(f"\nSaved complete transcript to {output_path}")
+        self._report(job, 0.8, "Combining results...")
+
+        with self._span(job, "merge", segments=len(segments_list), turns=len(turns)):
+            segments = SegmentStore.from_segments(segments_list)
+            turn_store = TurnStore.from_turns(turns)
+            segments.assign_speakers(turn_store)
+            return self._write_results(job, segments, turn_store, timestamp)
+
+    def _save_channels(self, job: Job, channels, timestamp) -> Path:
+        """Merge per-channel transcripts by time and save them."""
+        self._report(job, 0.8, "Combining channels...")
+
+        with self._span(job, "merge", channels=len(channels)):
+            segments, turn_store = merge_channels(channels)
+            return self._write_results(job, segments, turn_store, timestamp)
+
+    def _write_results(
+        self,
+        job: Job,
+        segments: SegmentStore,
+        turn_store: TurnStore,
+        timestamp: str,
+    ) -> Path:
+        """Write labelled segments in every format, keeping the raw results."""
+        writers = TranscriptWriters(
+            self.config["output_dir"],
+            f"transcript_{timestamp}",
+            self.config.get("output_formats", ["txt"]),
+        )
+        # Echo in batches; thousands of single-line writes stall the log
+        log = LogBatcher(self.write_log)
+        try:
+            for segment, speaker_id in segments.with_speakers():
+                writers.write(segment, speaker_id)
+                log.add(transcript_line(segment, speaker_id))
+            output_path = writers.close()
+        except BaseException:
+            writers.abort()
+            raise
+        finally:
+            log.flush()
+        if self.config.get("keep_results"):
+            keep_results(
+                self.config["output_dir"],
+                timestamp,
+                segments,
+                turn_store,
+                self.write_log,
+            )
+
+        saved = ", ".join(str(path) for path in writers.paths)
+        self.write_log(f"\nSaved complete transcript to {saved}")
+        self._report(job, 1.0, "Processing completed!")
+        return output_path
+
+
+class StreamingTranscriber:
+    """Transcribes a live recording utterance by utterance while it is captured."""
+
+    def __init__(
+        self,
+        config: dict,
+        model_manager,
+        log_callback: Callable[[str], None],
+        progress_callback: Callable[[float, str], None],
+        timestamp: str,
+        sample_rate: int = 16000,
+    ):
+        self.config = config
+        self.models = model_manager
+        self.write_log = log_callback
+        self.update_progress = progress_callback
+        self.sample_rate = sample_rate
+        self.timestamp = timestamp
+        self.segmenter = UtteranceSegmenter(
+            sample_rate=sample_rate,
+            threshold_db=config.get("vad_threshold_db", -40.0),
+            max_utterance_s=config.get("max_utterance_seconds", 30.0),
+        )
+        # A single worker keeps utterances in order and preserves the prompt context
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self._language: Optional[str] = None
+        self._prompt: Optional[str] = None
+        # Finalized segments in recording time, kept for re-rendering
+        self._segments: list = []
+
+        # Live speaker labels, embedded on their own thread as audio arrives
+        self.diarizer: Optional[OnlineDiarizer] = None
+        self._diarized: Optional[Future] = None
+        if config.get("online_diarization"):
+            embedding = getattr(model_manager, "speaker_embedding", None)
+            if embedding is None:
+                self.write_log(
+                    "Live speaker labels need the thread diarization backend; "
+                    "streaming without them"
+                )
+            else:
+                self.diarizer = OnlineDiarizer(
+                    pyannote_embedder(embedding),
+                    sample_rate=sample_rate,
+                    threshold=config.get("speaker_threshold", 0.4),
+                    threshold_db=config.get("vad_threshold_db", -40.0),
+                )
+                self.diarize_executor = ThreadPoolExecutor(max_workers=1)
+
+        self.writers = TranscriptWriters(
+            config["output_dir"],
+            f"transcript_{timestamp}",
+            config.get("output_formats", ["txt"]),
+            speakers=self.diarizer is not None,
+        )
+        self.output_path = self.writers.paths[0]
+
+    def feed(self, block: np.ndarray) -> None:
+        """Add a block of captured audio, queueing any completed utterances."""
+        if self.diarizer is not None:
+            self._diarized = self.diarize_executor.submit(self.diarizer.push, block)
+        for start, audio in self.segmenter.push(block):
+            self.executor.submit(self._transcribe_window, start, audio, self._diarized)
+
+    def finish(self) -> None:
+        """Queue the trailing utterance and close the transcript once it is done."""
+        utterance = self.segmenter.flush()
+        if utterance is not None:
+            self.executor.submit(self._transcribe_window, *utterance, self._diarized)
+        self.executor.submit(self._close)
+        self.executor.shutdown(wait=False)
+        if self.diarizer is not None:
+            self.diarize_executor.shutdown(wait=False)
+
+    def _transcribe_window(
+        self, start: int, audio: np.ndarray, diarized: Optional[Future] = None
+    ) -> None:
+        """Transcribe one utterance and append its lines to the transcript."""
+        try:
+            offset = start / self.sample_rate
+            segments, info = self.models.whisper_model.transcribe(
+                audio,
+                language=self._language,
+                initial_prompt=self._prompt,
+                beam_size=self.config.get("whisper_beam_size", 5),
+                word_timestamps=wants_word_timestamps(self.config),
+            )
+            self._language = info.language
+            if diarized is not None:
+                # Wait until the utterance's audio has been embedded
+                try:
+                    diarized.result()
+                except Exception as e:
+                    self.write_log(f"\nError labelling speakers: {str(e)}")
+            for segment in segments:
+                text = segment.text.strip()
+                if not text:
+                    continue
+                segment = shift_segment(segment, offset)
+                speaker = None
+                if self.diarizer is not None:
+                    speaker = self.diarizer.speaker_at(segment.start, segment.end)
+                self.writers.write(segment, speaker)
+                self._segments.append(segment)
+                self.write_log(
+                    transcript_line(segment, speaker, self.diarizer is not None)
+                )
+                self._prompt = text
+            self.writers.flush()
+        except Exception as e:
+            self.write_log(f"\nError transcribing audio: {str(e)}")
+            traceback.print_exc()
+
+    def _close(self) -> None:
+        self.writers.close()
+        if self.config.get("keep_results"):
+            turns = self.diarizer.turns if self.diarizer is not None else []
+            keep_results(
+                self.config["output_dir"],
+                self.timestamp,
+                SegmentStore.from_segments(self._segments),
+                TurnStore.from_turns(turns),
+                self.write_log,
+            )
+        saved = ", ".join(str(path) for path in self.writers.paths)
+        self.write_log(f"\nSaved complete transcript to {saved}")
         self.update_progress(1.0, "Processing completed!")
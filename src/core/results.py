@@ -0,0 +1,47 @@
+from collections import namedtuple
+from typing import Optional
+
+# Lightweight stand-ins for faster-whisper's segment and word results, used
+# wherever results cross a process boundary or are read back from disk
+Word = namedtuple("Word", ["start", "end", "word", "probability"])
+Segment = namedtuple("Segment", ["start", "end", "text", "words"])
+
+
+def segment_to_dict(segment) -> dict:
+    """Convert a faster-whisper or local segment to plain JSON types."""
+    words: Optional[list] = None
+    if getattr(segment, "words", None):
+        words = [
+            {
+                "start": word.start,
+                "end": word.end,
+                "word": word.word,
+                "probability": word.probability,
+            }
+            for word in segment.words
+        ]
+    return {
+        "start": segment.start,
+        "end": segment.end,
+        "text": segment.text,
+        "words": words,
+    }
+
+
+def segment_from_dict(data: dict) -> Segment:
+    """Rebuild a segment produced by ``segment_to_dict``."""
+    words = None
+    if data.get("words"):
+        words = [Word(**word) for word in data["words"]]
+    return Segment(data["start"], data["end"], data["text"], words)
+
+
+def shift_segment(segment, offset: float) -> Segment:
+    """The segment with ``offset`` seconds added to its and its words' times."""
+    words = None
+    if getattr(segment, "words", None):
+        words = [
+            Word(offset + w.start, offset + w.end, w.word, w.probability)
+            for w in segment.words
+        ]
+    return Segment(offset + segment.start, offset + segment.end, segment.text, words)
@@ -0,0 +1,135 @@
+import itertools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job once it has been cancelled."""
+
+
+class Job:
+    """A unit of work tracked by the scheduler."""
+
+    def __init__(self, job_id: str, name: str):
+        self.id = job_id
+        self.name = name
+        self.state = "queued"
+        self.progress = 0.0
+        self.status = "Queued"
+        self.future: Optional[Future] = None
+        # Free-form details recorded by the job's stages
+        self.info: dict = {}
+        self._cancel_event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ("done", "failed", "cancelled")
+
+    def cancel(self) -> None:
+        """Request cancellation; the job stops at its next checkpoint."""
+        self._cancel_event.set()
+
+    def check_cancelled(self) -> None:
+        """Raise JobCancelledError if cancellation has been requested."""
+        if self.cancelled:
+            raise JobCancelledError(f"Job {self.id} cancelled")
+
+
+class JobScheduler:
+    """Runs jobs whose stages execute on dedicated, separately sized pools.
+
+    Each job is driven by a runner thread that only ever waits on stage pools,
+    never on its own pool, so jobs queued back to back cannot deadlock. At most
+    ``max_active_jobs`` run at once and ``max_queued_jobs`` more may wait;
+    beyond that, ``submit`` applies backpressure by blocking or refusing.
+    """
+
+    def __init__(
+        self,
+        stages: Dict[str, int],
+        max_active_jobs: int = 2,
+        max_queued_jobs: int = 4,
+    ):
+        self.max_active_jobs = max_active_jobs
+        self.max_queued_jobs = max_queued_jobs
+        self._stages = {
+            name: ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+            for name, workers in stages.items()
+        }
+        self._runner = ThreadPoolExecutor(
+            max_workers=max_active_jobs, thread_name_prefix="job"
+        )
+        self._slots = threading.BoundedSemaphore(max_active_jobs + max_queued_jobs)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.jobs: Dict[str, Job] = {}
+
+    def submit(self, name: str, func: Callable, *args, block: bool = False) -> Job:
+        """Queue ``func(job, *args)`` as a new job.
+
+        Raises RuntimeError if the queue is full and ``block`` is False.
+        """
+        if not self._slots.acquire(blocking=block):
+            raise RuntimeError("Job queue is full")
+        job = Job(str(next(self._ids)), name)
+        with self._lock:
+            self.jobs[job.id] = job
+        job.future = self._runner.submit(self._run_job, job, func, *args)
+        return job
+
+    def run_stage(
+        self, job: Optional[Job], stage: str, func: Callable, *args
+    ) -> Future:
+        """Run ``func(*args)`` on the named stage pool, on behalf of ``job``."""
+        if job is not None:
+            job.check_cancelled()
+        return self._stages[stage].submit(self._run_stage, job, func, *args)
+
+    def active_jobs(self) -> List[Job]:
+        """Jobs that are queued or running, oldest first."""
+        with self._lock:
+            return [job for job in self.jobs.values() if not job.finished]
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it is unknown."""
+        with self._lock:
+            job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel()
+        return True
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs and optionally wait for running ones."""
+        self._runner.shutdown(wait=wait)
+        for pool in self._stages.values():
+            pool.shutdown(wait=wait)
+
+    def _run_job(self, job: Job, func: Callable, *args):
+        try:
+            job.check_cancelled()
+            job.state = "running"
+            result = func(job, *args)
+            job.state = "done"
+            return result
+        except JobCancelledError:
+            job.state = "cancelled"
+            raise
+        except Exception:
+            job.state = "failed"
+            raise
+        finally:
+            with self._lock:
+                self.jobs.pop(job.id, None)
+            self._slots.release()
+
+    @staticmethod
+    def _run_stage(job: Optional[Job], func: Callable, *args):
+        if job is not None:
+            job.check_cancelled()
+        return func(*args)
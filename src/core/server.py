@@ -0,0 +1,261 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, List, Optional, Tuple
+import numpy as np
+from core.results import segment_from_dict, segment_to_dict
+from core.speakers import Turn
+from core.telemetry import Tracer
+
+_HEADER = struct.Struct(">I")
+
+
+def send_message(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    """Send a JSON header followed by an optional binary payload."""
+    header = dict(header, payload_bytes=len(payload))
+    data = json.dumps(header).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+    if payload:
+        sock.sendall(payload)
+
+
+def recv_message(sock: socket.socket) -> Tuple[dict, bytearray]:
+    """Receive a message sent with ``send_message``."""
+    (length,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    header = json.loads(_recv_exactly(sock, length))
+    payload = _recv_exactly(sock, header.pop("payload_bytes", 0))
+    return header, payload
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytearray:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Model server closed the connection")
+        received += count
+    return buffer
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server: "ModelServer" = self.server.model_server
+        try:
+            header, payload = recv_message(self.request)
+            response = server.handle(header, payload)
+        except Exception as e:
+            response = {"error": str(e)}
+        send_message(self.request, response)
+
+
+class ModelServer:
+    """Keeps models loaded and serves them to clients over a Unix socket."""
+
+    def __init__(self, model_manager, socket_path: Path):
+        self.models = model_manager
+        self.socket_path = Path(socket_path)
+        self._diarize_lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingUnixStreamServer] = None
+
+    def serve_forever(self) -> None:
+        """Bind the socket (owner-only) and serve until shut down.
+
+        A socket left behind by a server that exited is replaced, but one
+        that another server is still listening on is left alone.
+        """
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            if self._in_use():
+                raise RuntimeError(
+                    f"A model server is already running on {self.socket_path}"
+                )
+            self.socket_path.unlink()
+        self._server = socketserver.ThreadingUnixStreamServer(
+            str(self.socket_path), _RequestHandler
+        )
+        self._server.daemon_threads = True
+        self._server.model_server = self
+        os.chmod(self.socket_path, 0o600)
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if self.socket_path.exists():
+                self.socket_path.unlink()
+
+    def _in_use(self) -> bool:
+        """Whether another server is listening on the socket."""
+        try:
+            ModelClient(self.socket_path, timeout=2.0).request({"op": "ping"})
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+        except (OSError, RuntimeError):
+            # Listening but not answering in time; still not ours to take
+            return True
+        return True
+
+    def shutdown(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+
+    def handle(self, header: dict, payload: bytearray) -> dict:
+        """Dispatch one request to the loaded models."""
+        op = header.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid()}
+
+        waveform = np.frombuffer(payload, dtype=np.float32)
+        if op == "transcribe":
+            options = header.get("options", {})
+            model = self.models.whisper_model
+            if "batch_size" in options:
+                if self.models.whisper_pipeline is not None:
+                    model = self.models.whisper_pipeline
+                else:
+                    options.pop("batch_size")
+            segments, info = model.transcribe(waveform, **options)
+            return {
+                "segments": [segment_to_dict(segment) for segment in segments],
+                "language": info.language,
+            }
+        if op == "diarize":
+            if self.models.diarization_workers is not None:
+                turns = self.models.diarization_workers.diarize(waveform)
+            else:
+                # Imported here so clients never pay for torch
+                import torch
+                from core.speakers import annotation_to_turns
+
+                audio = {
+                    "waveform": torch.from_numpy(waveform)[None, :],
+                    "sample_rate": header.get("sample_rate", 16000),
+                }
+                with self._diarize_lock:
+                    turns = annotation_to_turns(self.models.diarization_pipeline(audio))
+            return {"turns": [list(turn) for turn in turns]}
+        raise ValueError(f"Unknown operation: {op}")
+
+
+def run_server(config: dict) -> None:
+    """Load the models once and serve them until interrupted."""
+    from core.models import ModelManager
+
+    model_manager = ModelManager(
+        config, print, lambda progress, status: None, Tracer.from_config(config)
+    )
+    model_manager.load_models()
+    server = ModelServer(model_manager, config["model_socket"])
+    print(f"Serving models on {server.socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        model_manager.shutdown()
+
+
+class ModelClient:
+    """Sends requests to a running ModelServer, one connection per request."""
+
+    def __init__(self, socket_path: Path, timeout: Optional[float] = None):
+        self.socket_path = Path(socket_path)
+        self.timeout = timeout
+
+    def request(self, header: dict, payload: bytes = b"") -> dict:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(str(self.socket_path))
+            send_message(sock, header, payload)
+            response, _ = recv_message(sock)
+        if "error" in response:
+            raise RuntimeError(f"Model server error: {response['error']}")
+        return response
+
+    def available(self) -> bool:
+        """Whether a server is listening and answering on the socket."""
+        if not self.socket_path.exists():
+            return False
+        try:
+            timeout, self.timeout = self.timeout, 2.0
+            return bool(self.request({"op": "ping"}).get("ok"))
+        except (OSError, RuntimeError):
+            return False
+        finally:
+            self.timeout = timeout
+
+
+class RemoteWhisperModel:
+    """Mirrors ``WhisperModel.transcribe`` on top of a model server."""
+
+    def __init__(self, client: ModelClient):
+        self.client = client
+
+    def transcribe(self, audio: np.ndarray, **options):
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        response = self.client.request(
+            {"op": "transcribe", "options": options}, audio.tobytes()
+        )
+        segments = [segment_from_dict(data) for data in response["segments"]]
+        return segments, SimpleNamespace(language=response["language"])
+
+
+class RemoteDiarizer:
+    """Mirrors ``DiarizationWorkerPool.diarize`` on top of a model server."""
+
+    def __init__(self, client: ModelClient):
+        self.client = client
+
+    def diarize(self, waveform: np.ndarray, sample_rate: int = 16000) -> List[Turn]:
+        waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+        response = self.client.request(
+            {"op": "diarize", "sample_rate": sample_rate}, waveform.tobytes()
+        )
+        return [Turn(*turn) for turn in response["turns"]]
+
+
+class RemoteModelManager:
+    """Drop-in for ModelManager that uses models held by a model server."""
+
+    def __init__(
+        self,
+        config: dict,
+        log_callback: Callable[[str], None],
+        progress_callback: Callable[[float, str], None],
+        tracer: Optional[Tracer] = None,
+    ):
+        self.config = config
+        self.write_log = log_callback
+        self.update_progress = progress_callback
+        self.tracer = tracer or Tracer()
+        self.client = ModelClient(config["model_socket"])
+        self.whisper_model = RemoteWhisperModel(self.client)
+        # The server decides whether a batched request runs batched
+        self.whisper_pipeline = self.whisper_model
+        self.diarization_pipeline = None
+        self.diarization_workers = RemoteDiarizer(self.client)
+        # Embeddings would need audio streamed to the server as it arrives
+        self.speaker_embedding = None
+
+    def load_models(self):
+        """Check the server is reachable; its models are already warm."""
+        try:
+            with self.tracer.span(
+                "models.connect", socket=str(self.client.socket_path)
+            ):
+                self.client.request({"op": "ping"})
+        except Exception as e:
+            error_msg = f"Failed to reach model server: {str(e)}"
+            self.write_log(f"Error: {error_msg}")
+            raise RuntimeError(error_msg)
+        self.write_log(f"\nUsing warm models from server at {self.client.socket_path}")
+        self.update_progress(1.0, "Ready to record")
+
+    def shutdown(self) -> None:
+        """Nothing to release; the server owns the models."""
@@ -0,0 +1,66 @@
+import heapq
+from collections import namedtuple
+from typing import Iterable, List, Optional, Sequence
+
+Turn = namedtuple("Turn", ["start", "end", "speaker"])
+
+
+def annotation_to_turns(diarization) -> List[Turn]:
+    """Flatten a pyannote annotation into a time-ordered list of turns."""
+    turns = [
+        Turn(turn.start, turn.end, speaker_id)
+        for turn, _, speaker_id in diarization.itertracks(yield_label=True)
+    ]
+    turns.sort(key=lambda t: t.start)
+    return turns
+
+
+def assign_speakers(segments: Sequence, turns: Iterable[Turn]) -> List[Optional[str]]:
+    """Return the speaker overlapping each segment the most, or None.
+
+    Ties go to the earlier turn in start order, and a zero-length segment
+    takes the earliest turn strictly containing it, as in
+    ``core.store.assign_turn_indices``. Segments and turns are swept
+    together in start order, keeping a heap of the turns still active, and
+    each segment is compared with every turn in the heap. That costs
+    O((n + m) log m) plus one comparison per (segment, active turn) pair:
+    close to linear for diarization output, where few turns overlap, but
+    O(n * m) when many long turns overlap each other.
+    """
+    turns = sorted(turns, key=lambda t: t.start)
+    order = sorted(range(len(segments)), key=lambda i: segments[i].start)
+    speakers: List[Optional[str]] = [None] * len(segments)
+
+    active: list = []
+    next_turn = 0
+    for index in order:
+        start, end = segments[index].start, segments[index].end
+
+        while next_turn < len(turns) and turns[next_turn].start < end:
+            heapq.heappush(active, (turns[next_turn].end, next_turn))
+            next_turn += 1
+        while active and active[0][0] <= start:
+            heapq.heappop(active)
+
+        # The heap may also hold turns pushed for an earlier, longer segment
+        # that start at or after this one's end; they overlap by <= 0
+        best_overlap, best_turn = 0.0, None
+        for turn_end, turn_index in active:
+            turn_start = turns[turn_index].start
+            if start == end:
+                # Zero-length segments fall back to the turn containing them
+                if turn_start < start < turn_end and (
+                    best_turn is None or turn_index < best_turn
+                ):
+                    best_turn = turn_index
+                continue
+            overlap = min(end, turn_end) - max(start, turn_start)
+            if overlap > best_overlap or (
+                overlap == best_overlap
+                and best_turn is not None
+                and turn_index < best_turn
+            ):
+                best_overlap, best_turn = overlap, turn_index
+        if best_turn is not None:
+            speakers[index] = turns[best_turn].speaker
+    return speakers
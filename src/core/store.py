@@ -0,0 +1,444 @@
+import heapq
+from itertools import repeat
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from core.results import Segment, Word
+from core.speakers import Turn
+
+SEGMENT_DTYPE = np.dtype(
+    [
+        ("start", "f8"),
+        ("end", "f8"),
+        # Index into the store's speaker names, or -1 if unassigned
+        ("speaker", "i4"),
+        # Byte range of the text in the UTF-8 buffer
+        ("text_start", "i8"),
+        ("text_end", "i8"),
+        # Range of the segment's words, or -1 if decoded without them
+        ("word_start", "i8"),
+        ("word_end", "i8"),
+    ]
+)
+WORD_DTYPE = np.dtype(
+    [
+        ("start", "f8"),
+        ("end", "f8"),
+        ("probability", "f8"),
+        ("text_start", "i8"),
+        ("text_end", "i8"),
+    ]
+)
+TURN_DTYPE = np.dtype([("start", "f8"), ("end", "f8"), ("speaker", "i4")])
+
+# Segments matched against turns at a time; bounds the candidate arrays
+ASSIGN_BLOCK = 65536
+MERGE_POLICIES = ("overlap", "start")
+
+
+def _speaker_ids(names: Iterable[Optional[str]]) -> Tuple[np.ndarray, List[str]]:
+    """Intern speaker names as int32 IDs, None becoming -1."""
+    speakers: List[str] = []
+    index = {}
+    ids = []
+    for name in names:
+        if name is None:
+            ids.append(-1)
+            continue
+        if name not in index:
+            index[name] = len(speakers)
+            speakers.append(name)
+        ids.append(index[name])
+    return np.array(ids, dtype=np.int32), speakers
+
+
+def _time_range(starts: np.ndarray, ends: np.ndarray, start: float, end: float):
+    """Indices of the start-sorted intervals overlapping ``[start, end)``."""
+    upper = int(np.searchsorted(starts, end, side="left"))
+    return np.flatnonzero(ends[:upper] > start)
+
+
+def _require_arrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise RuntimeError("Arrow export needs pyarrow; pip install pyarrow")
+    return pyarrow
+
+
+def _turn_layers(turn_ends: np.ndarray) -> List[np.ndarray]:
+    """Split start-sorted turns into layers whose ends never decrease.
+
+    Each pass keeps the turns that end at or after every earlier remaining
+    turn. A turn nested inside a longer one lands in a later layer, so the
+    number of layers follows how deeply turns nest, not how many there are.
+    """
+    layers = []
+    remaining = np.arange(len(turn_ends))
+    while len(remaining):
+        ends = turn_ends[remaining]
+        keep = ends >= np.maximum.accumulate(ends)
+        layers.append(remaining[keep])
+        remaining = remaining[~keep]
+    return layers
+
+
+def assign_turn_indices(
+    segment_starts: np.ndarray,
+    segment_ends: np.ndarray,
+    turn_starts: np.ndarray,
+    turn_ends: np.ndarray,
+) -> np.ndarray:
+    """Index of the turn overlapping each segment the most, or -1.
+
+    Turns must be sorted by start. Ties go to the earlier turn in start
+    order, and a zero-length segment takes the earliest turn strictly
+    containing it, as in ``assign_speakers``. Turns are matched one layer
+    at a time (see ``_turn_layers``): within a layer both starts and ends
+    are sorted, so two binary searches bound exactly the turns overlapping
+    each segment and a long turn never drags unrelated ones in. Segments
+    are processed in fixed-size blocks to bound memory.
+    """
+    result = np.full(len(segment_starts), -1, dtype=np.int64)
+    if not len(turn_starts) or not len(segment_starts):
+        return result
+    layers = [
+        (layer, turn_starts[layer], turn_ends[layer])
+        for layer in _turn_layers(turn_ends)
+    ]
+    for block in range(0, len(segment_starts), ASSIGN_BLOCK):
+        starts = segment_starts[block : block + ASSIGN_BLOCK]
+        ends = segment_ends[block : block + ASSIGN_BLOCK]
+        best_overlap = np.full(len(starts), -1.0)
+        best_turn = np.full(len(starts), -1, dtype=np.int64)
+        for layer, layer_starts, layer_ends in layers:
+            # The first turn ending after each segment starts, and the first
+            # starting at or after it ends
+            lower = np.searchsorted(layer_ends, starts, side="right")
+            upper = np.searchsorted(layer_starts, np.maximum(ends, starts), side="left")
+            counts = np.maximum(upper - lower, 0)
+            total = int(counts.sum())
+            if not total:
+                continue
+            segment = np.repeat(np.arange(len(starts)), counts)
+            first = np.repeat(np.cumsum(counts) - counts, counts)
+            local = np.repeat(lower, counts) + np.arange(total) - first
+
+            s_start, s_end = starts[segment], ends[segment]
+            t_start, t_end = layer_starts[local], layer_ends[local]
+            overlap = np.minimum(s_end, t_end) - np.maximum(s_start, t_start)
+            contains = (s_start == s_end) & (t_start < s_start) & (t_end > s_start)
+            valid = (overlap > 0) | contains
+
+            segment, turn, overlap = segment[valid], layer[local[valid]], overlap[valid]
+            # Best overlap first within each segment, earlier turns breaking ties
+            order = np.lexsort((turn, -overlap, segment))
+            segment, turn, overlap = segment[order], turn[order], overlap[order]
+            best = np.flatnonzero(np.diff(segment, prepend=-1) != 0)
+            segment, turn, overlap = segment[best], turn[best], overlap[best]
+
+            better = (overlap > best_overlap[segment]) | (
+                (overlap == best_overlap[segment]) & (turn < best_turn[segment])
+            )
+            best_overlap[segment[better]] = overlap[better]
+            best_turn[segment[better]] = turn[better]
+        result[block : block + len(starts)] = best_turn
+    return result
+
+
+class TurnStore:
+    """Speaker turns as one structured array, sorted by start time.
+
+    ``by_channel`` marks turns taken from separately recorded channels, whose
+    segments already know their speaker and need no matching against turns.
+    """
+
+    def __init__(
+        self, records: np.ndarray, speakers: Sequence[str], by_channel: bool = False
+    ):
+        self.records = records
+        self.speakers = list(speakers)
+        self.by_channel = by_channel
+
+    @classmethod
+    def from_turns(cls, turns: Iterable[Turn]) -> "TurnStore":
+        turns = sorted(turns, key=lambda t: t.start)
+        ids, speakers = _speaker_ids(t.speaker for t in turns)
+        records = np.empty(len(turns), dtype=TURN_DTYPE)
+        records["start"] = [t.start for t in turns]
+        records["end"] = [t.end for t in turns]
+        records["speaker"] = ids
+        return cls(records, speakers)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Turn]:
+        for start, end, speaker in self.records.tolist():
+            yield Turn(start, end, self.speakers[speaker] if speaker >= 0 else None)
+
+    def between(self, start: float, end: float) -> "TurnStore":
+        """Turns overlapping ``[start, end)``."""
+        index = _time_range(self.records["start"], self.records["end"], start, end)
+        return TurnStore(self.records[index], self.speakers, self.by_channel)
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(
+            path, records=self.records, speakers=np.array(self.speakers, dtype=np.str_)
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "TurnStore":
+        with np.load(path) as data:
+            return cls(data["records"], data["speakers"].tolist())
+
+    def to_arrow(self):
+        pa = _require_arrow()
+        speakers = pa.DictionaryArray.from_arrays(
+            pa.array(self.records["speaker"], mask=self.records["speaker"] < 0),
+            pa.array(self.speakers, pa.string()),
+        )
+        return pa.table(
+            {
+                "start": self.records["start"],
+                "end": self.records["end"],
+                "speaker": speakers,
+            }
+        )
+
+
+class SegmentStore:
+    """Transcript segments and their words as structured arrays.
+
+    All text lives in one UTF-8 buffer that records address by byte offset,
+    so a transcript costs a few dozen bytes per segment plus its text instead
+    of a Python object graph per segment and word. Segments are sorted by
+    start time.
+    """
+
+    def __init__(
+        self,
+        records: np.ndarray,
+        words: np.ndarray,
+        text: bytes,
+        speakers: Sequence[str] = (),
+    ):
+        self.records = records
+        self.words = words
+        self.text = text
+        self.speakers = list(speakers)
+
+    @classmethod
+    def from_segments(cls, segments: Iterable) -> "SegmentStore":
+        segments = sorted(segments, key=lambda s: s.start)
+        word_rows: list = []
+        buffer = bytearray()
+        rows = []
+        for segment in segments:
+            text = segment.text.encode("utf-8")
+            text_start = len(buffer)
+            buffer += text
+            word_start = word_end = -1
+            words = getattr(segment, "words", None)
+            if words is not None:
+                word_start = len(word_rows)
+                for word in words:
+                    encoded = word.word.encode("utf-8")
+                    word_rows.append(
+                        (
+                            word.start,
+                            word.end,
+                            word.probability,
+                            len(buffer),
+                            len(buffer) + len(encoded),
+                        )
+                    )
+                    buffer += encoded
+                word_end = len(word_rows)
+            rows.append(
+                (
+                    segment.start,
+                    segment.end,
+                    -1,
+                    text_start,
+                    text_start + len(text),
+                    word_start,
+                    word_end,
+                )
+            )
+        records = np.array(rows, dtype=SEGMENT_DTYPE)
+        words = np.array(word_rows, dtype=WORD_DTYPE)
+        return cls(records, words, bytes(buffer))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def starts(self) -> np.ndarray:
+        return self.records["start"]
+
+    @property
+    def ends(self) -> np.ndarray:
+        return self.records["end"]
+
+    def text_at(self, index: int) -> str:
+        record = self.records[index]
+        return self.text[record["text_start"] : record["text_end"]].decode("utf-8")
+
+    def speaker_at(self, index: int) -> Optional[str]:
+        speaker = int(self.records[index]["speaker"])
+        return self.speakers[speaker] if speaker >= 0 else None
+
+    def segment(self, index: int) -> Segment:
+        start, end, _, text_start, text_end, word_start, word_end = self.records[
+            index
+        ].tolist()
+        words = None
+        if word_start >= 0:
+            words = [
+                Word(w_start, w_end, self.text[a:b].decode("utf-8"), probability)
+                for w_start, w_end, probability, a, b in self.words[
+                    word_start:word_end
+                ].tolist()
+            ]
+        return Segment(
+            start, end, self.text[text_start:text_end].decode("utf-8"), words
+        )
+
+    def __iter__(self) -> Iterator[Segment]:
+        return (self.segment(index) for index in range(len(self)))
+
+    def with_speakers(self) -> Iterator[Tuple[Segment, Optional[str]]]:
+        """Each segment with its assigned speaker name."""
+        return (
+            (self.segment(index), self.speaker_at(index)) for index in range(len(self))
+        )
+
+    def between(self, start: float, end: float) -> "SegmentStore":
+        """Segments overlapping ``[start, end)``, sharing this store's text."""
+        index = _time_range(self.starts, self.ends, start, end)
+        return SegmentStore(self.records[index], self.words, self.text, self.speakers)
+
+    def assign_speakers(self, turns: TurnStore, policy: str = "overlap") -> np.ndarray:
+        """Label each segment with a speaker; returns the speaker IDs.
+
+        With the ``overlap`` policy, a segment goes to the speaker it overlaps
+        most; with ``start``, to whoever is speaking when it starts.
+        """
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"Unknown merge policy: {policy}")
+        ends = self.ends
+        if policy == "start":
+            # A vanishingly short span at each start selects the turn holding it
+            ends = np.nextafter(self.starts, np.inf)
+        index = assign_turn_indices(
+            self.starts, ends, turns.records["start"], turns.records["end"]
+        )
+        ids = np.full(len(index), -1, dtype=np.int32)
+        matched = index >= 0
+        ids[matched] = turns.records["speaker"][index[matched]]
+        self.records["speaker"] = ids
+        self.speakers = list(turns.speakers)
+        return ids
+
+    def save(self, path: Path) -> None:
+        np.savez_compressed(
+            path,
+            records=self.records,
+            words=self.words,
+            text=np.frombuffer(self.text, dtype=np.uint8),
+            speakers=np.array(self.speakers, dtype=np.str_),
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SegmentStore":
+        with np.load(path) as data:
+            return cls(
+                data["records"],
+                data["words"],
+                data["text"].tobytes(),
+                data["speakers"].tolist(),
+            )
+
+    def to_arrow(self):
+        """Segments as an Arrow table, with speakers dictionary-encoded."""
+        pa = _require_arrow()
+        speakers = pa.DictionaryArray.from_arrays(
+            pa.array(self.records["speaker"], mask=self.records["speaker"] < 0),
+            pa.array(self.speakers, pa.string()),
+        )
+        return pa.table(
+            {
+                "start": self.records["start"],
+                "end": self.records["end"],
+                "speaker": speakers,
+                "text": pa.array(
+                    [self.text_at(index) for index in range(len(self))],
+                    pa.large_string(),
+                ),
+            }
+        )
+
+
+def save_results(path: Path, segments: SegmentStore, turns: TurnStore) -> None:
+    """Write a recording's raw segments and turns to one ``.npz`` file."""
+    np.savez_compressed(
+        path,
+        segment_records=segments.records,
+        segment_words=segments.words,
+        segment_text=np.frombuffer(segments.text, dtype=np.uint8),
+        turn_records=turns.records,
+        turn_speakers=np.array(turns.speakers, dtype=np.str_),
+        by_channel=np.array(turns.by_channel),
+    )
+
+
+def load_results(path: Path) -> Tuple[SegmentStore, TurnStore]:
+    """Read results written by ``save_results``."""
+    with np.load(path) as data:
+        segments = SegmentStore(
+            data["segment_records"],
+            data["segment_words"],
+            data["segment_text"].tobytes(),
+            # Any assigned speaker IDs refer to the turns' speakers
+            data["turn_speakers"].tolist(),
+        )
+        turns = TurnStore(
+            data["turn_records"],
+            data["turn_speakers"].tolist(),
+            # Results saved before multichannel capture have no flag
+            bool(data["by_channel"]) if "by_channel" in data else False,
+        )
+    return segments, turns
+
+
+def merge_channels(
+    channels: Sequence[Tuple[str, Sequence]]
+) -> Tuple[SegmentStore, TurnStore]:
+    """Interleave per-channel transcripts by start time.
+
+    ``channels`` pairs each channel's name with its start-sorted segments.
+    Every segment is labelled with its channel directly, since overlapping
+    speech on two channels would make matching against turns ambiguous, and
+    also becomes a turn of that channel so saved results can be re-rendered.
+    """
+    names = [name for name, _ in channels]
+    merged = list(
+        heapq.merge(
+            *(
+                zip(repeat(index), segments)
+                for index, (_, segments) in enumerate(channels)
+            ),
+            key=lambda item: item[1].start,
+        )
+    )
+    # from_segments sorts stably, so the order and the IDs still line up
+    segments = SegmentStore.from_segments(segment for _, segment in merged)
+    ids = np.array([index for index, _ in merged], dtype=np.int32)
+    segments.records["speaker"] = ids
+    segments.speakers = list(names)
+    records = np.empty(len(merged), dtype=TURN_DTYPE)
+    records["start"] = segments.starts
+    records["end"] = segments.ends
+    records["speaker"] = ids
+    return segments, TurnStore(records, names, by_channel=True)
@@ -0,0 +1,142 @@
+import json
+import os
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional
+
+
+def peak_rss_mb() -> float:
+    """High-water mark of this process's resident memory, in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class Span:
+    """A timed stage of work, shaped after an OpenTelemetry span.
+
+    ``cpu_seconds`` is the process-wide CPU time used while the span was
+    open, so it includes model threads but also any concurrent stages;
+    ``thread_cpu_seconds`` covers only the thread that ran the span.
+    """
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, **attributes):
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.trace_id = parent.trace_id if parent is not None else os.urandom(16).hex()
+        self.parent_id = parent.span_id if parent is not None else None
+        self.attributes = dict(attributes)
+        self.status = "OK"
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.thread_cpu_seconds = 0.0
+        self.peak_rss_mb = 0.0
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._thread_cpu_started = time.thread_time()
+
+    def set(self, **attributes) -> None:
+        """Attach attributes, such as the amount of audio the stage handled."""
+        self.attributes.update(attributes)
+
+    @property
+    def real_time_factor(self) -> Optional[float]:
+        """Wall time per second of audio, when the span recorded its length."""
+        audio_seconds = self.attributes.get("audio_seconds")
+        if not audio_seconds:
+            return None
+        return self.wall_seconds / audio_seconds
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        self.wall_seconds = time.perf_counter() - self._started
+        self.cpu_seconds = time.process_time() - self._cpu_started
+        self.thread_cpu_seconds = time.thread_time() - self._thread_cpu_started
+        self.peak_rss_mb = peak_rss_mb()
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = "ERROR"
+            self.attributes["error"] = f"{type(error).__name__}: {error}"
+
+    def to_dict(self) -> dict:
+        """Field names follow the OpenTelemetry span data model."""
+        attributes = dict(
+            self.attributes,
+            **{
+                "wall_seconds": self.wall_seconds,
+                "cpu_seconds": self.cpu_seconds,
+                "thread_cpu_seconds": self.thread_cpu_seconds,
+                "peak_rss_mb": self.peak_rss_mb,
+            },
+        )
+        if self.real_time_factor is not None:
+            attributes["real_time_factor"] = self.real_time_factor
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "status": self.status,
+            "attributes": attributes,
+        }
+
+
+class JsonLinesExporter:
+    """Appends each finished span to a file as one JSON object per line."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __call__(self, span: Span) -> None:
+        line = json.dumps(span.to_dict())
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class Tracer:
+    """Creates spans and hands each one to the exporters once it ends."""
+
+    def __init__(self, exporters: Optional[List[Callable[[Span], None]]] = None):
+        self.exporters: List[Callable[[Span], None]] = list(exporters or [])
+
+    @classmethod
+    def from_config(cls, config: dict) -> "Tracer":
+        """A tracer writing JSON lines to ``trace_path`` when it is set."""
+        trace_path = config.get("trace_path")
+        return cls([JsonLinesExporter(trace_path)] if trace_path else [])
+
+    def add_exporter(self, exporter: Callable[[Span], None]) -> None:
+        self.exporters.append(exporter)
+
+    @contextmanager
+    def span(
+        self, name: str, parent: Optional[Span] = None, **attributes
+    ) -> Iterator[Span]:
+        """Time the enclosed block as a span, recording errors it raises."""
+        span = Span(name, parent, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            span.end(e)
+            self._export(span)
+            raise
+        span.end()
+        self._export(span)
+
+    def _export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter(span)
+            except Exception as e:
+                # Telemetry must never break processing
+                print(f"Span export failed: {e}", file=sys.stderr)
@@ -0,0 +1,236 @@
+from typing import List, Optional, Tuple
+import numpy as np
+from core.results import Segment, Word
+from core.speakers import Turn
+
+
+def frame_energy_db(audio: np.ndarray, frame_size: int) -> np.ndarray:
+    """Return the RMS level in dBFS of each complete frame of a mono signal."""
+    frames = len(audio) // frame_size
+    if frames == 0:
+        return np.empty(0, dtype=np.float32)
+    framed = audio[: frames * frame_size].reshape(frames, frame_size)
+    rms = np.sqrt(np.mean(np.square(framed, dtype=np.float32), axis=1))
+    return 20 * np.log10(np.maximum(rms, 1e-10))
+
+
+def speech_regions(
+    audio: np.ndarray,
+    sample_rate: int = 16000,
+    frame_ms: int = 30,
+    threshold_db: float = -40.0,
+    min_silence_ms: int = 2000,
+    padding_ms: int = 300,
+) -> np.ndarray:
+    """Return ``(start, end)`` sample ranges of speech as an ``(n, 2)`` array.
+
+    Voiced frames are widened by ``padding_ms`` on each side, and silences
+    shorter than ``min_silence_ms`` are kept so the models still see natural
+    pauses. Only long silences fall between regions.
+    """
+    frame_size = sample_rate * frame_ms // 1000
+    voiced = frame_energy_db(audio, frame_size) >= threshold_db
+    if len(audio) % frame_size and len(voiced):
+        # The trailing partial frame goes with the last full one
+        voiced = np.append(voiced, voiced[-1])
+    if not voiced.any():
+        return np.empty((0, 2), dtype=np.int64)
+
+    edges = np.diff(voiced.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    padding = padding_ms // frame_ms
+    starts = np.maximum(starts - padding, 0)
+    ends = np.minimum(ends + padding, len(voiced))
+    gaps = starts[1:] - ends[:-1]
+    cut = gaps >= max(1, min_silence_ms // frame_ms)
+    starts = starts[np.concatenate(([True], cut))]
+    ends = ends[np.concatenate((cut, [True]))]
+
+    regions = np.stack([starts, ends], axis=1).astype(np.int64) * frame_size
+    np.minimum(regions, len(audio), out=regions)
+    return regions
+
+
+class SpeechTimeline:
+    """Maps between a recording and its speech-only version.
+
+    ``compact`` keeps only the speech regions, back to back; results on the
+    compacted audio are mapped back to recording time with ``to_original``.
+    """
+
+    def __init__(self, regions: np.ndarray, duration: int, sample_rate: int = 16000):
+        self.regions = np.asarray(regions, dtype=np.int64).reshape(-1, 2)
+        self.duration = duration
+        self.sample_rate = sample_rate
+        lengths = self.regions[:, 1] - self.regions[:, 0]
+        self.speech_samples = int(lengths.sum())
+        self._original_starts = self.regions[:, 0] / sample_rate
+        self._compact_starts = (np.cumsum(lengths) - lengths) / sample_rate
+
+    @classmethod
+    def detect(cls, audio: np.ndarray, sample_rate: int = 16000, **options):
+        return cls(
+            speech_regions(audio, sample_rate, **options), len(audio), sample_rate
+        )
+
+    @property
+    def is_identity(self) -> bool:
+        """True when nothing would be trimmed."""
+        return len(self.regions) == 1 and self.speech_samples == self.duration
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_samples / self.duration if self.duration else 0.0
+
+    def compact(self, audio: np.ndarray) -> np.ndarray:
+        """The speech regions of ``audio`` joined end to end."""
+        if self.is_identity:
+            return audio
+        if not len(self.regions):
+            return audio[:0]
+        return np.concatenate([audio[start:end] for start, end in self.regions])
+
+    def to_original(self, times, end: bool = False) -> np.ndarray:
+        """Map compacted times in seconds to recording times.
+
+        A time exactly at a join belongs to the next region, or with ``end``
+        set, to the previous one, so spans never absorb the removed silence.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if not len(self.regions):
+            return times
+        side = "left" if end else "right"
+        index = np.searchsorted(self._compact_starts, times, side=side) - 1
+        index = np.clip(index, 0, len(self.regions) - 1)
+        return self._original_starts[index] + times - self._compact_starts[index]
+
+    def restore_segments(self, segments) -> List[Segment]:
+        """Transcript segments with their times mapped back to the recording."""
+        starts = self.to_original([s.start for s in segments])
+        ends = self.to_original([s.end for s in segments], end=True)
+        restored = []
+        for segment, start, end in zip(segments, starts, ends):
+            words = None
+            if getattr(segment, "words", None):
+                word_starts = self.to_original([w.start for w in segment.words])
+                word_ends = self.to_original([w.end for w in segment.words], end=True)
+                words = [
+                    Word(float(s), float(e), w.word, w.probability)
+                    for w, s, e in zip(segment.words, word_starts, word_ends)
+                ]
+            restored.append(Segment(float(start), float(end), segment.text, words))
+        return restored
+
+    def restore_turns(self, turns) -> List[Turn]:
+        """Speaker turns with their times mapped back to the recording.
+
+        A turn running across a join is split into one turn per region, so
+        no turn covers removed silence.
+        """
+        if not len(self.regions):
+            return [Turn(t.start, t.end, t.speaker) for t in turns]
+        compact_ends = (
+            self._compact_starts
+            + (self.regions[:, 1] - self.regions[:, 0]) / self.sample_rate
+        )
+        first = np.searchsorted(
+            self._compact_starts, [t.start for t in turns], side="right"
+        )
+        last = np.searchsorted(self._compact_starts, [t.end for t in turns])
+        restored = []
+        for turn, low, high in zip(turns, first - 1, last - 1):
+            low = max(int(low), 0)
+            high = min(max(int(high), low), len(self.regions) - 1)
+            for index in range(low, high + 1):
+                start = max(turn.start, self._compact_starts[index])
+                end = turn.end if index == high else compact_ends[index]
+                offset = self._original_starts[index] - self._compact_starts[index]
+                restored.append(
+                    Turn(float(start + offset), float(end + offset), turn.speaker)
+                )
+        return restored
+
+
+class UtteranceSegmenter:
+    """Cuts a live mono stream into utterance-sized windows using energy VAD."""
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_ms: int = 30,
+        threshold_db: float = -40.0,
+        min_silence_ms: int = 600,
+        max_utterance_s: float = 30.0,
+        preroll_ms: int = 300,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_size = sample_rate * frame_ms // 1000
+        self.threshold_db = threshold_db
+        self.min_silence_frames = max(1, min_silence_ms // frame_ms)
+        self.max_utterance_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.preroll_frames = preroll_ms // frame_ms
+
+        self._pending = np.empty(0, dtype=np.float32)
+        self._frames: List[np.ndarray] = []
+        self._start = 0
+        self._position = 0
+        self._in_speech = False
+        self._silent_frames = 0
+
+    def push(self, block: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+        """Add samples and return any utterances completed by them.
+
+        Each utterance is returned as ``(start_sample, audio)``.
+        """
+        audio = np.concatenate((self._pending, block.reshape(-1)))
+        usable = len(audio) - len(audio) % self.frame_size
+        self._pending = audio[usable:].copy()
+
+        levels = frame_energy_db(audio[:usable], self.frame_size)
+        utterances = []
+        for index, level in enumerate(levels):
+            frame = audio[index * self.frame_size : (index + 1) * self.frame_size]
+            utterance = self._push_frame(frame, level >= self.threshold_db)
+            if utterance is not None:
+                utterances.append(utterance)
+        return utterances
+
+    def flush(self) -> Optional[Tuple[int, np.ndarray]]:
+        """Return the trailing utterance, if the stream ended mid-speech."""
+        if self._in_speech:
+            return self._emit()
+        return None
+
+    def _push_frame(
+        self, frame: np.ndarray, voiced: bool
+    ) -> Optional[Tuple[int, np.ndarray]]:
+        self._frames.append(frame)
+        self._position += len(frame)
+
+        if not self._in_speech:
+            if voiced:
+                self._in_speech = True
+                self._silent_frames = 0
+            else:
+                # Keep a short pre-roll so word onsets are not clipped
+                if len(self._frames) > self.preroll_frames:
+                    self._frames.pop(0)
+            self._start = self._position - len(self._frames) * self.frame_size
+            return None
+
+        self._silent_frames = 0 if voiced else self._silent_frames + 1
+        if (
+            self._silent_frames >= self.min_silence_frames
+            or len(self._frames) >= self.max_utterance_frames
+        ):
+            return self._emit()
+        return None
+
+    def _emit(self) -> Tuple[int, np.ndarray]:
+        utterance = (self._start, np.concatenate(self._frames))
+        self._frames = []
+        self._in_speech = False
+        self._silent_frames = 0
+        self._start = self._position
+        return utterance
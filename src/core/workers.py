@@ -0,0 +1,84 @@
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List
+import numpy as np
+import torch
+from core.speakers import Turn, annotation_to_turns
+
+# Diarization pipeline loaded once per worker process by _init_worker
+_pipeline = None
+
+
+def _discard(*args, **kwargs) -> None:
+    """Log sink for worker processes, which have no UI to write to."""
+
+
+def _init_worker(config: dict) -> None:
+    """Load the diarization pipeline when a worker process starts."""
+    global _pipeline
+    from core.models import ModelManager
+
+    manager = ModelManager(config, _discard, _discard)
+    manager.load_cached_first([manager._load_pyannote])
+    _pipeline = manager.diarization_pipeline
+
+
+def _ping() -> bool:
+    return _pipeline is not None
+
+
+def _diarize_shared(name: str, frames: int, sample_rate: int) -> List[Turn]:
+    """Diarize audio that the parent placed in a shared memory block."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        waveform = np.ndarray((frames,), dtype=np.float32, buffer=shm.buf)
+        audio = {
+            "waveform": torch.from_numpy(waveform)[None, :],
+            "sample_rate": sample_rate,
+        }
+        turns = annotation_to_turns(_pipeline(audio))
+        # Drop every view of the buffer before it is closed
+        del audio, waveform
+        return turns
+    finally:
+        shm.close()
+
+
+class DiarizationWorkerPool:
+    """Runs diarization in long-lived worker processes, outside the UI's GIL.
+
+    Each worker loads the pyannote pipeline once at start-up and keeps it
+    resident. Audio is handed over through shared memory, so only the block
+    name crosses the process boundary and the returned turns come back.
+    """
+
+    def __init__(self, config: dict, workers: int = 1):
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+
+    def warm_up(self) -> Future:
+        """Start a worker and load its models; resolves once it is ready."""
+        return self._executor.submit(_ping)
+
+    def diarize(self, waveform: np.ndarray, sample_rate: int = 16000) -> List[Turn]:
+        """Diarize a mono float32 waveform in a worker process."""
+        waveform = np.ascontiguousarray(waveform, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(waveform.nbytes, 1))
+        try:
+            shared = np.ndarray(waveform.shape, dtype=np.float32, buffer=shm.buf)
+            shared[:] = waveform
+            del shared
+            return self._executor.submit(
+                _diarize_shared, shm.name, len(waveform), sample_rate
+            ).result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
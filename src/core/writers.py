@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Type
+from core.results import segment_to_dict
+from core.store import load_results
+
+
+def format_clock(seconds: float, separator: str = ".") -> str:
+    """``HH:MM:SS.mmm`` (or with a comma, as SRT requires)."""
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def speaker_label(speaker: Optional[str]) -> str:
+    return "Unknown" if speaker is None else f"Speaker {speaker}"
+
+
+def transcript_line(segment, speaker: Optional[str], speakers: bool = True) -> str:
+    """``[HH:MM:SS] Speaker X: text``, the plain text and log line format."""
+    timestamp_str = time.strftime("%H:%M:%S", time.gmtime(segment.start))
+    label = f"{speaker_label(speaker)}: " if speakers else ""
+    return f"[{timestamp_str}] {label}{segment.text.strip()}"
+
+
+class TranscriptWriter(ABC):
+    """Appends finalized segments to a transcript file.
+
+    Segments are written to a ``.part`` file next to the target as they
+    arrive, and ``close`` renames it into place, so the transcript path only
+    ever holds a complete file. With ``speakers`` off, lines carry no label.
+    """
+
+    extension = ""
+
+    def __init__(self, path: Path, speakers: bool = True):
+        self.path = Path(path)
+        self.speakers = speakers
+        self.partial_path = self.path.with_name(self.path.name + ".part")
+        self._file = open(self.partial_path, "w", encoding="utf-8")
+        self.count = 0
+        self.write_header()
+
+    def write_header(self) -> None:
+        pass
+
+    @abstractmethod
+    def format(self, segment, speaker: Optional[str]) -> str:
+        """One segment as it appears in the file."""
+
+    def label(self, speaker: Optional[str]) -> str:
+        """``Speaker X: `` prefix, or nothing when speakers are not tracked."""
+        return f"{speaker_label(speaker)}: " if self.speakers else ""
+
+    def write(self, segment, speaker: Optional[str] = None) -> None:
+        """Append one segment."""
+        self.count += 1
+        self._file.write(self.format(segment, speaker))
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def close(self) -> Path:
+        """Finish the file and move it into place atomically."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self.partial_path, self.path)
+        return self.path
+
+    def abort(self) -> None:
+        """Discard a transcript that will not be completed."""
+        self._file.close()
+        self.partial_path.unlink(missing_ok=True)
+
+
+class TextWriter(TranscriptWriter):
+    """``[HH:MM:SS] Speaker X: text`` lines, as shown in the log."""
+
+    extension = ".txt"
+
+    def format(self, segment, speaker: Optional[str]) -> str:
+        return transcript_line(segment, speaker, self.speakers) + "\n"
+
+
+class SrtWriter(TranscriptWriter):
+    extension = ".srt"
+
+    def format(self, segment, speaker: Optional[str]) -> str:
+        return (
+            f"{self.count}\n"
+            f"{format_clock(segment.start, ',')} --> {format_clock(segment.end, ',')}\n"
+            f"{self.label(speaker)}{segment.text.strip()}\n\n"
+        )
+
+
+class VttWriter(TranscriptWriter):
+    extension = ".vtt"
+
+    def write_header(self) -> None:
+        self._file.write("WEBVTT\n\n")
+
+    def format(self, segment, speaker: Optional[str]) -> str:
+        voice = f"<v {speaker_label(speaker)}>" if self.speakers else ""
+        return (
+            f"{format_clock(segment.start)} --> {format_clock(segment.end)}\n"
+            f"{voice}{segment.text.strip()}\n\n"
+        )
+
+
+class JsonLinesWriter(TranscriptWriter):
+    """One JSON object per segment, with word timestamps when decoded."""
+
+    extension = ".jsonl"
+
+    def format(self, segment, speaker: Optional[str]) -> str:
+        data = segment_to_dict(segment)
+        data["text"] = data["text"].strip()
+        if self.speakers:
+            data["speaker"] = speaker
+        return json.dumps(data, ensure_ascii=False) + "\n"
+
+
+WRITERS: Dict[str, Type[TranscriptWriter]] = {
+    "txt": TextWriter,
+    "srt": SrtWriter,
+    "vtt": VttWriter,
+    "jsonl": JsonLinesWriter,
+}
+
+
+class TranscriptWriters:
+    """Writes each segment to every requested format at once."""
+
+    def __init__(
+        self,
+        output_dir: Path,
+        stem: str,
+        formats: Sequence[str],
+        speakers: bool = True,
+    ):
+        unknown = [name for name in formats if name not in WRITERS]
+        if unknown:
+            raise ValueError(f"Unknown transcript format: {', '.join(unknown)}")
+        self.writers: List[TranscriptWriter] = []
+        try:
+            for name in formats:
+                writer_class = WRITERS[name]
+                path = Path(output_dir) / f"{stem}{writer_class.extension}"
+                self.writers.append(writer_class(path, speakers))
+        except Exception:
+            self.abort()
+            raise
+
+    @property
+    def paths(self) -> List[Path]:
+        return [writer.path for writer in self.writers]
+
+    def write(self, segment, speaker: Optional[str] = None) -> None:
+        for writer in self.writers:
+            writer.write(segment, speaker)
+
+    def flush(self) -> None:
+        for writer in self.writers:
+            writer.flush()
+
+    def close(self) -> Path:
+        """Close every file; returns the first format's path."""
+        for writer in self.writers:
+            writer.close()
+        return self.writers[0].path
+
+    def abort(self) -> None:
+        for writer in self.writers:
+            writer.abort()
+
+
+def render_results(
+    path: Path,
+    formats: Sequence[str],
+    output_dir: Optional[Path] = None,
+    renames: Optional[Dict[str, str]] = None,
+    policy: str = "overlap",
+    speakers: Optional[bool] = None,
+) -> List[Path]:
+    """Rewrite a recording's transcripts from its saved raw results.
+
+    ``renames`` maps diarized labels such as ``SPEAKER_00`` (or channel
+    names) to names; giving two labels the same name merges them. Segments
+    recorded per channel keep their channel's speaker whatever the
+    ``policy``. ``speakers`` defaults to whether the recording was diarized.
+    Returns the written paths.
+    """
+    path = Path(path)
+    segments, turns = load_results(path)
+    renames = renames or {}
+    unknown = sorted(set(renames) - set(turns.speakers))
+    if unknown:
+        raise ValueError(
+            f"Unknown speaker {', '.join(unknown)}; "
+            f"known speakers: {', '.join(turns.speakers) or 'none'}"
+        )
+    if not turns.by_channel:
+        segments.assign_speakers(turns, policy)
+    segments.speakers = [renames.get(name, name) for name in segments.speakers]
+
+    stem = path.stem
+    if stem.startswith("results_"):
+        stem = "transcript_" + stem[len("results_") :]
+    if speakers is None:
+        speakers = len(turns) > 0
+    output_dir = Path(output_dir or path.parent)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    writers = TranscriptWriters(output_dir, stem, formats, speakers)
+    try:
+        for segment, speaker in segments.with_speakers():
+            writers.write(segment, speaker)
+        writers.close()
+    except BaseException:
+        writers.abort()
+        raise
+    return writers.paths
+
+
+class LogBatcher:
+    """Groups log lines into fewer, larger writes so the UI keeps up.
+
+    Lines are forwarded once ``max_lines`` have built up or ``interval``
+    seconds have passed since the last write, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        write_log: Callable[[str], None],
+        max_lines: int = 50,
+        interval: float = 0.2,
+    ):
+        self.write_log = write_log
+        self.max_lines = max_lines
+        self.interval = interval
+        self._lines: List[str] = []
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def add(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+            due = (
+                len(self._lines) >= self.max_lines
+                or time.monotonic() - self._last >= self.interval
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            lines, self._lines = self._lines, []
+            self._last = time.monotonic()
+        if lines:
+            self.write_log("\n".join(lines))
@@ -1,15 +1,190 @@
 #!/usr/bin/env python3
+import argparse
 import sys
-from config.environment import check_environment
-from ui.app import TranscriberApp
+import time
+from pathlib import Path
+from config.environment import check_environment, output_formats
+from config.hardware import save_calibration, supported_compute_types
+from controllers.batch_controller import BatchController
+from core.calibration import CPU_COMPUTE_TYPES, DEFAULT_MODELS, calibrate
+from core.processor import decode_audio_file
+from core.server import run_server
+from core.store import MERGE_POLICIES
+from core.writers import WRITERS, render_results
 
 
-def main():
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog="echoes", description="Record audio and create transcripts."
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.add_parser(
+        "serve", help="keep the models loaded and share them over a Unix socket"
+    )
+
+    batch = commands.add_parser("batch", help="transcribe existing audio files")
+    batch.add_argument(
+        "sources", nargs="+", help="audio files, directories or glob patterns"
+    )
+    batch.add_argument(
+        "--jobs", type=int, default=2, help="files processed concurrently"
+    )
+    batch.add_argument(
+        "--asr-workers", type=int, default=1, help="concurrent Whisper transcriptions"
+    )
+    batch.add_argument(
+        "--diarization-workers", type=int, default=1, help="concurrent diarizations"
+    )
+    batch.add_argument(
+        "--manifest",
+        type=Path,
+        help="progress manifest (default: OUTPUT/batch_manifest.jsonl)",
+    )
+
+    calibration = commands.add_parser(
+        "calibrate",
+        help="pick the fastest Whisper model and compute type for this CPU",
+    )
+    calibration.add_argument("audio", type=Path, help="representative recording")
+    calibration.add_argument(
+        "--reference", type=Path, help="correct transcript of the recording"
+    )
+    calibration.add_argument(
+        "--seconds", type=float, default=60, help="length of audio to decode"
+    )
+    calibration.add_argument(
+        "--models", nargs="+", default=DEFAULT_MODELS, help="most accurate first"
+    )
+    calibration.add_argument("--compute-types", nargs="+")
+    calibration.add_argument(
+        "--max-rtf", type=float, default=0.5, help="slowest acceptable real-time factor"
+    )
+    calibration.add_argument(
+        "--max-wer",
+        type=float,
+        default=0.15,
+        help="highest acceptable word error rate against the reference",
+    )
+
+    render = commands.add_parser(
+        "render", help="rewrite transcripts from saved results without the models"
+    )
+    render.add_argument("results", nargs="+", type=Path, help="results_*.npz files")
+    render.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(WRITERS),
+        help="default: TRANSCRIBER_FORMATS",
+    )
+    render.add_argument(
+        "--rename",
+        action="append",
+        default=[],
+        metavar="LABEL=NAME",
+        help="name a speaker, e.g. SPEAKER_00=Alice; repeat for more",
+    )
+    render.add_argument(
+        "--merge",
+        choices=MERGE_POLICIES,
+        default="overlap",
+        help="give each segment the speaker it overlaps most, or who spoke at its start",
+    )
+    render.add_argument(
+        "--no-speakers", action="store_true", help="leave out speaker labels"
+    )
+    render.add_argument(
+        "--output-dir", type=Path, help="default: next to each results file"
+    )
+    return parser.parse_args(argv)
+
+
+def run_batch(config: dict, args: argparse.Namespace) -> int:
+    """Run the headless batch pipeline; returns the process exit code."""
+    config = dict(
+        config,
+        max_active_jobs=args.jobs,
+        asr_workers=args.asr_workers,
+        diarization_workers=args.diarization_workers,
+    )
+    controller = BatchController(config, print, manifest_path=args.manifest)
+    summary = controller.run(args.sources)
+    return 1 if summary["failed"] else 0
+
+
+def run_calibration(config: dict, args: argparse.Namespace) -> None:
+    """Measure the candidates on a recording and persist the fastest one."""
+    audio = decode_audio_file(args.audio)[: int(args.seconds * 16000)]
+    reference = args.reference.read_text(encoding="utf-8") if args.reference else None
+    compute_types = args.compute_types or [
+        compute_type
+        for compute_type in CPU_COMPUTE_TYPES
+        if compute_type in supported_compute_types(config["device"])
+    ]
+    result = calibrate(
+        audio,
+        [
+            (model, compute_type)
+            for model in args.models
+            for compute_type in compute_types
+        ],
+        max_rtf=args.max_rtf,
+        max_wer=args.max_wer,
+        reference=reference,
+        device=config["device"],
+        cpu_threads=config["cpu_threads"],
+        beam_size=config.get("whisper_beam_size", 5),
+    )
+    save_calibration(config["calibration_path"], result)
+    print(
+        f"\nSelected {result['whisper_model']} ({result['compute_type']}): "
+        f"RTF {result['rtf']:.3f}, WER {result['wer']:.1%}. "
+        f"Saved to {config['calibration_path']}"
+    )
+
+
+def run_render(args: argparse.Namespace) -> None:
+    """Rewrite transcripts from saved results; needs no models or token."""
+    renames = {}
+    for rename in args.rename:
+        label, separator, name = rename.partition("=")
+        if not separator or not label or not name:
+            raise ValueError(f"--rename expects LABEL=NAME, got {rename!r}")
+        renames[label] = name
+    for path in args.results:
+        started = time.perf_counter()
+        paths = render_results(
+            path,
+            args.formats or output_formats(),
+            output_dir=args.output_dir,
+            renames=renames,
+            policy=args.merge,
+            speakers=False if args.no_speakers else None,
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"Rendered {', '.join(map(str, paths))} in {elapsed:.0f} ms")
+
+
+def main(argv=None):
     """Main entry point for the application."""
+    args = parse_args(argv)
     try:
+        if args.command == "render":
+            run_render(args)
+            return
         config = check_environment()
-        app = TranscriberApp(config)
-        app.run()
+        if args.command == "serve":
+            run_server(config)
+        elif args.command == "batch":
+            sys.exit(run_batch(config, args))
+        elif args.command == "calibrate":
+            run_calibration(config, args)
+        else:
+            # Imported here so headless commands never need Textual or PortAudio
+            from ui.app import TranscriberApp
+
+            app = TranscriberApp(config)
+            app.run()
     except Exception as e:
         print(f"Fatal error: {str(e)}", file=sys.stderr)
         sys.exit(1)
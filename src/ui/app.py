@@ -1,5 +1,5 @@
-import queue
 import threading
+import time
 from typing import Optional
 import numpy as np
 from textual.app import App, ComposeResult
@@ -9,9 +9,12 @@ from textual.reactive import reactive
 from textual.binding import Binding
 
 from controllers.audio_controller import AudioController
+from core.audio import BlockQueue
+from ui.events import UIEventBus, UIUpdate
 from ui.widgets.audio_meter import AudioMeter
 from ui.widgets.processing_progress import ProcessingProgress
 from ui.widgets.recording_status import RecordingStatus
+from ui.widgets.stage_timings import StageTimings
 
 
 class TranscriberApp(App):
@@ -29,7 +32,13 @@ class TranscriberApp(App):
     }
 
     #progress {
-        height: 3;
+        height: auto;
+        min-height: 3;
+        margin: 1 0;
+    }
+
+    #timings {
+        height: auto;
         margin: 1 0;
     }
 
@@ -50,10 +59,16 @@ class TranscriberApp(App):
 
     BINDINGS = [
         Binding("r", "toggle_recording", "Record"),
+        Binding("c", "cancel_processing", "Cancel Job"),
         Binding("q", "quit", "Quit"),
         Binding("tab", "switch_focus", "Switch Focus"),
     ]
 
+    # Rate at which queued audio is consumed and the meter redrawn
+    METER_FPS = 30
+    # Most log, progress and timing updates drawn per second
+    UI_FPS = 20
+
     # Reactive properties for state management
     is_recording = reactive(False)
 
@@ -61,7 +76,12 @@ class TranscriberApp(App):
         """Initialize the application with configuration."""
         super().__init__()
         self.config = config
-        self.audio_queue = queue.Queue()
+        self._launched = time.perf_counter()
+        self.audio_queue = BlockQueue()
+        self.input_overflows = 0
+        self._callback_status: Optional[str] = None
+        # Worker threads post updates here; they reach widgets on the event loop
+        self.events = UIEventBus(self._deliver, fps=self.UI_FPS)
         self.controller = AudioController(config, self.write_log, self.update_progress)
 
         # Widget references
@@ -69,6 +89,9 @@ class TranscriberApp(App):
         self._meter: Optional[AudioMeter] = None
         self._status: Optional[RecordingStatus] = None
         self._progress: Optional[ProcessingProgress] = None
+        self._timings: Optional[StageTimings] = None
+        if config.get("show_timings"):
+            self.controller.tracer.add_exporter(self.record_span)
 
     def compose(self) -> ComposeResult:
         """Create child widgets for the app."""
@@ -78,6 +101,8 @@ class TranscriberApp(App):
             yield AudioMeter()
             yield RecordingStatus()
             yield ProcessingProgress(id="progress")
+            if self.config.get("show_timings"):
+                yield StageTimings(id="timings")
             yield Static("Press [R] to start/stop recording", classes="status-text")
 
         with ScrollableContainer(id="log-container"):
@@ -92,6 +117,8 @@ class TranscriberApp(App):
         self._meter = self.query_one(AudioMeter)
         self._status = self.query_one(RecordingStatus)
         self._progress = self.query_one(ProcessingProgress)
+        if self.config.get("show_timings"):
+            self._timings = self.query_one(StageTimings)
 
         # Show initial status
         self.write_log("Starting Transcriber App...")
@@ -102,38 +129,102 @@ class TranscriberApp(App):
         def load_models_worker():
             try:
                 self.controller.load_models()
+                startup = time.perf_counter() - self._launched
+                self.write_log(f"Ready to record {startup:.1f}s after launch")
             except Exception as e:
                 self.write_log(f"Error loading models: {str(e)}")
                 self.exit(str(e))
 
+        self.events.start()
+        self.set_interval(1 / self.METER_FPS, self.drain_audio)
+
         self.write_log("Starting model initialization...")
         worker = threading.Thread(target=load_models_worker)
         worker.daemon = True
         worker.start()
 
-    def update_progress(self, progress: float, status: str) -> None:
-        """Update the progress bar and status message."""
-        if self._progress:
-            self._progress.progress = progress
-            self._progress.status = status
-            self._progress.refresh()
+    def on_unmount(self) -> None:
+        self.events.stop()
+        self.controller.shutdown()
+
+    def update_progress(
+        self, progress: float, status: str, job_id: Optional[str] = None
+    ) -> None:
+        """Update the progress bar and status message, or a job's row.
+
+        Safe to call from any thread; shown with the next UI frame.
+        """
+        self.events.progress(progress, status, job_id)
+
+    def record_span(self, span) -> None:
+        """Show a finished telemetry span in the timings panel."""
+        self.events.span(span)
 
     def write_log(self, message: str) -> None:
-        """Write a message to the log widget."""
-        if self._log is not None:
-            self._log.write(f"\n{message}")
+        """Write a message to the log widget from any thread."""
+        self.events.log(message)
+
+    def _deliver(self, update: UIUpdate) -> None:
+        self.call_from_thread(self.apply_update, update)
+
+    def apply_update(self, update: UIUpdate) -> None:
+        """Apply one frame of queued updates; runs on the event loop."""
+        if self._log is not None and update.logs:
+            lines = update.logs
+            if update.skipped_logs:
+                lines = [f"... {update.skipped_logs} log lines skipped"] + lines
+            self._log.write("\n" + "\n".join(lines))
+        if self._progress is not None:
+            for job_id, (progress, status) in update.progress.items():
+                if job_id is not None:
+                    self._progress.set_job(job_id, progress, status)
+                else:
+                    self._progress.progress = progress
+                    self._progress.status = status
+        if self._timings is not None:
+            for span in update.spans:
+                self._timings.add_span(span)
+
+    @property
+    def dropped_blocks(self) -> int:
+        """Blocks discarded because the consumer fell behind the callback."""
+        return self.audio_queue.dropped
 
     def audio_callback(self, indata, frames, time, status):
-        """Handle audio data from the input stream."""
+        """Handle audio data from the input stream.
+
+        Runs on the PortAudio thread, so it only copies the block into the
+        queue; levels, storage and UI updates happen in ``drain_audio``.
+        """
         if status:
-            self.write_log(f"Audio callback status: {str(status)}")
+            if status.input_overflow:
+                self.input_overflows += 1
+            self._callback_status = str(status)
+        self.audio_queue.put(indata.copy())
 
-        # Calculate audio level for meter
-        audio_level = np.sqrt(np.mean(indata**2))
+    def drain_audio(self) -> None:
+        """Consume queued audio blocks and update the audio meter."""
+        if self._callback_status is not None:
+            self.write_log(f"Audio callback status: {self._callback_status}")
+            self._callback_status = None
 
-        # Store audio data if recording
-        if self.controller.is_recording:
-            self.controller.audio_data.append(indata.copy())
+        # Multichannel inputs are stored by the controller, which reports
+        # the loudest channel's level
+        audio_level = self.controller.drain_capture()
+        if audio_level is None:
+            blocks = self.audio_queue.get_all()
+            if not blocks:
+                return
+
+            # Store audio data if recording
+            if self.controller.is_recording:
+                for block in blocks:
+                    self.controller.add_audio(block)
+
+            # Calculate audio level for meter over everything since the last frame
+            frames = sum(len(block) for block in blocks)
+            energy = sum(float(np.sum(np.square(block))) for block in blocks)
+            audio_level = np.sqrt(energy / max(frames, 1))
 
         # Update audio meter
         if self._meter:
@@ -142,9 +233,14 @@ class TranscriberApp(App):
     def action_toggle_recording(self) -> None:
         """Toggle recording state on/off."""
         if self.controller.is_recording:
-            self.controller.stop_recording()
-            self.write_log("Recording stopped")
+            self.controller.stop_recording(drain=self.drain_audio)
+            self.write_log(
+                f"Recording stopped (dropped blocks: {self.dropped_blocks}, "
+                f"input overflows: {self.input_overflows})"
+            )
         else:
+            self.audio_queue.dropped = 0
+            self.input_overflows = 0
             self.controller.start_recording(self.audio_callback)
             self.write_log("Recording started")
             self.update_progress(0.0, "Recording in progress...")
@@ -152,6 +248,14 @@ class TranscriberApp(App):
         if self._status:
             self._status.recording = self.controller.is_recording
 
+    def action_cancel_processing(self) -> None:
+        """Cancel the most recently queued processing job."""
+        job = self.controller.cancel_processing()
+        if job is None:
+            self.write_log("No processing job to cancel")
+        else:
+            self.write_log(f"Cancelling job {job.id}...")
+
     def action_switch_focus(self) -> None:
         """Switch focus between main and log containers."""
         if self.focused == self.query_one("#main-container"):
@@ -0,0 +1,105 @@
+import threading
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class UIUpdate:
+    """Everything that changed in the UI since the previous frame."""
+
+    def __init__(
+        self,
+        logs: List[str],
+        skipped_logs: int,
+        progress: Dict[Optional[str], Tuple[float, str]],
+        spans: list,
+    ):
+        self.logs = logs
+        self.skipped_logs = skipped_logs
+        # Latest (progress, status) per job; the None key is the main bar
+        self.progress = progress
+        self.spans = spans
+
+
+class UIEventBus:
+    """Collects UI updates from any thread and delivers them once per frame.
+
+    Pipeline threads only append to in-memory buffers under a lock, so they
+    never wait for the terminal. A delivery thread hands everything that
+    arrived since the last frame to ``deliver`` at most ``fps`` times a
+    second, keeping only the latest progress per job and at most
+    ``max_log_lines`` pending log lines; older lines beyond that are counted
+    and reported as skipped rather than rendered.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[UIUpdate], None],
+        fps: float = 20,
+        max_log_lines: int = 1000,
+    ):
+        self.deliver = deliver
+        self.interval = 1 / fps
+        self._lock = threading.Lock()
+        self._logs: deque = deque(maxlen=max_log_lines)
+        self._skipped_logs = 0
+        self._progress: Dict[Optional[str], Tuple[float, str]] = {}
+        self._spans: list = []
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def log(self, message: str) -> None:
+        with self._lock:
+            if len(self._logs) == self._logs.maxlen:
+                self._skipped_logs += 1
+            self._logs.append(message)
+
+    def progress(
+        self, progress: float, status: str, job_id: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            # Re-insert so jobs are applied in the order they last changed
+            self._progress.pop(job_id, None)
+            self._progress[job_id] = (progress, status)
+
+    def span(self, span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def drain(self) -> Optional[UIUpdate]:
+        """Take everything pending, or None if nothing changed."""
+        with self._lock:
+            if not (self._logs or self._progress or self._spans):
+                return None
+            update = UIUpdate(
+                list(self._logs), self._skipped_logs, self._progress, self._spans
+            )
+            self._logs.clear()
+            self._skipped_logs = 0
+            self._progress, self._spans = {}, []
+        return update
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop delivering; pending updates are dropped."""
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+        self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            update = self.drain()
+            if update is None:
+                continue
+            try:
+                self.deliver(update)
+            except Exception as e:
+                if self._stopped.is_set():
+                    # The app stopped running while this frame was being delivered
+                    return
+                # A failed frame must not silence every later update
+                self.log(f"Error updating the UI: {str(e)}")
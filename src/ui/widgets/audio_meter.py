@@ -1,36 +1,84 @@
-from textual.reactive import reactive
+import time
+from typing import Dict, Optional, Tuple
+from rich.text import Text
 from textual.widgets import Static
 
 
 class AudioMeter(Static):
-    """A custom widget for displaying audio levels"""
+    """A custom widget for displaying audio levels
 
-    level = reactive(0.0)
+    The level is quantized to whole cells and the widget only redraws when
+    the filled cells or the peak marker move, so setting it for every audio
+    block costs almost nothing. Each distinct bar is built once per width and
+    cached. The bar falls back at ``decay`` (full scale per second) and a peak
+    marker holds the loudest recent level for ``peak_hold`` seconds.
+    """
 
-    def __init__(self):
+    def __init__(self, peak_hold: float = 1.0, decay: float = 1.5):
         super().__init__()
         self.gradient = ["green", "green", "yellow", "yellow", "red"]
+        self.peak_hold = peak_hold
+        self.decay = decay
+        self.peak = 0.0
+        self._level = 0.0
+        self._peak_time = 0.0
+        self._updated: Optional[float] = None
+        self._drawn: Optional[Tuple[int, int, int]] = None
+        self._bars: Dict[Tuple[int, int, int], Text] = {}
+
+    @property
+    def level(self) -> float:
+        return self._level
+
+    @level.setter
+    def level(self, value: float) -> None:
+        self.update_level(value, time.monotonic())
+
+    def update_level(self, value: float, now: float) -> None:
+        """Show ``value``, applying decay and peak hold as of ``now``."""
+        elapsed = 0.0 if self._updated is None else now - self._updated
+        self._updated = now
+        fallen = self.decay * elapsed
+        self._level = max(value, self._level - fallen, 0.0)
+        if value >= self.peak:
+            self.peak, self._peak_time = value, now
+        elif now - self._peak_time > self.peak_hold:
+            self.peak = max(self._level, self.peak - fallen)
+        if self._cells() != self._drawn:
+            self.refresh()
 
     def compute_level_colors(self, value: float) -> list[str]:
         segments = len(self.gradient)
         index = min(int(value * segments), segments - 1)
         return self.gradient[: index + 1]
 
-    def render(self) -> str:
-        width = self.size.width - 2
-        level_width = int(self.level * width)
-        colors = self.compute_level_colors(self.level)
+    def _cells(self) -> Tuple[int, int, int]:
+        width = max(self.size.width - 2, 0)
+        filled = min(int(self._level * width), width)
+        peak = min(int(self.peak * width), width)
+        return width, filled, peak
 
-        bar = ""
-        remaining_width = level_width
-        segment_width = width // len(self.gradient)
-
-        for color in colors:
-            segment = min(remaining_width, segment_width)
-            if segment <= 0:
-                break
-            bar += f"[{color}]{'█' * segment}[/]"
-            remaining_width -= segment
+    def _bar(self, width: int, filled: int, peak: int) -> Text:
+        segments = len(self.gradient)
+        bar = Text("│")
+        for cell in range(filled):
+            bar.append("█", self.gradient[min(cell * segments // width, segments - 1)])
+        padding = width - filled
+        if peak > filled:
+            marker = peak - 1
+            bar.append(" " * (marker - filled))
+            bar.append("▌", self.compute_level_colors(self.peak)[-1])
+            padding = width - peak
+        bar.append(" " * padding + "│")
+        return bar
 
-        padding = " " * (width - len(bar))
-        return f"│{bar}{padding}│"
+    def render(self) -> Text:
+        key = self._cells()
+        self._drawn = key
+        bar = self._bars.get(key)
+        if bar is None:
+            if self._bars and next(iter(self._bars))[0] != key[0]:
+                # The widget was resized; bars for the old width are useless
+                self._bars.clear()
+            bar = self._bars[key] = self._bar(*key)
+        return bar
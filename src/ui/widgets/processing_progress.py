@@ -1,16 +1,38 @@
+from typing import Dict, Tuple
 from textual.reactive import reactive
 from textual.widgets import Static
 
 
 class ProcessingProgress(Static):
-    """Widget for showing processing progress"""
+    """Widget for showing processing progress, with one row per active job"""
 
     progress = reactive(0.0)
     status = reactive("")
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.jobs: Dict[str, Tuple[float, str]] = {}
+
+    def set_job(self, job_id: str, progress: float, status: str) -> None:
+        """Update a job's row; finished jobs move to the main bar."""
+        if progress >= 1.0:
+            self.jobs.pop(job_id, None)
+            self.progress = progress
+            self.status = f"Job {job_id}: {status}"
+        else:
+            self.jobs[job_id] = (progress, status)
+        self.refresh(layout=True)
+
+    def render_bar(self, progress: float, width: int) -> str:
+        filled_width = int(progress * width)
+        bar = "█" * filled_width + "░" * (width - filled_width)
+        percentage = int(progress * 100)
+        return f"[blue]│{bar}│ {percentage}%[/]"
+
     def render(self) -> str:
         width = self.size.width - 2
-        filled_width = int(self.progress * width)
-        bar = "█" * filled_width + "░" * (width - filled_width)
-        percentage = int(self.progress * 100)
-        return f"{self.status}\n[blue]│{bar}│ {percentage}%[/]"
+        lines = [self.status, self.render_bar(self.progress, width)]
+        for job_id, (progress, status) in self.jobs.items():
+            lines.append(f"Job {job_id}: {status}")
+            lines.append(self.render_bar(progress, width))
+        return "\n".join(lines)
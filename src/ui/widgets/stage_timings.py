@@ -0,0 +1,28 @@
+from collections import deque
+from textual.widgets import Static
+from core.telemetry import Span
+
+
+class StageTimings(Static):
+    """Widget listing the most recent telemetry spans, newest last"""
+
+    def __init__(self, *args, max_rows: int = 8, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.spans: deque = deque(maxlen=max_rows)
+
+    def add_span(self, span: Span) -> None:
+        self.spans.append(span)
+        self.refresh(layout=True)
+
+    def format_span(self, span: Span) -> str:
+        rtf = span.real_time_factor
+        rtf_text = "     -" if rtf is None else f"{rtf:6.3f}"
+        color = "red" if span.status == "ERROR" else "green"
+        return (
+            f"[{color}]{span.name:<28}[/] {span.wall_seconds:8.2f}s "
+            f"{span.cpu_seconds:8.2f}s {rtf_text} {span.peak_rss_mb:8.0f} MiB"
+        )
+
+    def render(self) -> str:
+        header = f"{'Stage':<28} {'Wall':>9} {'CPU':>9} {'RTF':>6} {'Peak RSS':>12}"
+        return "\n".join([header] + [self.format_span(span) for span in self.spans])
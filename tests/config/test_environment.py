@@ -1,7 +1,12 @@
 import pytest
 import torch
 from unittest.mock import patch
-from config.environment import check_gpu_availability
+from config.environment import (
+    check_environment,
+    check_gpu_availability,
+    output_formats,
+)
+from config.hardware import save_calibration
 
 
 def test_check_gpu_availability_cuda():
@@ -19,3 +24,83 @@ def test_check_gpu_availability_cuda_initialization_failure():
     with patch("torch.cuda.is_available", return_value=True):
         with patch("torch.tensor", side_effect=Exception("CUDA initialization failed")):
             assert check_gpu_availability() == "cpu"
+
+
+@pytest.fixture
+def cpu_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("HF_TOKEN", "token")
+    monkeypatch.setenv("TRANSCRIBER_OUTPUT", str(tmp_path / "output"))
+    monkeypatch.setenv("TRANSCRIBER_CALIBRATION", str(tmp_path / "calibration.json"))
+    for name in ["WHISPER_MODEL", "WHISPER_COMPUTE_TYPE", "WHISPER_CPU_THREADS"]:
+        monkeypatch.delenv(name, raising=False)
+    with patch("config.environment.check_gpu_availability", return_value="cpu"), patch(
+        "config.environment.cpu_features", return_value={"avx2"}
+    ), patch(
+        "config.environment.supported_compute_types",
+        return_value={"int8", "float32"},
+    ):
+        yield tmp_path
+
+
+def test_cpu_defaults_to_int8(cpu_environment):
+    config = check_environment()
+    assert config["compute_type"] == "int8"
+    assert config["whisper_model"] == "turbo"
+    assert config["cpu_threads"] >= 1
+
+
+def test_explicit_compute_type_wins(cpu_environment, monkeypatch):
+    monkeypatch.setenv("WHISPER_COMPUTE_TYPE", "int8_float32")
+    monkeypatch.setenv("WHISPER_CPU_THREADS", "3")
+    config = check_environment()
+    assert config["compute_type"] == "int8_float32"
+    assert config["cpu_threads"] == 3
+
+
+def test_calibration_is_applied(cpu_environment, monkeypatch):
+    save_calibration(
+        cpu_environment / "calibration.json",
+        {"whisper_model": "small", "compute_type": "int8_float32"},
+    )
+    config = check_environment()
+    assert (config["whisper_model"], config["compute_type"]) == (
+        "small",
+        "int8_float32",
+    )
+
+    # Calibrated settings only apply to the calibrated model
+    monkeypatch.setenv("WHISPER_MODEL", "base")
+    config = check_environment()
+    assert (config["whisper_model"], config["compute_type"]) == ("base", "int8")
+
+
+def test_output_formats(cpu_environment, monkeypatch):
+    monkeypatch.delenv("TRANSCRIBER_FORMATS", raising=False)
+    assert check_environment()["output_formats"] == ["txt"]
+    monkeypatch.setenv("TRANSCRIBER_FORMATS", "txt, SRT,jsonl")
+    assert check_environment()["output_formats"] == ["txt", "srt", "jsonl"]
+
+
+@pytest.mark.parametrize("formats", ["txt,docx", " , "])
+def test_invalid_output_formats_exit_at_startup(cpu_environment, monkeypatch, formats):
+    monkeypatch.setenv("TRANSCRIBER_FORMATS", formats)
+    with pytest.raises(SystemExit):
+        check_environment()
+    with pytest.raises(
+        ValueError, match="docx" if "docx" in formats else "no transcript"
+    ):
+        output_formats()
+
+
+def test_raw_results_are_opt_in(cpu_environment, monkeypatch):
+    monkeypatch.delenv("TRANSCRIBER_KEEP_RESULTS", raising=False)
+    assert check_environment()["keep_results"] is False
+    monkeypatch.setenv("TRANSCRIBER_KEEP_RESULTS", "1")
+    assert check_environment()["keep_results"] is True
+
+
+def test_inputs(cpu_environment, monkeypatch):
+    monkeypatch.delenv("TRANSCRIBER_INPUTS", raising=False)
+    assert check_environment()["inputs"] == ""
+    monkeypatch.setenv("TRANSCRIBER_INPUTS", "2:1=Alice,2:2=Bob")
+    assert check_environment()["inputs"] == "2:1=Alice,2:2=Bob"
@@ -0,0 +1,49 @@
+from unittest.mock import patch
+import pytest
+from config.hardware import (
+    default_cpu_threads,
+    load_calibration,
+    save_calibration,
+    select_compute_type,
+)
+
+
+@pytest.mark.parametrize(
+    "device, features, supported, expected",
+    [
+        ("cuda", set(), {"float16"}, "float16"),
+        ("cpu", {"avx2", "fma"}, {"int8", "float32"}, "int8"),
+        ("cpu", {"avx512f", "avx512_vnni"}, {"int8", "float32"}, "int8"),
+        ("cpu", {"sse4_2"}, {"int8", "float32"}, "float32"),
+        ("cpu", {"avx2"}, {"float32"}, "float32"),
+    ],
+)
+def test_select_compute_type(device, features, supported, expected):
+    with patch("platform.machine", return_value="x86_64"):
+        assert select_compute_type(device, features, supported) == expected
+
+
+def test_select_compute_type_on_arm():
+    with patch("platform.machine", return_value="arm64"):
+        assert select_compute_type("cpu", set(), {"int8", "float32"}) == "int8"
+
+
+def test_default_cpu_threads_splits_between_workers():
+    with patch("config.hardware.usable_cpus", return_value=8):
+        assert default_cpu_threads() == 8
+        assert default_cpu_threads(3) == 2
+        assert default_cpu_threads(16) == 1
+
+
+def test_calibration_round_trip(tmp_path):
+    path = tmp_path / "calibration.json"
+    save_calibration(path, {"whisper_model": "small", "compute_type": "int8"})
+    assert load_calibration(path)["whisper_model"] == "small"
+
+
+def test_calibration_from_another_machine_is_ignored(tmp_path):
+    path = tmp_path / "calibration.json"
+    save_calibration(path, {"whisper_model": "small", "compute_type": "int8"})
+    with patch("config.hardware.usable_cpus", return_value=999):
+        assert load_calibration(path) is None
+    assert load_calibration(tmp_path / "missing.json") is None
@@ -1,6 +1,9 @@
 import pytest
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from controllers.audio_controller import AudioController
+from core.capture import parse_inputs
 import numpy as np
 
 
@@ -34,27 +37,119 @@ def test_load_models(audio_controller):
     audio_controller.model_manager.load_models.assert_called_once()
 
 
+def test_shutdown_releases_the_models(audio_controller):
+    audio_controller.shutdown()
+    audio_controller.audio_processor.scheduler.shutdown.assert_called_once()
+    audio_controller.model_manager.shutdown.assert_called_once()
+
+
 def test_start_recording(audio_controller):
     audio_callback = MagicMock()
     audio_controller.start_recording(audio_callback)
     assert audio_controller.is_recording is True
     audio_controller.audio_device.start_recording.assert_called_once_with(
-        audio_callback
+        audio_callback, spill_path=None
     )
 
 
 def test_stop_recording(audio_controller):
-    audio_controller.audio_data = [np.array([1, 2, 3]), np.array([4, 5, 6])]
+    audio_controller.add_audio(np.array([[1.0], [2.0], [3.0]]))
+    audio_controller.add_audio(np.array([[4.0], [5.0], [6.0]]))
+    recorded = audio_controller.audio_data
     audio_controller.stop_recording()
     assert audio_controller.is_recording is False
     audio_controller.audio_device.stop_recording.assert_called_once()
     audio_controller.audio_processor.process_audio.assert_called_once()
-    assert audio_controller.audio_data == []
+    assert audio_controller.audio_processor.process_audio.call_args.args[1] is recorded
+    assert len(audio_controller.audio_data) == 0
 
 
 def test_stop_recording_no_data(audio_controller):
-    audio_controller.audio_data = []
     audio_controller.stop_recording()
     assert audio_controller.is_recording is False
     audio_controller.audio_device.stop_recording.assert_called_once()
     audio_controller.audio_processor.process_audio.assert_not_called()
+
+
+def test_add_audio(audio_controller):
+    block = np.array([[1.0], [2.0]])
+    audio_controller.add_audio(block)
+    block[0] = 0.0
+    assert len(audio_controller.audio_data) == 2
+    assert audio_controller.audio_data.read()[0, 0] == 1.0
+
+
+def test_streaming_recording(audio_controller):
+    audio_controller.config["streaming"] = True
+    with patch("controllers.audio_controller.StreamingTranscriber") as MockStreamer:
+        audio_controller.start_recording(MagicMock())
+        audio_controller.add_audio(np.zeros(4))
+        MockStreamer.return_value.feed.assert_called_once()
+        assert len(audio_controller.audio_data) == 0
+
+        audio_controller.stop_recording()
+        MockStreamer.return_value.finish.assert_called_once()
+        assert audio_controller.streamer is None
+        audio_controller.audio_processor.process_audio.assert_not_called()
+
+
+def test_stop_recording_drains_before_processing(audio_controller):
+    audio_controller.start_recording(MagicMock())
+
+    def drain():
+        assert audio_controller.is_recording is True
+        audio_controller.add_audio(np.zeros((4, 1)))
+
+    audio_controller.stop_recording(drain=drain)
+    audio_controller.audio_processor.process_audio.assert_called_once()
+    assert audio_controller.is_recording is False
+
+
+def test_spilled_recording(audio_controller):
+    audio_controller.config["spill_to_disk"] = True
+    audio_controller.config["output_dir"] = Path("/fake/dir")
+    audio_controller.start_recording(MagicMock())
+    spill_path = audio_controller.spill_path
+    assert spill_path.parent == Path("/fake/dir")
+    audio_controller.audio_device.start_recording.assert_called_once_with(
+        audio_controller.audio_device.start_recording.call_args.args[0],
+        spill_path=spill_path,
+    )
+
+    block = np.zeros((4, 1))
+    audio_controller.add_audio(block)
+    audio_controller.audio_device.write.assert_called_once_with(block)
+    assert len(audio_controller.audio_data) == 0
+
+    audio_controller.audio_device.close_spill.return_value = spill_path
+    audio_controller.stop_recording()
+    timestamp = spill_path.stem.removeprefix("recording_")
+    audio_controller.audio_processor.process_audio.assert_called_once_with(
+        timestamp, spill_path, delete_audio=True
+    )
+    assert audio_controller.spill_path is None
+
+
+def test_multichannel_recording(audio_controller):
+    audio_controller.config["inputs"] = "1:1=Alice,2:1=Bob"
+    recordings = [SimpleNamespace(name="Alice", audio=np.zeros(4))]
+    with patch("controllers.audio_controller.MultiChannelCapture") as MockCapture:
+        MockCapture.return_value.stop.return_value = recordings
+        MockCapture.return_value.dropped = 0
+        MockCapture.return_value.input_overflows = 0
+        MockCapture.return_value.drain.return_value = 0.3
+        audio_controller.inputs = parse_inputs(audio_controller.config["inputs"])
+        audio_controller.start_recording(MagicMock())
+
+        assert [i.name for i in MockCapture.call_args.args[0]] == ["Alice", "Bob"]
+        MockCapture.return_value.start.assert_called_once()
+        audio_controller.audio_device.start_recording.assert_not_called()
+        assert audio_controller.drain_capture() == 0.3
+
+        audio_controller.stop_recording(drain=MagicMock())
+    assert audio_controller.is_recording is False
+    assert audio_controller.capture is None
+    assert audio_controller.drain_capture() is None
+    audio_controller.audio_processor.process_audio.assert_not_called()
+    process_channels = audio_controller.audio_processor.process_channels
+    assert process_channels.call_args.args[1] is recordings
@@ -0,0 +1,109 @@
+import json
+import pytest
+from concurrent.futures import Future
+from unittest.mock import MagicMock, patch
+from controllers.batch_controller import BatchController, BatchManifest
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {"output_dir": tmp_path / "out"}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    audio_dir = tmp_path / "audio"
+    (audio_dir / "nested").mkdir(parents=True)
+    for name in ["a.wav", "b.flac", "nested/c.mp3", "notes.txt"]:
+        (audio_dir / name).write_bytes(b"data")
+    return audio_dir
+
+
+@pytest.fixture
+def controller(config):
+    config["output_dir"].mkdir()
+    with patch("controllers.batch_controller.AudioProcessor"), patch(
+        "controllers.batch_controller.ModelManager"
+    ):
+        return BatchController(config, MagicMock())
+
+
+def finished_job(name, transcript, audio_seconds=60.0):
+    job = MagicMock()
+    job.state = "done"
+    job.info = {"audio_seconds": audio_seconds}
+    job.future = Future()
+    job.future.set_result(transcript)
+    return job
+
+
+def test_collect_expands_directories_and_globs(sources):
+    files = BatchController.collect([str(sources), str(sources / "*.wav")])
+    assert [path.name for path in files] == ["a.wav", "b.flac", "c.mp3"]
+
+
+def test_manifest_tracks_changed_files(tmp_path, sources):
+    manifest = BatchManifest(tmp_path / "manifest.jsonl")
+    audio = sources / "a.wav"
+    assert not manifest.is_done(audio)
+
+    manifest.record(audio, transcript="t.txt")
+    assert manifest.is_done(audio)
+    assert BatchManifest(tmp_path / "manifest.jsonl").is_done(audio)
+
+    audio.write_bytes(b"longer data")
+    assert not manifest.is_done(audio)
+
+
+def test_run_processes_pending_files(controller, sources):
+    controller.manifest.record(sources / "a.wav")
+    controller.audio_processor.process_audio.side_effect = (
+        lambda name, path, block: finished_job(name, f"transcript_{name}.txt")
+    )
+
+    summary = controller.run([str(sources)])
+
+    submitted = [
+        call.args[1] for call in controller.audio_processor.process_audio.call_args_list
+    ]
+    assert [path.name for path in submitted] == ["b.flac", "c.mp3"]
+    assert summary["processed"] == 2
+    assert summary["failed"] == 0
+    assert summary["audio_hours"] == pytest.approx(2 / 60)
+    controller.model_manager.load_models.assert_called_once()
+    controller.audio_processor.scheduler.shutdown.assert_called_once()
+    controller.model_manager.shutdown.assert_called_once()
+
+    entries = [
+        json.loads(line) for line in controller.manifest.path.read_text().splitlines()
+    ]
+    name = BatchController.output_name(sources / "nested" / "c.mp3")
+    assert entries[-1]["transcript"] == f"transcript_{name}.txt"
+    assert all(controller.manifest.is_done(path) for path in submitted)
+
+
+def test_run_counts_failures(controller, sources):
+    job = finished_job("a", None)
+    job.state = "failed"
+    controller.audio_processor.process_audio.return_value = job
+
+    summary = controller.run([str(sources / "a.wav")])
+
+    assert summary["failed"] == 1
+    assert not controller.manifest.is_done(sources / "a.wav")
+
+
+def test_run_with_nothing_pending(controller, sources):
+    summary = controller.run([str(sources / "notes.txt")])
+    assert summary["processed"] == 0
+    controller.model_manager.load_models.assert_not_called()
+
+
+def test_output_names_are_unique_per_path(sources):
+    (sources / "other").mkdir()
+    (sources / "other" / "a.wav").write_bytes(b"data")
+    first = BatchController.output_name(sources / "a.wav")
+    assert first.startswith("a_")
+    assert first != BatchController.output_name(sources / "other" / "a.wav")
+    # The same file keeps its name across runs
+    assert first == BatchController.output_name(sources / "nested" / ".." / "a.wav")
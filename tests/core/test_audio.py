@@ -1,7 +1,9 @@
+import numpy as np
 import pytest
 import sounddevice as sd
+import soundfile as sf
 from unittest.mock import MagicMock, patch
-from core.audio import AudioDevice
+from core.audio import AudioBuffer, AudioDevice, AudioFileWriter, BlockQueue
 
 
 @pytest.fixture
@@ -38,3 +40,102 @@ def test_stop_recording(audio_device):
 def test_stop_recording_no_stream(audio_device):
     audio_device.stop_recording()
     assert audio_device._stream is None
+
+
+def test_audio_buffer_append_across_chunks():
+    buffer = AudioBuffer(chunk_frames=4)
+    buffer.append(np.arange(3, dtype=np.float32).reshape(-1, 1))
+    buffer.append(np.arange(3, 9, dtype=np.float32).reshape(-1, 1))
+    assert len(buffer) == 9
+    assert buffer.nbytes == 3 * 4 * 4
+    chunks = list(buffer.chunks())
+    assert [len(chunk) for chunk in chunks] == [4, 4, 1]
+    assert np.array_equal(np.concatenate(chunks).ravel(), np.arange(9))
+
+
+def test_audio_buffer_copies_blocks():
+    buffer = AudioBuffer(chunk_frames=4)
+    block = np.ones((2, 1), dtype=np.float32)
+    buffer.append(block)
+    block[:] = 0
+    assert np.array_equal(buffer.read().ravel(), [1, 1])
+
+
+def test_audio_buffer_read():
+    buffer = AudioBuffer(chunk_frames=4)
+    buffer.append(np.arange(10, dtype=np.float32).reshape(-1, 1))
+    view = buffer.read(1, 3)
+    assert np.shares_memory(view, next(buffer.chunks()))
+    assert np.array_equal(view.ravel(), [1, 2])
+    assert np.array_equal(buffer.read(2, 9).ravel(), np.arange(2, 9))
+    assert np.array_equal(buffer.read(8).ravel(), [8, 9])
+    assert buffer.read(5, 5).shape == (0, 1)
+
+
+def test_audio_buffer_consolidate():
+    buffer = AudioBuffer(chunk_frames=4)
+    buffer.append(np.arange(10, dtype=np.float32).reshape(-1, 1))
+    audio = buffer.consolidate()
+    assert audio.shape == (10,)
+    assert audio.flags.c_contiguous
+    assert np.array_equal(audio, np.arange(10))
+    assert len(buffer) == 0
+    assert buffer.nbytes == 0
+
+
+def test_audio_buffer_empty():
+    buffer = AudioBuffer()
+    assert len(buffer) == 0
+    assert list(buffer.chunks()) == []
+
+
+def test_block_queue_fifo():
+    queue = BlockQueue(capacity=4)
+    for value in range(3):
+        assert queue.put(np.full(2, value))
+    assert len(queue) == 3
+    assert [block[0] for block in queue.get_all()] == [0, 1, 2]
+    assert len(queue) == 0
+    assert queue.get_all() == []
+
+
+def test_block_queue_counts_dropped_blocks():
+    queue = BlockQueue(capacity=2)
+    assert queue.put(np.zeros(1))
+    assert queue.put(np.ones(1))
+    assert not queue.put(np.ones(1))
+    assert queue.dropped == 1
+    assert len(queue.get_all()) == 2
+    assert queue.put(np.zeros(1))
+    assert queue.dropped == 1
+
+
+def test_audio_file_writer_appends(tmp_path):
+    path = tmp_path / "recording.wav"
+    writer = AudioFileWriter(path)
+    writer.write(np.full((100, 1), 0.25, dtype=np.float32))
+    writer.write(np.full((50, 1), 0.5, dtype=np.float32))
+    assert writer.close() == path
+    assert writer.frames_written == 150
+
+    writer = AudioFileWriter(path)
+    writer.write(np.full((10, 1), 0.75, dtype=np.float32))
+    writer.close()
+
+    audio, samplerate = sf.read(path, dtype="float32")
+    assert samplerate == 16000
+    assert len(audio) == 160
+    assert audio[0] == 0.25 and audio[149] == 0.5 and audio[-1] == 0.75
+
+
+def test_spill_recording(audio_device, tmp_path):
+    path = tmp_path / "recording.wav"
+    with patch.object(sd, "InputStream", return_value=MagicMock()):
+        audio_device.start_recording(MagicMock(), spill_path=path)
+    assert audio_device.spilling
+    audio_device.write(np.zeros((8, 1), dtype=np.float32))
+    audio_device.stop_recording()
+    assert audio_device.close_spill() == path
+    assert not audio_device.spilling
+    assert sf.info(path).frames == 8
+    assert audio_device.close_spill() is None
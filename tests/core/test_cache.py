@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import pytest
+from core import cache as cache_module
+from core.cache import ResultCache, audio_digest
+from core.results import Segment, Word
+from core.speakers import Turn
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+
+
+@pytest.fixture
+def digest():
+    return audio_digest(np.linspace(-1, 1, 16000, dtype=np.float32))
+
+
+def test_audio_digest_depends_on_content():
+    audio = np.zeros(100, dtype=np.float32)
+    assert audio_digest(audio) == audio_digest(audio.copy())
+    audio[50] = 0.5
+    assert audio_digest(audio) != audio_digest(np.zeros(100, dtype=np.float32))
+
+
+def test_segments_round_trip(cache, digest):
+    segments = [
+        Segment(0.0, 1.5, " Hello", [Word(0.0, 0.5, " Hello", 0.9)]),
+        Segment(1.5, 3.0, " there", None),
+        Segment(
+            3.0, 4.0, " héllo", [Word(3.0, 3.5, " hé", 0.5), Word(3.5, 4, "llo", 1)]
+        ),
+    ]
+    cache.put_segments(digest, segments, "en", model="base", beam_size=5)
+
+    assert cache.get_segments(digest, model="base", beam_size=5) == (segments, "en")
+    assert cache.get_segments(digest, model="turbo", beam_size=5) is None
+
+
+def test_turns_round_trip(cache, digest):
+    turns = [Turn(0.0, 2.0, "SPEAKER_00"), Turn(1.5, 4.0, "SPEAKER_01")]
+    cache.put_turns(digest, turns, pipeline="p")
+    assert cache.get_turns(digest, pipeline="p") == turns
+    assert cache.get_segments(digest, pipeline="p") is None
+
+
+@pytest.mark.parametrize("keep", [0, 20, 0.5])
+def test_corrupt_entries_are_misses(cache, digest, keep):
+    cache.put_turns(digest, [Turn(0.0, 1.0, "A")], pipeline="p")
+    (path,) = cache.root.glob("*.npz")
+    data = path.read_bytes()
+    path.write_bytes(data[: int(len(data) * keep) if keep < 1 else keep])
+    assert cache.get_turns(digest, pipeline="p") is None
+
+
+def test_empty_results_are_cached(cache, digest):
+    cache.put_segments(digest, [], "en")
+    cache.put_turns(digest, [])
+    assert cache.get_segments(digest) == ([], "en")
+    assert cache.get_turns(digest) == []
+
+
+def test_pipeline_version_invalidates(cache, digest, monkeypatch):
+    cache.put_turns(digest, [Turn(0.0, 1.0, "A")])
+    monkeypatch.setattr(cache_module, "PIPELINE_VERSION", 999)
+    assert cache.get_turns(digest) is None
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path / "cache", max_bytes=10 * 1024 * 1024)
+    turns = [Turn(float(i), i + 1.0, f"SPEAKER_{i}") for i in range(50)]
+    for age, key in enumerate(["a", "b"]):
+        cache.put_turns(key, turns)
+        entry = cache._path("diarization", key, {})
+        os.utime(entry, (1000 + age, 1000 + age))
+    cache.max_bytes = cache.size()
+
+    assert cache.get_turns("a") is not None  # now more recent than "b"
+    cache.put_turns("c", turns)
+
+    assert cache.get_turns("b") is None
+    assert cache.get_turns("a") is not None
+    assert cache.get_turns("c") is not None
+    assert cache.size() <= cache.max_bytes
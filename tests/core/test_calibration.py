@@ -0,0 +1,61 @@
+from unittest.mock import patch
+import numpy as np
+import pytest
+from core.calibration import calibrate, word_error_rate
+
+
+def test_word_error_rate():
+    assert word_error_rate("the cat sat", "The cat sat") == 0.0
+    assert word_error_rate("the cat sat", "the cat") == pytest.approx(1 / 3)
+    assert word_error_rate("the cat sat", "a cat sat down") == pytest.approx(2 / 3)
+    assert word_error_rate("", "") == 0.0
+
+
+@pytest.fixture
+def measured():
+    """(RTF, transcript) per model and compute type, as if decoded."""
+    results = {
+        ("small", "float32"): (0.9, "the quick brown fox"),
+        ("small", "int8"): (0.3, "the quick brown fox"),
+        ("base", "int8"): (0.1, "a quick frown fox"),
+    }
+    with patch("faster_whisper.WhisperModel") as MockWhisperModel, patch(
+        "core.calibration.measure"
+    ) as mock_measure:
+        MockWhisperModel.side_effect = lambda name, compute_type, **kwargs: (
+            name,
+            compute_type,
+        )
+        mock_measure.side_effect = lambda model, audio, beam_size: results[model]
+        yield list(results)
+
+
+def test_calibrate_picks_fastest_within_targets(measured):
+    result = calibrate(
+        np.zeros(16000, dtype=np.float32), measured, max_rtf=0.5, max_wer=0.2, log=str
+    )
+    assert (result["whisper_model"], result["compute_type"]) == ("small", "int8")
+    assert [c["wer"] for c in result["candidates"]] == [0.0, 0.0, 0.5]
+
+
+def test_calibrate_uses_reference_transcript(measured):
+    result = calibrate(
+        np.zeros(16000, dtype=np.float32),
+        measured,
+        max_rtf=0.5,
+        max_wer=0.6,
+        reference="the quick brown fox",
+        log=str,
+    )
+    assert result["whisper_model"] == "base"
+
+
+def test_calibrate_fails_when_nothing_qualifies(measured):
+    with pytest.raises(RuntimeError, match="No model meets"):
+        calibrate(
+            np.zeros(16000, dtype=np.float32),
+            measured,
+            max_rtf=0.05,
+            max_wer=0.2,
+            log=str,
+        )
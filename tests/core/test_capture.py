@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from core.capture import InputChannel, MultiChannelCapture, parse_inputs
+
+
+def test_parse_inputs():
+    assert parse_inputs("2:1=Alice, 2:2=Bob,USB Mic:1, :3") == [
+        InputChannel(2, 0, "Alice"),
+        InputChannel(2, 1, "Bob"),
+        InputChannel("USB Mic", 0, "Channel 3"),
+        InputChannel(None, 2, "Channel 4"),
+    ]
+    assert parse_inputs("") == []
+
+
+@pytest.mark.parametrize(
+    "spec, message",
+    [
+        ("2", "Invalid input"),
+        ("2:0", "Invalid input"),
+        ("2:x=Alice", "Invalid input"),
+        ("1:1=Alice,2:1=Alice", "Duplicate input name: Alice"),
+        ("1:1=Alice,1:1=Bob", "listed more than once"),
+        ("1:1=../Alice", "may not contain"),
+        ("1:1=A\\B", "may not contain"),
+    ],
+)
+def test_parse_inputs_rejects(spec, message):
+    with pytest.raises(ValueError, match=message):
+        parse_inputs(spec)
+
+
+@pytest.fixture
+def mock_sd():
+    with patch("core.capture.sd") as sd:
+        # Device 1 records at 16 kHz; device 2 only at its native 48 kHz
+        def check(device, channels, samplerate):
+            if device == 2:
+                raise ValueError("Invalid sample rate")
+
+        sd.check_input_settings.side_effect = check
+        sd.query_devices.return_value = {"default_samplerate": 48000.0}
+        yield sd
+
+
+def adc_time(current=0.0, adc=0.0):
+    return SimpleNamespace(currentTime=current, inputBufferAdcTime=adc)
+
+
+def callbacks(sd):
+    return {
+        c.kwargs["device"]: c.kwargs["callback"] for c in sd.InputStream.call_args_list
+    }
+
+
+def test_opens_one_stream_per_device(mock_sd):
+    capture = MultiChannelCapture(
+        [InputChannel(1, 0, "A"), InputChannel(1, 2, "B"), InputChannel(2, 1, "C")]
+    )
+    capture.start()
+    opened = [c.kwargs for c in mock_sd.InputStream.call_args_list]
+    assert [(o["device"], o["channels"], o["samplerate"]) for o in opened] == [
+        (1, 3, 16000),
+        (2, 2, 48000),
+    ]
+    assert mock_sd.InputStream.return_value.start.call_count == 2
+
+
+def test_start_failure_closes_opened_streams(mock_sd):
+    stream = MagicMock()
+    mock_sd.InputStream.side_effect = [stream, Exception("Busy")]
+    capture = MultiChannelCapture([InputChannel(1, 0, "A"), InputChannel(2, 0, "B")])
+    with pytest.raises(RuntimeError, match="Error starting recording: Busy"):
+        capture.start()
+    stream.close.assert_called_once()
+
+
+def test_splits_channels_and_reports_loudest(mock_sd):
+    capture = MultiChannelCapture(
+        [InputChannel(1, 0, "A"), InputChannel(1, 2, "B"), InputChannel(2, 1, "C")]
+    )
+    capture.start()
+    callback = callbacks(mock_sd)
+    block = np.zeros((160, 3), dtype=np.float32)
+    block[:, 0], block[:, 1], block[:, 2] = 0.1, 0.9, 0.5
+    # Device 1 reports its ADC time; device 2 leaves it unset
+    with patch("core.capture.time.monotonic", return_value=10.0):
+        callback[1](block, 160, adc_time(5.0, 4.97), None)
+    with patch("core.capture.time.monotonic", return_value=10.26):
+        callback[2](np.full((480, 2), 0.2, dtype=np.float32), 480, adc_time(), None)
+
+    # The unrecorded middle channel of device 1 does not count
+    assert capture.drain() == pytest.approx(0.5)
+    assert capture.drain() is None
+    recordings = {r.name: r for r in capture.stop()}
+    assert [len(r.audio) for r in recordings.values()] == [160, 160, 480]
+    assert np.allclose(recordings["B"].audio, 0.5)
+    assert recordings["C"].sample_rate == 48000
+    # Each device's offset counts from when its first sample was captured
+    assert recordings["A"].offset == 0.0
+    assert recordings["C"].offset == pytest.approx(10.25 - 9.97)
+    mock_sd.InputStream.return_value.close.assert_called()
+
+
+def test_counts_overflows_and_drops(mock_sd):
+    capture = MultiChannelCapture([InputChannel(1, 0, "A")])
+    capture.start()
+    callback = callbacks(mock_sd)[1]
+    capture._states[1].blocks.capacity = 1
+    status = SimpleNamespace(input_overflow=True)
+    callback(np.zeros((4, 1), dtype=np.float32), 4, adc_time(), status)
+    callback(np.zeros((4, 1), dtype=np.float32), 4, adc_time(), None)
+    assert capture.input_overflows == 1
+    assert capture.dropped == 1
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+from core.chunked_diarization import (
+    SpeakerStitcher,
+    chunk_seconds,
+    diarize_in_chunks,
+    estimate_memory_mb,
+    plan_chunks,
+)
+from core.speakers import Turn
+
+SAMPLE_RATE = 100
+
+
+def test_chunk_seconds_inverts_the_estimate():
+    seconds = chunk_seconds(4096)
+    assert estimate_memory_mb(seconds) == pytest.approx(4096)
+    # A three hour recording would need far more than that in one pass
+    assert estimate_memory_mb(3 * 3600) > 4096 > estimate_memory_mb(3600)
+    assert chunk_seconds(1) == 120.0
+
+
+def test_plan_chunks_tiles_the_recording():
+    assert plan_chunks(50, 100, 10) == [(0, 50, 0, 50)]
+
+    chunks = plan_chunks(250, 100, 20)
+    assert chunks == [(0, 100, 0, 90), (80, 180, 90, 170), (160, 250, 170, 250)]
+    assert all(end - start <= 100 for start, end, _, _ in chunks)
+
+
+def test_stitcher_matches_by_voice():
+    stitcher = SpeakerStitcher(threshold=0.5)
+    first = stitcher.assign(
+        [Turn(0, 5, "A"), Turn(5, 9, "B")],
+        {"A": np.array([1.0, 0.0]), "B": np.array([0.0, 1.0])},
+    )
+    assert first == {"A": 0, "B": 1}
+
+    # Local labels are arbitrary per chunk; voices decide the speaker
+    second = stitcher.assign(
+        [Turn(10, 12, "A"), Turn(12, 15, "B"), Turn(15, 16, "C")],
+        {
+            "A": np.array([0.1, 1.0]),
+            "B": np.array([1.0, 0.2]),
+            "C": np.array([-1.0, -1.0]),
+        },
+    )
+    assert second == {"A": 1, "B": 0, "C": 2}
+    assert stitcher.speakers == 3
+
+
+def test_stitcher_falls_back_to_overlap():
+    stitcher = SpeakerStitcher()
+    stitcher.assign([Turn(0, 5, "A")], {"A": np.array([1.0, 0.0])})
+    mapping = stitcher.assign(
+        [Turn(4, 8, "X")], {"X": np.zeros(2)}, previous=[Turn(3, 6, 0)]
+    )
+    assert mapping == {"X": 0}
+
+
+def fake_chunk_diarizer(truth, voices, calls):
+    """Diarize a slice of a waveform whose samples hold their own time."""
+
+    def diarize(audio):
+        start, end = audio[0], audio[-1] + 1 / SAMPLE_RATE
+        calls.append((start, end))
+        turns, names = [], {}
+        for turn in truth:
+            if turn.end <= start or turn.start >= end:
+                continue
+            # Local labels in reverse order of appearance, as if unrelated
+            local = names.setdefault(turn.speaker, f"L{9 - len(names)}")
+            turns.append(
+                Turn(max(turn.start, start) - start, min(turn.end, end) - start, local)
+            )
+        embeddings = {local: voices[speaker] for speaker, local in names.items()}
+        return turns, embeddings
+
+    return diarize
+
+
+def test_diarize_in_chunks_stitches_speakers():
+    truth = [
+        Turn(0, 40, "alice"),
+        Turn(40, 95, "bob"),
+        Turn(95, 170, "alice"),
+        Turn(170, 240, "carol"),
+        Turn(240, 300, "bob"),
+    ]
+    voices = {
+        "alice": np.array([1.0, 0.1, 0.0]),
+        "bob": np.array([0.0, 1.0, 0.1]),
+        "carol": np.array([0.1, 0.0, 1.0]),
+    }
+    waveform = np.arange(300 * SAMPLE_RATE) / SAMPLE_RATE
+    calls, progress = [], []
+    turns = diarize_in_chunks(
+        waveform,
+        fake_chunk_diarizer(truth, voices, calls),
+        chunk_frames=100 * SAMPLE_RATE,
+        overlap_frames=20 * SAMPLE_RATE,
+        sample_rate=SAMPLE_RATE,
+        on_chunk=lambda index, total: progress.append((index, total)),
+    )
+
+    assert len(calls) == 4
+    assert all(end - start <= 100 + 1e-6 for start, end in calls)
+    assert progress == [(0, 4), (1, 4), (2, 4), (3, 4)]
+    # Same turns as diarizing in one pass, with turns cut by chunks rejoined
+    assert [(t.start, t.end) for t in turns] == pytest.approx(
+        [(t.start, t.end) for t in truth]
+    )
+    labels = [t.speaker for t in turns]
+    assert labels == [
+        "SPEAKER_00",
+        "SPEAKER_01",
+        "SPEAKER_00",
+        "SPEAKER_02",
+        "SPEAKER_01",
+    ]
@@ -1,15 +1,25 @@
 import pytest
-from unittest.mock import Mock
-from core.models import ModelManager
+from unittest.mock import Mock, patch
+from huggingface_hub import constants
+from core.models import (
+    DIARIZATION_MODEL,
+    ModelManager,
+    hub_offline,
+    load_diarization_pipeline,
+)
 
 
-def test_model_manager_init():
-    config = {
+@pytest.fixture
+def config():
+    return {
         "whisper_model": "base",
         "device": "cpu",
         "compute_type": "float32",
         "hf_token": "your_hf_token",
     }
+
+
+def test_model_manager_init(config):
     log_callback = Mock()
     progress_callback = Mock()
 
@@ -21,20 +31,122 @@ def test_model_manager_init():
     assert model_manager.whisper_model is None
     assert model_manager.diarization_pipeline is None
 
-    def test_model_manager_init():
-        config = {
-            "whisper_model": "base",
-            "device": "cpu",
-            "compute_type": "float32",
-            "hf_token": "your_hf_token",
-        }
-        log_callback = Mock()
-        progress_callback = Mock()
-
-        model_manager = ModelManager(config, log_callback, progress_callback)
-
-        assert model_manager.config == config
-        assert model_manager.write_log == log_callback
-        assert model_manager.update_progress == progress_callback
-        assert model_manager.whisper_model is None
-        assert model_manager.diarization_pipeline is None
+
+def test_hub_offline_restores_flag():
+    previous = constants.HF_HUB_OFFLINE
+    with hub_offline():
+        assert constants.HF_HUB_OFFLINE is True
+    assert constants.HF_HUB_OFFLINE == previous
+
+
+def test_load_cached_first_skips_network_when_cached(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    whisper, pyannote = Mock(), Mock()
+
+    model_manager.load_cached_first([whisper, pyannote])
+
+    whisper.assert_called_once_with(True)
+    pyannote.assert_called_once_with(True)
+
+
+def test_load_cached_first_downloads_missing_models(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    whisper = Mock()
+    pyannote = Mock(side_effect=[OSError("not cached"), None])
+
+    model_manager.load_cached_first([whisper, pyannote])
+
+    whisper.assert_called_once_with(True)
+    assert [c.args for c in pyannote.call_args_list] == [(True,), (False,)]
+
+
+def test_load_models_reports_failure(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    with patch.object(
+        ModelManager, "_load_whisper", side_effect=OSError("no network")
+    ), patch.object(ModelManager, "_load_diarization"):
+        with pytest.raises(RuntimeError, match="Failed to load models: no network"):
+            model_manager.load_models()
+
+
+def test_load_models_measures_startup(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    with patch.object(ModelManager, "_load_whisper"), patch.object(
+        ModelManager, "_load_diarization"
+    ):
+        model_manager.load_models()
+
+    assert model_manager.load_seconds >= 0
+    model_manager.update_progress.assert_called_with(1.0, "Ready to record")
+
+
+@pytest.mark.parametrize("batch_size, batched", [(1, False), (8, True)])
+def test_load_whisper_wraps_batched_pipeline(config, batch_size, batched):
+    config["whisper_batch_size"] = batch_size
+    model_manager = ModelManager(config, Mock(), Mock())
+    with patch("faster_whisper.WhisperModel") as MockWhisperModel, patch(
+        "faster_whisper.BatchedInferencePipeline"
+    ) as MockPipeline:
+        model_manager._load_whisper(local_files_only=True)
+
+    assert model_manager.whisper_model is MockWhisperModel.return_value
+    if batched:
+        MockPipeline.assert_called_once_with(MockWhisperModel.return_value)
+        assert model_manager.whisper_pipeline is MockPipeline.return_value
+    else:
+        assert model_manager.whisper_pipeline is None
+
+
+def test_diarization_workers_start_once_and_stop(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    with patch("core.workers.DiarizationWorkerPool") as MockPool:
+        model_manager._start_diarization_workers()
+        model_manager._start_diarization_workers()
+        MockPool.assert_called_once()
+
+        model_manager.shutdown()
+        MockPool.return_value.shutdown.assert_called_once()
+        assert model_manager.diarization_workers is None
+
+
+def test_failed_worker_start_stops_the_pool(config):
+    model_manager = ModelManager(config, Mock(), Mock())
+    with patch("core.workers.DiarizationWorkerPool") as MockPool:
+        MockPool.return_value.warm_up.return_value.result.side_effect = OSError(
+            "not cached"
+        )
+        with pytest.raises(OSError):
+            model_manager._start_diarization_workers()
+
+    MockPool.return_value.shutdown.assert_called_once()
+    assert model_manager.diarization_workers is None
+
+
+class Pyannote3Pipeline:
+    calls = []
+
+    @classmethod
+    def from_pretrained(cls, checkpoint, hparams_file=None, use_auth_token=None):
+        cls.calls.append((checkpoint, use_auth_token))
+        return cls()
+
+
+class Pyannote4Pipeline:
+    calls = []
+
+    @classmethod
+    def from_pretrained(cls, checkpoint, token=None):
+        cls.calls.append((checkpoint, token))
+        return None
+
+
+def test_load_diarization_pipeline_names_the_token_for_this_pyannote():
+    with patch("pyannote.audio.Pipeline", Pyannote3Pipeline):
+        pipeline = load_diarization_pipeline("hf_secret")
+    assert isinstance(pipeline, Pyannote3Pipeline)
+    assert Pyannote3Pipeline.calls == [(DIARIZATION_MODEL, "hf_secret")]
+
+    with patch("pyannote.audio.Pipeline", Pyannote4Pipeline):
+        with pytest.raises(RuntimeError, match="check HF_TOKEN"):
+            load_diarization_pipeline("hf_secret")
+    assert Pyannote4Pipeline.calls == [(DIARIZATION_MODEL, "hf_secret")]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+from core.online_diarization import OnlineDiarizer
+
+SAMPLE_RATE = 16000
+
+
+def voice(pitch, seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (0.5 * np.sin(2 * np.pi * pitch * t)).astype(np.float32)
+
+
+def pitch_embedding(audio):
+    """Stand-in speaker embedding: one-hot on the dominant pitch band."""
+    spectrum = np.abs(np.fft.rfft(audio))
+    pitch = np.argmax(spectrum) * SAMPLE_RATE / len(audio)
+    embedding = np.full(4, 0.05)
+    embedding[min(int(pitch // 200), 3)] = 1.0
+    return embedding
+
+
+def feed(diarizer, audio, block=512):
+    for start in range(0, len(audio), block):
+        diarizer.push(audio[start : start + block])
+
+
+@pytest.fixture
+def diarizer():
+    return OnlineDiarizer(pitch_embedding, window_s=1.0, step_s=0.5)
+
+
+def test_labels_are_stable_across_turns(diarizer):
+    feed(diarizer, np.concatenate([voice(110, 3), voice(450, 2), voice(110, 2)]))
+    assert [t.speaker for t in diarizer.turns] == [
+        "SPEAKER_00",
+        "SPEAKER_01",
+        "SPEAKER_00",
+    ]
+    # Boundaries land within one step of the change of speaker
+    boundaries = [t.end for t in diarizer.turns]
+    assert boundaries == pytest.approx([3.0, 5.0, 7.0], abs=0.5)
+    assert diarizer.speakers == 2
+
+
+def test_silence_is_not_labelled(diarizer):
+    silence = np.zeros(SAMPLE_RATE * 2, dtype=np.float32)
+    feed(diarizer, np.concatenate([voice(110, 1), silence, voice(110, 1)]))
+    assert [(t.start, t.end) for t in diarizer.turns] == [(0.0, 1.0), (3.0, 4.0)]
+    assert {t.speaker for t in diarizer.turns} == {"SPEAKER_00"}
+
+
+def test_speaker_at(diarizer):
+    feed(diarizer, np.concatenate([voice(110, 2), voice(450, 2)]))
+    assert diarizer.speaker_at(0.2, 1.0) == "SPEAKER_00"
+    assert diarizer.speaker_at(1.8, 3.5) == "SPEAKER_01"
+    assert diarizer.speaker_at(10.0, 11.0) is None
+
+
+def test_max_speakers(diarizer):
+    diarizer.max_speakers = 1
+    feed(diarizer, np.concatenate([voice(110, 1), voice(450, 1)]))
+    assert {t.speaker for t in diarizer.turns} == {"SPEAKER_00"}
+
+
+def test_memory_is_bounded(diarizer):
+    feed(diarizer, voice(110, 30), block=4000)
+    assert diarizer._window.shape == (SAMPLE_RATE,)
+    assert len(diarizer.turns) == 1
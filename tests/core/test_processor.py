@@ -1,7 +1,23 @@
+import json
+import tempfile
 import unittest
-from unittest.mock import Mock
-from concurrent.futures import ThreadPoolExecutor
-from core.processor import AudioProcessor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+import numpy as np
+import soundfile as sf
+from core.processor import (
+    AudioProcessor,
+    StreamingTranscriber,
+    decode_audio_file,
+    resample_audio,
+)
+from core.scheduler import JobCancelledError, JobScheduler
+from core.speakers import Turn
+from core.results import Segment, Word
+from core.store import load_results
+from core.telemetry import Tracer
+from core.writers import render_results
 
 
 class TestAudioProcessorInit(unittest.TestCase):
@@ -23,8 +39,565 @@ class TestAudioProcessorInit(unittest.TestCase):
         self.assertEqual(processor.models, self.model_manager)
         self.assertEqual(processor.write_log, self.log_callback)
         self.assertEqual(processor.update_progress, self.progress_callback)
-        self.assertIsInstance(processor.thread_pool, ThreadPoolExecutor)
-        self.assertEqual(processor.thread_pool._max_workers, 3)
+        self.assertIsInstance(processor.scheduler, JobScheduler)
+        self.assertEqual(processor.scheduler.max_active_jobs, 2)
+        processor.scheduler.shutdown()
+
+
+class TestAudioProcessorTask(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.output_dir = Path(self.tmp.name)
+        self.config = {"output_dir": self.output_dir}
+        self.model_manager = Mock(diarization_workers=None)
+        self.model_manager.whisper_model.transcribe.return_value = (
+            [SimpleNamespace(start=1.0, end=2.0, text=" Hi ")],
+            SimpleNamespace(language="en"),
+        )
+        turn = SimpleNamespace(start=0.0, end=3.0)
+        self.model_manager.diarization_pipeline.return_value.itertracks.return_value = [
+            (turn, "A", "SPEAKER_00")
+        ]
+        self.progress_callback = Mock()
+        self.processor = AudioProcessor(
+            self.config, self.model_manager, Mock(), self.progress_callback
+        )
+        self.waveform = np.linspace(-0.5, 0.5, 16000, dtype=np.float32)
+
+    def tearDown(self):
+        self.processor.scheduler.shutdown(wait=True)
+        self.tmp.cleanup()
+
+    def test_batched_pipeline_used_when_enabled(self):
+        self.config.update(whisper_batch_size=16, whisper_beam_size=1)
+        pipeline = self.model_manager.whisper_pipeline
+        pipeline.transcribe.return_value = (
+            [SimpleNamespace(start=1.0, end=2.0, text=" Hi ")],
+            SimpleNamespace(language="en"),
+        )
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        self.processor.process_audio("ts", buffer).future.result(timeout=10)
+
+        self.assertEqual(
+            pipeline.transcribe.call_args.kwargs,
+            {"batch_size": 16, "beam_size": 1, "without_timestamps": False},
+        )
+        self.model_manager.whisper_model.transcribe.assert_not_called()
+
+    def test_repeat_processing_reuses_cached_results(self):
+        self.config.update(cache_dir=self.output_dir / "cache", cache_max_mb=16)
+        processor = AudioProcessor(
+            self.config, self.model_manager, Mock(), self.progress_callback
+        )
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        first = processor.process_audio("first", buffer).future.result(timeout=10)
+        second = processor.process_audio("second", buffer).future.result(timeout=10)
+        processor.scheduler.shutdown()
+
+        self.model_manager.whisper_model.transcribe.assert_called_once()
+        self.model_manager.diarization_pipeline.assert_called_once()
+        self.assertEqual(first.read_text(), second.read_text())
+        self.assertIn("Speaker SPEAKER_00", second.read_text())
+
+    def test_stages_are_traced(self):
+        spans = []
+        self.processor.tracer = Tracer([spans.append])
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        self.processor.process_audio("ts", buffer).future.result(timeout=10)
+
+        by_name = {span.name: span for span in spans}
+        self.assertEqual(
+            set(by_name), {"job", "audio.load", "asr", "diarization", "merge"}
+        )
+        job_span = by_name["job"]
+        self.assertEqual(job_span.attributes["audio_seconds"], 1.0)
+        for name in ["audio.load", "asr", "diarization", "merge"]:
+            self.assertEqual(by_name[name].parent_id, job_span.span_id)
+        self.assertEqual(by_name["asr"].attributes["segments"], 1)
+        self.assertIsNotNone(by_name["diarization"].real_time_factor)
+
+    def test_silence_is_trimmed_before_the_models(self):
+        self.config.update(trim_silence=True)
+        t = np.arange(16000) / 16000
+        speech = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        silence = np.zeros(16000 * 10, dtype=np.float32)
+        buffer = Mock()
+        buffer.consolidate.return_value = np.concatenate([silence, speech, silence])
+        output_path = self.processor.process_audio("ts", buffer).future.result(
+            timeout=10
+        )
+
+        transcribed = self.model_manager.whisper_model.transcribe.call_args.args[0]
+        diarized = self.model_manager.diarization_pipeline.call_args.args[0]
+        # One second of speech plus 300 ms of padding on each side
+        self.assertAlmostEqual(len(transcribed), 1.6 * 16000, delta=960)
+        self.assertEqual(tuple(diarized["waveform"].shape), (1, len(transcribed)))
+        # The segment at 1 s of speech-only audio is 10.7 s into the recording
+        self.assertEqual(output_path.read_text(), "[00:00:10] Speaker SPEAKER_00: Hi\n")
+
+    def test_all_silence_skips_the_models(self):
+        self.config.update(trim_silence=True)
+        buffer = Mock()
+        buffer.consolidate.return_value = np.zeros(16000 * 5, dtype=np.float32)
+        output_path = self.processor.process_audio("ts", buffer).future.result(
+            timeout=10
+        )
+
+        self.model_manager.whisper_model.transcribe.assert_not_called()
+        self.model_manager.diarization_pipeline.assert_not_called()
+        self.assertEqual(output_path.read_text(), "")
+
+    def test_long_recordings_are_diarized_in_chunks(self):
+        self.config.update(diarization_max_mb=1)
+        annotation = Mock()
+        annotation.itertracks.return_value = [
+            (SimpleNamespace(start=0.0, end=3.0), "A", "LOCAL")
+        ]
+        annotation.labels.return_value = ["LOCAL"]
+        pipeline = self.model_manager.diarization_pipeline
+        pipeline.return_value = (annotation, np.array([[1.0, 0.0]]))
+        buffer = Mock()
+        buffer.consolidate.return_value = np.zeros(16000 * 150, dtype=np.float32)
+        output_path = self.processor.process_audio("ts", buffer).future.result(
+            timeout=10
+        )
+
+        # 150 s with the 120 s minimum chunk and 30 s overlap is two chunks
+        self.assertEqual(pipeline.call_count, 2)
+        self.assertTrue(pipeline.call_args.kwargs["return_embeddings"])
+        lengths = [c.args[0]["waveform"].shape[1] for c in pipeline.call_args_list]
+        self.assertEqual(lengths, [120 * 16000, 60 * 16000])
+        self.assertEqual(output_path.read_text(), "[00:00:01] Speaker SPEAKER_00: Hi\n")
+
+    def test_chunked_turns_are_cached_per_speaker_threshold(self):
+        self.config.update(
+            diarization_max_mb=1,
+            cache_dir=self.output_dir / "cache",
+            cache_max_mb=16,
+        )
+        processor = AudioProcessor(
+            self.config, self.model_manager, Mock(), self.progress_callback
+        )
+        annotation = Mock()
+        annotation.itertracks.return_value = [
+            (SimpleNamespace(start=0.0, end=3.0), "A", "LOCAL")
+        ]
+        annotation.labels.return_value = ["LOCAL"]
+        pipeline = self.model_manager.diarization_pipeline
+        pipeline.return_value = (annotation, np.array([[1.0, 0.0]]))
+        buffer = Mock()
+        buffer.consolidate.return_value = np.zeros(16000 * 150, dtype=np.float32)
+
+        for threshold in [0.4, 0.4, 0.7]:
+            self.config["speaker_threshold"] = threshold
+            processor.process_audio("ts", buffer).future.result(timeout=10)
+        processor.scheduler.shutdown()
+
+        # Two chunks for the first run and two more once the threshold changes
+        self.assertEqual(pipeline.call_count, 4)
+
+    def test_raw_results_are_kept_for_rendering(self):
+        self.config.update(keep_results=True)
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        self.processor.process_audio("ts", buffer).future.result(timeout=10)
+
+        segments, turns = load_results(self.output_dir / "results_ts.npz")
+        self.assertEqual([s.text for s in segments], [" Hi "])
+        self.assertEqual(list(turns), [Turn(0.0, 3.0, "SPEAKER_00")])
+
+    def test_text_recordings_can_be_rendered_with_words(self):
+        self.config.update(keep_results=True, output_formats=["txt"])
+        self.model_manager.whisper_model.transcribe.return_value = (
+            [Segment(1.0, 2.0, " Hi ", [Word(1.0, 1.5, " Hi", 0.9)])],
+            SimpleNamespace(language="en"),
+        )
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        self.processor.process_audio("ts", buffer).future.result(timeout=10)
+
+        options = self.model_manager.whisper_model.transcribe.call_args.kwargs
+        self.assertTrue(options["word_timestamps"])
+        (path,) = render_results(
+            self.output_dir / "results_ts.npz",
+            ["jsonl"],
+            output_dir=self.output_dir / "rendered",
+        )
+        line = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(
+            line["words"],
+            [{"start": 1.0, "end": 1.5, "word": " Hi", "probability": 0.9}],
+        )
+
+    def test_models_share_in_memory_audio(self):
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        job = self.processor.process_audio("ts", buffer)
+        output_path = job.future.result(timeout=10)
+
+        transcribed = self.model_manager.whisper_model.transcribe.call_args.args[0]
+        self.assertIs(transcribed, self.waveform)
+        diarized = self.model_manager.diarization_pipeline.call_args.args[0]
+        self.assertEqual(diarized["sample_rate"], 16000)
+        self.assertEqual(tuple(diarized["waveform"].shape), (1, 16000))
+        self.assertTrue(np.shares_memory(diarized["waveform"].numpy(), self.waveform))
+
+        self.assertEqual(output_path, self.output_dir / "transcript_ts.txt")
+        transcript = output_path.read_text(encoding="utf-8")
+        self.assertEqual(transcript, "[00:00:01] Speaker SPEAKER_00: Hi\n")
+        self.assertEqual(list(self.output_dir.glob("*.flac")), [])
+        self.progress_callback.assert_called_with(1.0, "Processing completed!", job.id)
+
+    def test_writes_each_requested_format(self):
+        self.config.update(output_formats=["txt", "srt", "jsonl"])
+        log_callback = Mock()
+        self.processor.write_log = log_callback
+        self.model_manager.whisper_model.transcribe.return_value = (
+            [SimpleNamespace(start=i, end=i + 0.5, text=f" {i} ") for i in range(120)],
+            SimpleNamespace(language="en"),
+        )
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        output_path = self.processor.process_audio("ts", buffer).future.result(
+            timeout=10
+        )
+
+        self.assertEqual(output_path, self.output_dir / "transcript_ts.txt")
+        self.assertTrue(
+            self.model_manager.whisper_model.transcribe.call_args.kwargs[
+                "word_timestamps"
+            ]
+        )
+        for extension in [".txt", ".srt", ".jsonl"]:
+            self.assertTrue((self.output_dir / f"transcript_ts{extension}").exists())
+        self.assertEqual(list(self.output_dir.glob("*.part")), [])
+        # The 120 transcript lines reach the log in a few batched writes
+        echoed = [
+            c.args[0] for c in log_callback.call_args_list if c.args[0].startswith("[")
+        ]
+        self.assertLess(len(echoed), 10)
+        self.assertEqual(sum(len(text.splitlines()) for text in echoed), 120)
+
+    def test_spilled_recording_is_read_once_and_deleted(self):
+        spill_path = self.output_dir / "recording_ts.wav"
+        sf.write(spill_path, self.waveform, 16000, subtype="FLOAT", format="RF64")
+        self.config["keep_audio"] = True
+
+        job = self.processor.process_audio("ts", spill_path, delete_audio=True)
+        job.future.result(timeout=10)
+        self.assertEqual(job.info["audio_seconds"], 1.0)
+        self.processor.scheduler.shutdown(wait=True)
+
+        transcribed = self.model_manager.whisper_model.transcribe.call_args.args[0]
+        np.testing.assert_array_equal(transcribed, self.waveform)
+        self.assertFalse(spill_path.exists())
+        archived, _ = sf.read(self.output_dir / "recording_ts.flac", dtype="float32")
+        np.testing.assert_allclose(archived, self.waveform, atol=1e-4)
+
+    def test_spilled_recording_is_kept_when_processing_fails(self):
+        spill_path = self.output_dir / "recording_ts.wav"
+        sf.write(spill_path, self.waveform, 16000, subtype="FLOAT", format="RF64")
+        self.model_manager.whisper_model.transcribe.side_effect = RuntimeError("boom")
+        log_callback = Mock()
+        self.processor.write_log = log_callback
+
+        job = self.processor.process_audio("ts", spill_path, delete_audio=True)
+        with self.assertRaises(RuntimeError):
+            job.future.result(timeout=10)
+
+        self.assertTrue(spill_path.exists())
+        log_callback.assert_any_call(f"Recording kept at {spill_path}")
+
+    def test_source_files_are_kept(self):
+        source = self.output_dir / "call.flac"
+        stereo = np.stack([self.waveform, self.waveform], axis=1)
+        sf.write(source, stereo, 16000, format="FLAC")
+
+        self.processor.process_audio("call", source).future.result(timeout=10)
+
+        transcribed = self.model_manager.whisper_model.transcribe.call_args.args[0]
+        self.assertEqual(transcribed.shape, (16000,))
+        np.testing.assert_allclose(transcribed, self.waveform, atol=1e-4)
+        self.assertTrue(source.exists())
+
+    def test_process_backend_diarization(self):
+        workers = Mock()
+        workers.diarize.return_value = [Turn(0.0, 3.0, "SPEAKER_07")]
+        self.model_manager.diarization_workers = workers
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+
+        output_path = self.processor.process_audio("ts", buffer).future.result(10)
+
+        workers.diarize.assert_called_once_with(self.waveform)
+        self.model_manager.diarization_pipeline.assert_not_called()
+        transcript = output_path.read_text(encoding="utf-8")
+        self.assertEqual(transcript, "[00:00:01] Speaker SPEAKER_07: Hi\n")
+
+    def test_channels_are_transcribed_and_merged(self):
+        self.config.update(keep_results=True)
+
+        def transcribe(waveform, **options):
+            # Alice's 48 kHz channel arrives resampled to a second at 16 kHz
+            text = " Hello" if waveform[0] < 0 else " Hi Alice"
+            return (
+                [SimpleNamespace(start=0.2, end=0.8, text=text)],
+                SimpleNamespace(language="en"),
+            )
+
+        self.model_manager.whisper_model.transcribe.side_effect = transcribe
+        recordings = [
+            SimpleNamespace(
+                name="Alice",
+                audio=np.linspace(-0.5, 0.5, 48000, dtype=np.float32),
+                sample_rate=48000,
+                offset=0.0,
+            ),
+            SimpleNamespace(
+                name="Bob",
+                audio=np.full(16000, 0.1, dtype=np.float32),
+                sample_rate=16000,
+                offset=0.5,
+            ),
+        ]
+        job = self.processor.process_channels("ts", recordings)
+        output_path = job.future.result(timeout=10)
+
+        lengths = sorted(
+            c.args[0].shape
+            for c in self.model_manager.whisper_model.transcribe.call_args_list
+        )
+        self.assertEqual(lengths, [(16000,), (16000,)])
+        self.model_manager.diarization_pipeline.assert_not_called()
+        self.assertEqual(
+            output_path.read_text(encoding="utf-8"),
+            "[00:00:00] Speaker Alice: Hello\n[00:00:00] Speaker Bob: Hi Alice\n",
+        )
+        segments, turns = load_results(self.output_dir / "results_ts.npz")
+        self.assertEqual([s.start for s in segments], [0.2, 0.7])
+        self.assertTrue(turns.by_channel)
+
+    def test_channels_are_archived_by_number_when_the_queue_is_full(self):
+        recordings = [
+            SimpleNamespace(
+                name="Alice/../x",
+                audio=self.waveform,
+                sample_rate=48000,
+                offset=0.0,
+            )
+        ]
+        with patch.object(
+            self.processor.scheduler,
+            "submit",
+            side_effect=RuntimeError("Job queue is full"),
+        ):
+            self.assertIsNone(self.processor.process_channels("ts", recordings))
+        self.processor.scheduler.shutdown(wait=True)
+
+        archived, rate = sf.read(self.output_dir / "recording_ts_channel1.flac")
+        self.assertEqual((len(archived), rate), (16000, 48000))
+
+    def test_cancel_during_transcription(self):
+        processor = self.processor
+
+        def segments():
+            processor.cancel()
+            yield SimpleNamespace(start=1.0, end=2.0, text=" Hi ")
+            yield SimpleNamespace(start=2.0, end=3.0, text=" there ")
+
+        self.model_manager.whisper_model.transcribe.return_value = (
+            segments(),
+            SimpleNamespace(language="en"),
+        )
+        buffer = Mock()
+        buffer.consolidate.return_value = self.waveform
+        job = processor.process_audio("ts", buffer)
+        with self.assertRaises(JobCancelledError):
+            job.future.result(timeout=10)
+        self.assertEqual(job.state, "cancelled")
+        self.assertFalse((self.output_dir / "transcript_ts.txt").exists())
+
+
+class TestDecodeAudioFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.audio = np.linspace(-0.5, 0.5, 48000, dtype=np.float32)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_spilled_recordings_are_memory_mapped(self):
+        path = self.dir / "recording_ts.wav"
+        sf.write(path, self.audio, 16000, subtype="FLOAT", format="RF64")
+
+        waveform = decode_audio_file(path)
+        self.assertIsInstance(waveform.base, np.memmap)
+        np.testing.assert_array_equal(waveform, self.audio)
+        # Writes stay in memory and leave the recording untouched
+        waveform[:] = 0
+        np.testing.assert_array_equal(sf.read(path, dtype="float32")[0], self.audio)
+
+    def test_other_files_are_mixed_down(self):
+        path = self.dir / "call.wav"
+        sf.write(path, np.stack([self.audio, -self.audio / 2], axis=1), 16000)
+
+        waveform = decode_audio_file(path)
+        self.assertEqual(waveform.dtype, np.float32)
+        np.testing.assert_allclose(waveform, self.audio / 4, atol=1e-4)
+
+
+class TestResampleAudio(unittest.TestCase):
+    def test_resamples_only_when_needed(self):
+        audio = np.zeros(16000, dtype=np.float32)
+        self.assertIs(resample_audio(audio, 16000), audio)
+
+        tone = np.sin(np.arange(44100) * 2 * np.pi * 440 / 44100).astype(np.float32)
+        resampled = resample_audio(tone, 44100)
+        self.assertEqual(resampled.dtype, np.float32)
+        self.assertEqual(len(resampled), 16000)
+        expected = np.sin(np.arange(16000) * 2 * np.pi * 440 / 16000)
+        np.testing.assert_allclose(resampled[100:-100], expected[100:-100], atol=1e-2)
+
+
+class TestStreamingTranscriber(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = {"output_dir": Path(self.tmp.name)}
+        self.model_manager = Mock()
+        self.model_manager.whisper_model.transcribe.return_value = (
+            [SimpleNamespace(start=0.5, end=1.0, text=" Hello there ")],
+            SimpleNamespace(language="en"),
+        )
+        self.log_callback = Mock()
+        self.progress_callback = Mock()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_transcribes_utterances_while_streaming(self):
+        streamer = StreamingTranscriber(
+            self.config,
+            self.model_manager,
+            self.log_callback,
+            self.progress_callback,
+            "20240101_000000",
+        )
+        t = np.arange(16000) / 16000
+        speech = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        silence = np.zeros(16000 * 2, dtype=np.float32)
+
+        streamer.feed(np.concatenate([silence, speech, silence]))
+        streamer.feed(speech)
+        streamer.finish()
+        streamer.executor.shutdown(wait=True)
+
+        transcribe = self.model_manager.whisper_model.transcribe
+        self.assertEqual(transcribe.call_count, 2)
+        self.assertEqual(transcribe.call_args.kwargs["language"], "en")
+        self.assertEqual(transcribe.call_args.kwargs["initial_prompt"], "Hello there")
+        lines = streamer.output_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines, ["[00:00:02] Hello there", "[00:00:05] Hello there"])
+        self.progress_callback.assert_called_with(1.0, "Processing completed!")
+
+    def test_streams_every_format(self):
+        self.config.update(output_formats=["txt", "vtt"])
+        streamer = StreamingTranscriber(
+            self.config,
+            self.model_manager,
+            self.log_callback,
+            self.progress_callback,
+            "20240101_000000",
+        )
+        t = np.arange(16000) / 16000
+        speech = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        silence = np.zeros(16000 * 2, dtype=np.float32)
+
+        streamer.feed(np.concatenate([silence, speech, silence]))
+        streamer.executor.submit(lambda: None).result(timeout=10)
+        # Until the recording finishes, only the partial files exist
+        output_dir = Path(self.tmp.name)
+        self.assertEqual(list(output_dir.glob("*.vtt")), [])
+        self.assertIn(
+            "Hello there",
+            (output_dir / "transcript_20240101_000000.vtt.part").read_text(),
+        )
+
+        streamer.finish()
+        streamer.executor.shutdown(wait=True)
+        vtt = (output_dir / "transcript_20240101_000000.vtt").read_text()
+        self.assertEqual(
+            vtt, "WEBVTT\n\n00:00:02.180 --> 00:00:02.680\nHello there\n\n"
+        )
+        self.assertEqual(list(output_dir.glob("*.part")), [])
+
+    def test_labels_speakers_live(self):
+        self.config.update(online_diarization=True)
+        self.model_manager.whisper_model.transcribe.return_value = (
+            [SimpleNamespace(start=0.3, end=0.9, text=" Hello there ")],
+            SimpleNamespace(language="en"),
+        )
+        with patch(
+            "core.processor.pyannote_embedder",
+            return_value=lambda audio: np.array([1.0, 0.0]),
+        ):
+            streamer = StreamingTranscriber(
+                self.config,
+                self.model_manager,
+                self.log_callback,
+                self.progress_callback,
+                "20240101_000000",
+            )
+        t = np.arange(16000 * 2) / 16000
+        speech = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        silence = np.zeros(16000, dtype=np.float32)
+
+        streamer.feed(np.concatenate([speech, silence]))
+        streamer.finish()
+        streamer.executor.shutdown(wait=True)
+
+        lines = streamer.output_path.read_text(encoding="utf-8").splitlines()
+        self.assertEqual(lines, ["[00:00:00] Speaker SPEAKER_00: Hello there"])
+
+    def test_streamed_results_are_kept(self):
+        self.config.update(keep_results=True)
+        streamer = StreamingTranscriber(
+            self.config,
+            self.model_manager,
+            self.log_callback,
+            self.progress_callback,
+            "20240101_000000",
+        )
+        t = np.arange(16000) / 16000
+        speech = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+        streamer.feed(np.concatenate([np.zeros(32000, np.float32), speech]))
+        streamer.finish()
+        streamer.executor.shutdown(wait=True)
+
+        segments, turns = load_results(
+            Path(self.tmp.name) / "results_20240101_000000.npz"
+        )
+        self.assertEqual([s.text for s in segments], [" Hello there "])
+        self.assertEqual(len(turns), 0)
+        options = self.model_manager.whisper_model.transcribe.call_args.kwargs
+        self.assertTrue(options["word_timestamps"])
+
+    def test_live_speakers_need_embedding_model(self):
+        self.config.update(online_diarization=True)
+        self.model_manager.speaker_embedding = None
+        streamer = StreamingTranscriber(
+            self.config,
+            self.model_manager,
+            self.log_callback,
+            self.progress_callback,
+            "20240101_000000",
+        )
+        self.assertIsNone(streamer.diarizer)
+        streamer.finish()
+        streamer.executor.shutdown(wait=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,67 @@
+import threading
+import pytest
+from core.scheduler import JobCancelledError, JobScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = JobScheduler(
+        stages={"io": 1, "asr": 1}, max_active_jobs=1, max_queued_jobs=1
+    )
+    yield scheduler
+    scheduler.shutdown()
+
+
+def test_job_runs_stages(scheduler):
+    def task(job, value):
+        doubled = scheduler.run_stage(job, "io", lambda x: x * 2, value)
+        return scheduler.run_stage(job, "asr", lambda x: x + 1, doubled.result())
+
+    job = scheduler.submit("job", task, 5)
+    assert job.id == "1"
+    assert job.future.result(timeout=5).result(timeout=5) == 11
+    assert job.state == "done"
+    assert scheduler.active_jobs() == []
+
+
+def test_back_to_back_jobs_do_not_deadlock(scheduler):
+    def task(job):
+        return scheduler.run_stage(job, "io", lambda: job.id).result()
+
+    first = scheduler.submit("first", task)
+    second = scheduler.submit("second", task, block=True)
+    assert first.future.result(timeout=5) == "1"
+    assert second.future.result(timeout=5) == "2"
+
+
+def test_submit_applies_backpressure(scheduler):
+    release = threading.Event()
+    scheduler.submit("running", lambda job: release.wait(5))
+    scheduler.submit("queued", lambda job: None)
+    with pytest.raises(RuntimeError, match="Job queue is full"):
+        scheduler.submit("rejected", lambda job: None)
+    release.set()
+
+
+def test_cancel_queued_job(scheduler):
+    release = threading.Event()
+    scheduler.submit("running", lambda job: release.wait(5))
+    queued = scheduler.submit("queued", lambda job: "ran")
+    assert [job.id for job in scheduler.active_jobs()] == ["1", "2"]
+
+    assert scheduler.cancel(queued.id)
+    release.set()
+    with pytest.raises(JobCancelledError):
+        queued.future.result(timeout=5)
+    assert queued.state == "cancelled"
+    assert not scheduler.cancel(queued.id)
+
+
+def test_failed_job(scheduler):
+    def task(job):
+        raise ValueError("boom")
+
+    job = scheduler.submit("failing", task)
+    with pytest.raises(ValueError):
+        job.future.result(timeout=5)
+    assert job.state == "failed"
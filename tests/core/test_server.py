@@ -0,0 +1,121 @@
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import numpy as np
+import pytest
+from core.results import Segment, Word
+from core.server import ModelClient, ModelServer, RemoteModelManager
+from core.speakers import Turn
+
+
+@pytest.fixture
+def server(tmp_path):
+    models = MagicMock()
+    models.whisper_model.transcribe.side_effect = lambda audio, **options: (
+        [
+            SimpleNamespace(
+                start=0.0,
+                end=float(len(audio)),
+                text=" Hello",
+                words=[
+                    SimpleNamespace(start=0.0, end=1.0, word="Hello", probability=0.9)
+                ],
+            )
+        ],
+        SimpleNamespace(language=options.get("language", "en")),
+    )
+    models.whisper_pipeline.transcribe.side_effect = lambda audio, **options: (
+        [],
+        SimpleNamespace(language=f"batched {options['batch_size']}"),
+    )
+    models.diarization_workers.diarize.side_effect = lambda waveform: [
+        Turn(0.0, float(waveform.sum()), "SPEAKER_00")
+    ]
+    server = ModelServer(models, tmp_path / "models.sock")
+    thread = serve(server)
+    yield server
+    server.shutdown()
+    thread.join(5)
+
+
+def serve(server: ModelServer) -> threading.Thread:
+    """Serve on a background thread and wait until the server answers."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    client = ModelClient(server.socket_path, timeout=5)
+    for _ in range(100):
+        if client.available():
+            break
+        threading.Event().wait(0.05)
+    return thread
+
+
+def test_client_unavailable(tmp_path):
+    assert not ModelClient(tmp_path / "missing.sock").available()
+
+
+def test_remote_model_manager(server):
+    config = {"model_socket": server.socket_path}
+    manager = RemoteModelManager(config, MagicMock(), MagicMock())
+    manager.load_models()
+    manager.update_progress.assert_called_once_with(1.0, "Ready to record")
+
+    segments, info = manager.whisper_model.transcribe(
+        np.zeros(3, dtype=np.float32), language="fr"
+    )
+    assert info.language == "fr"
+    assert segments == [Segment(0.0, 3.0, " Hello", [Word(0.0, 1.0, "Hello", 0.9)])]
+
+    turns = manager.diarization_workers.diarize(np.ones(4, dtype=np.float32))
+    assert turns == [Turn(0.0, 4.0, "SPEAKER_00")]
+
+
+def test_server_reports_errors(server):
+    client = ModelClient(server.socket_path, timeout=5)
+    with pytest.raises(RuntimeError, match="Unknown operation"):
+        client.request({"op": "nope"})
+
+
+def test_batched_transcription_uses_pipeline(server):
+    manager = RemoteModelManager(
+        {"model_socket": server.socket_path}, MagicMock(), MagicMock()
+    )
+    _, info = manager.whisper_pipeline.transcribe(
+        np.zeros(3, dtype=np.float32), batch_size=4
+    )
+    assert info.language == "batched 4"
+
+    server.models.whisper_pipeline = None
+    _, info = manager.whisper_pipeline.transcribe(
+        np.zeros(3, dtype=np.float32), batch_size=4
+    )
+    assert info.language == "en"
+
+
+def test_second_server_leaves_a_live_socket_alone(server):
+    second = ModelServer(MagicMock(), server.socket_path)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        started = executor.submit(second.serve_forever)
+        try:
+            with pytest.raises(RuntimeError, match="already running"):
+                started.result(timeout=5)
+        finally:
+            second.shutdown()
+    assert ModelClient(server.socket_path, timeout=5).available()
+
+
+def test_stale_socket_is_replaced(tmp_path):
+    path = tmp_path / "models.sock"
+    # A socket file nobody listens on, as left by a server that was killed
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(path))
+
+    server = ModelServer(MagicMock(), path)
+    thread = serve(server)
+    try:
+        assert ModelClient(path, timeout=5).available()
+    finally:
+        server.shutdown()
+        thread.join(5)
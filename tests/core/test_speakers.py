@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from core.speakers import Turn, annotation_to_turns, assign_speakers
+
+
+def segment(start, end):
+    return SimpleNamespace(start=start, end=end)
+
+
+def test_annotation_to_turns():
+    diarization = MagicMock()
+    diarization.itertracks.return_value = [
+        (SimpleNamespace(start=5.0, end=6.0), "B", "SPEAKER_01"),
+        (SimpleNamespace(start=1.0, end=2.0), "A", "SPEAKER_00"),
+    ]
+    assert annotation_to_turns(diarization) == [
+        Turn(1.0, 2.0, "SPEAKER_00"),
+        Turn(5.0, 6.0, "SPEAKER_01"),
+    ]
+
+
+def test_assign_speakers_by_maximum_overlap():
+    turns = [Turn(0.0, 4.0, "A"), Turn(3.0, 10.0, "B")]
+    segments = [segment(0.5, 2.0), segment(3.5, 9.0), segment(2.0, 4.5)]
+    assert assign_speakers(segments, turns) == ["A", "B", "A"]
+
+
+def test_assign_speakers_unsorted_segments():
+    turns = [Turn(10.0, 20.0, "B"), Turn(0.0, 10.0, "A")]
+    segments = [segment(12.0, 15.0), segment(1.0, 3.0)]
+    assert assign_speakers(segments, turns) == ["B", "A"]
+
+
+def test_assign_speakers_without_overlap():
+    turns = [Turn(0.0, 1.0, "A"), Turn(5.0, 6.0, "B")]
+    segments = [segment(1.0, 5.0), segment(7.0, 8.0)]
+    assert assign_speakers(segments, turns) == [None, None]
+
+
+def test_assign_speakers_zero_length_segment():
+    turns = [Turn(0.0, 2.0, "A")]
+    assert assign_speakers([segment(1.0, 1.0)], turns) == ["A"]
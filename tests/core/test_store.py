@@ -0,0 +1,210 @@
+import random
+import numpy as np
+import pytest
+from core.results import Segment, Word
+from core.speakers import Turn, assign_speakers
+from core.store import (
+    SegmentStore,
+    TurnStore,
+    assign_turn_indices,
+    load_results,
+    merge_channels,
+    save_results,
+)
+
+SEGMENTS = [
+    Segment(0.0, 2.0, " Hello", [Word(0.0, 1.0, " Hello", 0.9)]),
+    Segment(2.5, 4.0, " Grüße ✓", None),
+    Segment(5.0, 5.0, "", []),
+]
+TURNS = [Turn(0.0, 2.2, "A"), Turn(2.2, 6.0, "B")]
+
+
+def test_segments_round_trip():
+    store = SegmentStore.from_segments(SEGMENTS)
+    assert len(store) == 3
+    assert list(store) == SEGMENTS
+    assert store.text_at(1) == " Grüße ✓"
+    assert store.starts.tolist() == [0.0, 2.5, 5.0]
+
+
+def test_assign_speakers():
+    store = SegmentStore.from_segments(SEGMENTS)
+    turns = TurnStore.from_turns(TURNS)
+    assert store.assign_speakers(turns).tolist() == [0, 1, 1]
+    assert [speaker for _, speaker in store.with_speakers()] == ["A", "B", "B"]
+
+    store = SegmentStore.from_segments([Segment(10.0, 11.0, " Late", None)])
+    store.assign_speakers(turns)
+    assert store.speaker_at(0) is None
+
+
+def test_between_slices_by_time():
+    store = SegmentStore.from_segments(SEGMENTS)
+    window = store.between(1.0, 3.0)
+    assert [segment.text for segment in window] == [" Hello", " Grüße ✓"]
+    assert len(store.between(4.0, 5.0)) == 0
+    assert list(TurnStore.from_turns(TURNS).between(2.5, 3.0)) == [TURNS[1]]
+
+
+def test_save_and_load(tmp_path):
+    store = SegmentStore.from_segments(SEGMENTS)
+    store.assign_speakers(TurnStore.from_turns(TURNS))
+    store.save(tmp_path / "segments.npz")
+    loaded = SegmentStore.load(tmp_path / "segments.npz")
+    assert list(loaded.with_speakers()) == list(store.with_speakers())
+
+    turns = TurnStore.from_turns(TURNS)
+    turns.save(tmp_path / "turns.npz")
+    assert list(TurnStore.load(tmp_path / "turns.npz")) == TURNS
+
+
+def test_empty_stores(tmp_path):
+    store = SegmentStore.from_segments([])
+    assert store.assign_speakers(TurnStore.from_turns([])).tolist() == []
+    store.save(tmp_path / "empty.npz")
+    assert list(SegmentStore.load(tmp_path / "empty.npz")) == []
+
+
+def test_matches_interval_sweep():
+    rng = random.Random(1)
+    segments, turns, t = [], [], 0.0
+    while t < 3600:
+        length = rng.uniform(0.0, 8.0) if rng.random() > 0.05 else 0.0
+        segments.append(Segment(t, t + length, "", None))
+        t += length + rng.uniform(0.0, 0.5)
+    t = 0.0
+    while t < 3600:
+        length = rng.uniform(0.5, 60.0)
+        turns.append(Turn(t, t + length, f"S{rng.randrange(5)}"))
+        # Overlapping speech, now and then
+        t += length - (rng.uniform(0.0, 2.0) if rng.random() < 0.2 else 0.0)
+
+    store = SegmentStore.from_segments(segments)
+    store.assign_speakers(TurnStore.from_turns(turns))
+    assert [speaker for _, speaker in store.with_speakers()] == assign_speakers(
+        segments, turns
+    )
+
+
+def test_ties_and_boundaries_match_interval_sweep():
+    # Half-second grid times make ties and touching boundaries common
+    for seed in range(300):
+        rng = random.Random(seed)
+        segments = []
+        for _ in range(rng.randint(0, 12)):
+            start = rng.randint(0, 20) * 0.5
+            segments.append(
+                Segment(start, start + rng.choice([0.0, 0.5, 1.0]), "", None)
+            )
+        turns = []
+        for number in range(rng.randint(0, 8)):
+            start = rng.randint(0, 20) * 0.5
+            turns.append(Turn(start, start + rng.choice([0.5, 1.0, 4.0]), f"S{number}"))
+
+        store = SegmentStore.from_segments(segments)
+        store.assign_speakers(TurnStore.from_turns(turns))
+        expected = assign_speakers(sorted(segments, key=lambda s: s.start), turns)
+        assert [speaker for _, speaker in store.with_speakers()] == expected, seed
+
+
+def test_assignment_is_blocked(monkeypatch):
+    monkeypatch.setattr("core.store.ASSIGN_BLOCK", 2)
+    starts = np.array([0.0, 1.0, 2.0, 3.0, 4.0])
+    index = assign_turn_indices(
+        starts, starts + 0.5, np.array([0.0, 2.0]), np.array([2.0, 5.0])
+    )
+    assert index.tolist() == [0, 0, 1, 1, 1]
+
+
+def test_long_turn_does_not_widen_the_search(monkeypatch):
+    # One turn spans the recording while short turns alternate inside it
+    turn_starts = np.concatenate([[0.0], np.arange(20000) * 2.0])
+    turn_ends = np.concatenate([[40000.0], np.arange(20000) * 2.0 + 1.5])
+    starts = np.arange(20000) * 2.0 + 0.25
+    repeat = np.repeat
+    pairs = []
+
+    def counting_repeat(values, counts, *args, **kwargs):
+        if not np.isscalar(counts):
+            pairs.append(int(np.sum(counts)))
+        return repeat(values, counts, *args, **kwargs)
+
+    monkeypatch.setattr("core.store.np.repeat", counting_repeat)
+    index = assign_turn_indices(starts, starts + 1.0, turn_starts, turn_ends)
+    # Each segment sits wholly inside both its short turn and the long one
+    assert index.tolist() == [0] * 20000
+    assert max(pairs) <= 20000
+
+    index = assign_turn_indices(starts, starts + 1.5, turn_starts, turn_ends)
+    assert index.tolist() == [0] * 20000
+    index = assign_turn_indices(starts, starts + 1.0, turn_starts[1:], turn_ends[1:])
+    assert index.tolist() == list(range(20000))
+
+
+def test_nested_turns_tie_to_the_earlier_turn():
+    index = assign_turn_indices(
+        np.array([1.0, 2.0, 5.0]),
+        np.array([2.0, 2.0, 5.0]),
+        np.array([0.0, 1.0, 1.5]),
+        np.array([10.0, 3.0, 2.5]),
+    )
+    assert index.tolist() == [0, 0, 0]
+
+
+def test_to_arrow():
+    pytest.importorskip("pyarrow")
+    store = SegmentStore.from_segments(SEGMENTS)
+    store.assign_speakers(TurnStore.from_turns(TURNS))
+    table = store.to_arrow()
+    assert table.column("text").to_pylist() == [s.text for s in SEGMENTS]
+    assert table.column("speaker").to_pylist() == ["A", "B", "B"]
+    assert TurnStore.from_turns(TURNS).to_arrow().num_rows == 2
+
+
+def test_start_policy():
+    store = SegmentStore.from_segments([Segment(2.0, 6.0, " Hi", None)])
+    turns = TurnStore.from_turns([Turn(0.0, 2.5, "A"), Turn(2.5, 6.0, "B")])
+    store.assign_speakers(turns, policy="start")
+    assert store.speaker_at(0) == "A"
+    store.assign_speakers(turns)
+    assert store.speaker_at(0) == "B"
+    with pytest.raises(ValueError):
+        store.assign_speakers(turns, policy="first")
+
+
+def test_save_and_load_results(tmp_path):
+    segments = SegmentStore.from_segments(SEGMENTS)
+    turns = TurnStore.from_turns(TURNS)
+    segments.assign_speakers(turns)
+    save_results(tmp_path / "results.npz", segments, turns)
+
+    loaded_segments, loaded_turns = load_results(tmp_path / "results.npz")
+    assert list(loaded_segments.with_speakers()) == list(segments.with_speakers())
+    assert list(loaded_turns) == TURNS
+
+
+def test_merge_channels(tmp_path):
+    segments, turns = merge_channels(
+        [
+            (
+                "Alice",
+                [Segment(0.0, 6.0, " Long", None), Segment(7.0, 8.0, " B", None)],
+            ),
+            ("Bob", [Segment(1.0, 2.0, " Overlap", None)]),
+            ("Carol", []),
+        ]
+    )
+    # Bob keeps his segment even though Alice's covers it entirely
+    assert [(s.text, speaker) for s, speaker in segments.with_speakers()] == [
+        (" Long", "Alice"),
+        (" Overlap", "Bob"),
+        (" B", "Alice"),
+    ]
+    assert turns.speakers == ["Alice", "Bob", "Carol"]
+    assert list(turns)[1] == Turn(1.0, 2.0, "Bob")
+
+    save_results(tmp_path / "results.npz", segments, turns)
+    _, loaded_turns = load_results(tmp_path / "results.npz")
+    assert loaded_turns.by_channel
+    assert not TurnStore.from_turns(TURNS).by_channel
@@ -0,0 +1,81 @@
+import json
+import pytest
+from core.telemetry import JsonLinesExporter, Span, Tracer
+
+
+def test_span_records_timings_and_real_time_factor():
+    spans = []
+    tracer = Tracer([spans.append])
+    with tracer.span("asr", audio_seconds=10.0) as span:
+        sum(range(10000))
+
+    assert spans == [span]
+    assert span.status == "OK"
+    assert span.wall_seconds > 0
+    assert span.cpu_seconds >= 0
+    assert span.peak_rss_mb > 0
+    assert span.real_time_factor == pytest.approx(span.wall_seconds / 10.0)
+
+
+def test_span_without_audio_has_no_real_time_factor():
+    assert Span("merge").real_time_factor is None
+
+
+def test_child_spans_share_the_trace():
+    tracer = Tracer()
+    with tracer.span("job") as parent:
+        with tracer.span("asr", parent) as child:
+            pass
+    assert child.trace_id == parent.trace_id
+    assert child.parent_id == parent.span_id
+    assert parent.parent_id is None
+
+
+def test_errors_are_recorded_and_reraised():
+    spans = []
+    tracer = Tracer([spans.append])
+    with pytest.raises(ValueError):
+        with tracer.span("diarization"):
+            raise ValueError("boom")
+    assert spans[0].status == "ERROR"
+    assert spans[0].attributes["error"] == "ValueError: boom"
+
+
+def test_failing_exporter_does_not_break_work():
+    def broken(span):
+        raise OSError("disk full")
+
+    with Tracer([broken]).span("asr"):
+        pass
+
+
+def test_json_lines_exporter(tmp_path):
+    tracer = Tracer.from_config({"trace_path": tmp_path / "traces" / "spans.jsonl"})
+    with tracer.span("job", job_id="1", audio_seconds=2.0) as parent:
+        with tracer.span("merge", parent):
+            pass
+
+    lines = (tmp_path / "traces" / "spans.jsonl").read_text().splitlines()
+    merge, job = [json.loads(line) for line in lines]
+    assert merge["name"] == "merge"
+    assert merge["parent_span_id"] == job["span_id"]
+    assert job["attributes"]["job_id"] == "1"
+    assert job["attributes"]["real_time_factor"] > 0
+    assert job["end_time_unix_nano"] >= job["start_time_unix_nano"]
+    assert {"wall_seconds", "cpu_seconds", "peak_rss_mb"} <= set(job["attributes"])
+
+
+def test_tracer_without_trace_path_exports_nothing():
+    assert Tracer.from_config({}).exporters == []
+
+
+def test_json_lines_exporter_appends(tmp_path):
+    path = tmp_path / "spans.jsonl"
+    path.write_text('{"name": "earlier run"}\n')
+    exporter = JsonLinesExporter(path)
+    with Tracer([exporter]).span("asr", audio_seconds=1.0):
+        pass
+    exporter(Span("merge"))
+
+    names = [json.loads(line)["name"] for line in path.read_text().splitlines()]
+    assert names == ["earlier run", "asr", "merge"]
@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+from core.results import Segment, Word
+from core.speakers import Turn
+from core.vad import SpeechTimeline, UtteranceSegmenter, frame_energy_db, speech_regions
+
+
+SAMPLE_RATE = 16000
+
+
+def tone(seconds, amplitude=0.5):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    return (amplitude * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def test_frame_energy_db():
+    levels = frame_energy_db(np.concatenate([silence(0.03), tone(0.03)]), 480)
+    assert len(levels) == 2
+    assert levels[0] < -150
+    assert levels[1] == pytest.approx(20 * np.log10(0.5 / np.sqrt(2)), abs=0.1)
+
+
+def test_segmenter_splits_on_silence():
+    segmenter = UtteranceSegmenter(SAMPLE_RATE)
+    audio = np.concatenate([silence(1), tone(1), silence(1), tone(0.5), silence(1)])
+
+    utterances = []
+    for block in np.array_split(audio, 100):
+        utterances.extend(segmenter.push(block))
+
+    assert len(utterances) == 2
+    first_start, first_audio = utterances[0]
+    assert first_start == pytest.approx(0.7 * SAMPLE_RATE, abs=480)
+    assert len(first_audio) >= SAMPLE_RATE
+    assert utterances[1][0] > 2 * SAMPLE_RATE
+    assert segmenter.flush() is None
+
+
+def test_segmenter_caps_utterance_length():
+    segmenter = UtteranceSegmenter(SAMPLE_RATE, max_utterance_s=1.0)
+    utterances = segmenter.push(tone(2.5))
+    assert [len(audio) for _, audio in utterances] == [15840, 15840]
+    start, audio = segmenter.flush()
+    assert start == 31680
+    assert len(audio) == 8160
+
+
+def test_speech_regions_skip_long_silences():
+    audio = np.concatenate([silence(5), tone(1), silence(1), tone(1), silence(5)])
+    regions = speech_regions(audio, SAMPLE_RATE)
+    # The short pause is kept; padding widens the region by 300 ms each side
+    assert len(regions) == 1
+    assert regions[0, 0] == pytest.approx(4.7 * SAMPLE_RATE, abs=480)
+    assert regions[0, 1] == pytest.approx(8.3 * SAMPLE_RATE, abs=480)
+
+    regions = speech_regions(audio, SAMPLE_RATE, min_silence_ms=300)
+    assert len(regions) == 2
+
+
+def test_speech_regions_edges():
+    assert speech_regions(silence(3), SAMPLE_RATE).shape == (0, 2)
+    audio = tone(1.01)
+    assert speech_regions(audio, SAMPLE_RATE).tolist() == [[0, len(audio)]]
+
+
+def test_timeline_compacts_audio():
+    audio = np.concatenate([silence(10), tone(2), silence(20), tone(3), silence(10)])
+    timeline = SpeechTimeline.detect(audio, SAMPLE_RATE)
+    speech = timeline.compact(audio)
+    assert len(timeline.regions) == 2
+    assert len(speech) == timeline.speech_samples
+    assert timeline.speech_ratio == pytest.approx(6.2 / 45, abs=0.01)
+    assert np.array_equal(
+        speech[:SAMPLE_RATE], audio[slice(*timeline.regions[0])][:SAMPLE_RATE]
+    )
+
+
+def test_timeline_maps_results_back():
+    regions = np.array([[10, 12], [30, 33]]) * SAMPLE_RATE
+    timeline = SpeechTimeline(regions, 45 * SAMPLE_RATE, SAMPLE_RATE)
+
+    # Compacted: [0, 2) is the first region, [2, 5) the second
+    assert timeline.to_original([0.0, 1.0, 2.0, 2.5]).tolist() == pytest.approx(
+        [10.0, 11.0, 30.0, 30.5]
+    )
+    assert timeline.to_original([2.0], end=True).tolist() == pytest.approx([12.0])
+
+    segments = timeline.restore_segments(
+        [
+            Segment(0.5, 2.0, " Hi", [Word(0.5, 1.0, " Hi", 0.9)]),
+            Segment(3, 4, "", None),
+        ]
+    )
+    assert (segments[0].start, segments[0].end) == pytest.approx((10.5, 12.0))
+    assert segments[0].words[0] == Word(10.5, 11.0, " Hi", 0.9)
+    assert (segments[1].start, segments[1].end) == pytest.approx((31.0, 32.0))
+    # Turns crossing a join are split rather than spanning the silence
+    assert timeline.restore_turns(
+        [Turn(1.5, 3.0, "A"), Turn(0.0, 2.0, "B"), Turn(2.0, 5.0, "C")]
+    ) == [
+        Turn(11.5, 12.0, "A"),
+        Turn(30.0, 31.0, "A"),
+        Turn(10.0, 12.0, "B"),
+        Turn(30.0, 33.0, "C"),
+    ]
+
+
+def test_timeline_without_silence_is_identity():
+    audio = tone(2)
+    timeline = SpeechTimeline.detect(audio, SAMPLE_RATE)
+    assert timeline.is_identity
+    assert timeline.compact(audio) is audio
@@ -0,0 +1,31 @@
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+import numpy as np
+from core import workers
+from core.speakers import Turn
+from core.workers import DiarizationWorkerPool
+
+
+def fake_pipeline(audio):
+    waveform = audio["waveform"]
+    assert tuple(waveform.shape) == (1, 4)
+    assert audio["sample_rate"] == 16000
+    annotation = MagicMock()
+    duration = float(waveform.sum())
+    annotation.itertracks.return_value = [
+        (SimpleNamespace(start=0.0, end=duration), "A", "SPEAKER_00")
+    ]
+    return annotation
+
+
+def test_diarize_through_shared_memory():
+    with patch.object(
+        workers, "ProcessPoolExecutor", lambda **kwargs: ThreadPoolExecutor(1)
+    ), patch.object(workers, "_pipeline", fake_pipeline):
+        pool = DiarizationWorkerPool({})
+        assert pool.warm_up().result() is True
+        turns = pool.diarize(np.array([0.5, 1.0, 1.5, 2.0], dtype=np.float32))
+        pool.shutdown()
+
+    assert turns == [Turn(0.0, 5.0, "SPEAKER_00")]
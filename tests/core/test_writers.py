@@ -0,0 +1,193 @@
+import json
+from unittest.mock import Mock, patch
+import pytest
+from core.results import Segment, Word
+from core.speakers import Turn
+from core.store import SegmentStore, TurnStore, merge_channels, save_results
+from core.writers import (
+    LogBatcher,
+    TextWriter,
+    TranscriptWriter,
+    TranscriptWriters,
+    format_clock,
+    render_results,
+    transcript_line,
+)
+
+SEGMENTS = [
+    Segment(1.0, 2.5, " Hello there ", [Word(1.0, 1.4, " Hello", 0.9)]),
+    Segment(3661.25, 3662.0, " Bye ", None),
+]
+
+
+def test_format_clock():
+    assert format_clock(3661.25) == "01:01:01.250"
+    assert format_clock(59.9999, ",") == "00:01:00,000"
+
+
+def test_transcript_line():
+    assert transcript_line(SEGMENTS[0], "A") == "[00:00:01] Speaker A: Hello there"
+    assert transcript_line(SEGMENTS[0], None) == "[00:00:01] Unknown: Hello there"
+    assert transcript_line(SEGMENTS[0], "A", speakers=False) == "[00:00:01] Hello there"
+
+
+def test_writes_every_format(tmp_path):
+    writers = TranscriptWriters(tmp_path, "transcript", ["txt", "srt", "vtt", "jsonl"])
+    for segment, speaker in zip(SEGMENTS, ["SPEAKER_00", None]):
+        writers.write(segment, speaker)
+    assert writers.close() == tmp_path / "transcript.txt"
+
+    assert (tmp_path / "transcript.txt").read_text() == (
+        "[00:00:01] Speaker SPEAKER_00: Hello there\n[01:01:01] Unknown: Bye\n"
+    )
+    assert (tmp_path / "transcript.srt").read_text() == (
+        "1\n00:00:01,000 --> 00:00:02,500\nSpeaker SPEAKER_00: Hello there\n\n"
+        "2\n01:01:01,250 --> 01:01:02,000\nUnknown: Bye\n\n"
+    )
+    assert (tmp_path / "transcript.vtt").read_text() == (
+        "WEBVTT\n\n"
+        "00:00:01.000 --> 00:00:02.500\n<v Speaker SPEAKER_00>Hello there\n\n"
+        "01:01:01.250 --> 01:01:02.000\n<v Unknown>Bye\n\n"
+    )
+    lines = (tmp_path / "transcript.jsonl").read_text().splitlines()
+    first, second = [json.loads(line) for line in lines]
+    assert first["speaker"] == "SPEAKER_00"
+    assert first["text"] == "Hello there"
+    assert first["words"] == [
+        {"start": 1.0, "end": 1.4, "word": " Hello", "probability": 0.9}
+    ]
+    assert second["speaker"] is None
+    assert list(tmp_path.glob("*.part")) == []
+
+
+def test_without_speakers(tmp_path):
+    writers = TranscriptWriters(tmp_path, "t", ["txt", "jsonl"], speakers=False)
+    writers.write(SEGMENTS[1])
+    writers.close()
+    assert (tmp_path / "t.txt").read_text() == "[01:01:01] Bye\n"
+    assert "speaker" not in json.loads((tmp_path / "t.jsonl").read_text())
+
+
+def test_transcript_appears_only_when_complete(tmp_path):
+    writer = TextWriter(tmp_path / "t.txt")
+    writer.write(SEGMENTS[0], "A")
+    writer.flush()
+    # Flushed segments are on disk, but only under the partial name
+    assert not (tmp_path / "t.txt").exists()
+    assert "Hello there" in (tmp_path / "t.txt.part").read_text()
+    writer.close()
+    assert (tmp_path / "t.txt").exists()
+    assert not (tmp_path / "t.txt.part").exists()
+
+
+def test_abort_discards_partial_files(tmp_path):
+    writers = TranscriptWriters(tmp_path, "t", ["txt", "srt"])
+    writers.write(SEGMENTS[0], "A")
+    writers.abort()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_writers_must_define_format(tmp_path):
+    with pytest.raises(TypeError):
+        TranscriptWriter(tmp_path / "t.txt")
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError, match="docx"):
+        TranscriptWriters(tmp_path, "t", ["txt", "docx"])
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_log_batcher_groups_lines():
+    write_log = Mock()
+    log = LogBatcher(write_log, max_lines=3, interval=60)
+    for index in range(7):
+        log.add(f"line {index}")
+    assert [c.args[0] for c in write_log.call_args_list] == [
+        "line 0\nline 1\nline 2",
+        "line 3\nline 4\nline 5",
+    ]
+    log.flush()
+    assert write_log.call_args.args[0] == "line 6"
+    log.flush()
+    assert write_log.call_count == 3
+
+
+def test_log_batcher_flushes_after_interval():
+    write_log = Mock()
+    with patch("core.writers.time.monotonic", side_effect=[0.0, 0.1, 0.3, 0.3]):
+        log = LogBatcher(write_log, max_lines=50, interval=0.2)
+        log.add("first")
+        write_log.assert_not_called()
+        log.add("second")
+    write_log.assert_called_once_with("first\nsecond")
+
+
+@pytest.fixture
+def results(tmp_path):
+    path = tmp_path / "results_ts.npz"
+    segments = SegmentStore.from_segments(
+        [Segment(0.0, 2.0, " One", None), Segment(2.0, 5.0, " Two", None)]
+    )
+    turns = TurnStore.from_turns(
+        [
+            Turn(0.0, 2.0, "SPEAKER_00"),
+            Turn(2.0, 2.5, "SPEAKER_01"),
+            Turn(2.5, 5.0, "SPEAKER_02"),
+        ]
+    )
+    save_results(path, segments, turns)
+    return path
+
+
+def test_render_results(results, tmp_path):
+    paths = render_results(results, ["txt", "srt"])
+    assert paths == [tmp_path / "transcript_ts.txt", tmp_path / "transcript_ts.srt"]
+    assert paths[0].read_text() == (
+        "[00:00:00] Speaker SPEAKER_00: One\n[00:00:02] Speaker SPEAKER_02: Two\n"
+    )
+
+
+def test_render_with_names_and_policy(results, tmp_path):
+    (path,) = render_results(
+        results,
+        ["txt"],
+        output_dir=tmp_path / "renamed",
+        renames={"SPEAKER_00": "Alice", "SPEAKER_01": "Alice"},
+        policy="start",
+    )
+    assert path.parent == tmp_path / "renamed"
+    assert path.read_text() == (
+        "[00:00:00] Speaker Alice: One\n[00:00:02] Speaker Alice: Two\n"
+    )
+
+    (path,) = render_results(results, ["txt"], speakers=False)
+    assert path.read_text() == "[00:00:00] One\n[00:00:02] Two\n"
+
+
+def test_render_rejects_unknown_speakers(results):
+    with pytest.raises(ValueError, match="SPEAKER_09"):
+        render_results(results, ["txt"], renames={"SPEAKER_09": "Bob"})
+
+
+def test_render_without_diarization(tmp_path):
+    path = tmp_path / "results_live.npz"
+    segments = SegmentStore.from_segments([Segment(1.0, 2.0, " Hi", None)])
+    save_results(path, segments, TurnStore.from_turns([]))
+    (output,) = render_results(path, ["txt"])
+    assert output.read_text() == "[00:00:01] Hi\n"
+
+
+def test_render_keeps_channel_speakers(tmp_path):
+    path = tmp_path / "results_ts.npz"
+    segments, turns = merge_channels(
+        [
+            ("Alice", [Segment(0.0, 6.0, " Long", None)]),
+            ("Bob", [Segment(1.0, 2.0, " Short", None)]),
+        ]
+    )
+    save_results(path, segments, turns)
+    (output,) = render_results(path, ["txt"], renames={"Bob": "Robert"})
+    assert output.read_text() == (
+        "[00:00:00] Speaker Alice: Long\n[00:00:01] Speaker Robert: Short\n"
+    )
@@ -1,3 +1,8 @@
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
 from unittest.mock import patch, MagicMock
 from main import main
 
@@ -5,12 +10,105 @@ from main import main
 def test_main_success():
     with patch(
         "main.check_environment", return_value="config"
-    ) as mock_check_environment, patch("main.TranscriberApp") as mock_TranscriberApp:
+    ) as mock_check_environment, patch("ui.app.TranscriberApp") as mock_TranscriberApp:
         mock_app_instance = MagicMock()
         mock_TranscriberApp.return_value = mock_app_instance
 
-        main()
+        main([])
 
         mock_check_environment.assert_called_once()
         mock_TranscriberApp.assert_called_once_with("config")
         mock_app_instance.run.assert_called_once()
+
+
+def test_main_serve():
+    with patch("main.check_environment", return_value="config"), patch(
+        "main.run_server"
+    ) as mock_run_server, patch("ui.app.TranscriberApp") as mock_TranscriberApp:
+        main(["serve"])
+
+        mock_run_server.assert_called_once_with("config")
+        mock_TranscriberApp.assert_not_called()
+
+
+def test_main_batch():
+    with patch("main.check_environment", return_value={"output_dir": "out"}), patch(
+        "main.BatchController"
+    ) as mock_BatchController, patch("ui.app.TranscriberApp") as mock_TranscriberApp:
+        mock_BatchController.return_value.run.return_value = {"failed": 0}
+
+        with pytest.raises(SystemExit) as exit_info:
+            main(["batch", "recordings", "--jobs", "3"])
+
+        assert exit_info.value.code == 0
+
+        config = mock_BatchController.call_args.args[0]
+        assert config["max_active_jobs"] == 3
+        mock_BatchController.return_value.run.assert_called_once_with(["recordings"])
+        mock_TranscriberApp.assert_not_called()
+
+
+def test_main_calibrate(tmp_path):
+    config = {"device": "cpu", "cpu_threads": 4, "calibration_path": tmp_path / "c"}
+    result = {"whisper_model": "base", "compute_type": "int8", "rtf": 0.1, "wer": 0.0}
+    with patch("main.check_environment", return_value=config), patch(
+        "main.decode_audio_file", return_value=np.zeros(16000 * 120, dtype=np.float32)
+    ), patch("main.calibrate", return_value=result) as mock_calibrate, patch(
+        "main.supported_compute_types", return_value={"int8", "float32"}
+    ), patch(
+        "main.save_calibration"
+    ) as mock_save:
+        main(["calibrate", "sample.wav", "--models", "base", "--seconds", "30"])
+
+    audio, candidates = mock_calibrate.call_args.args
+    assert len(audio) == 16000 * 30
+    assert candidates == [("base", "int8"), ("base", "float32")]
+    mock_save.assert_called_once_with(tmp_path / "c", result)
+
+
+def test_main_render(tmp_path):
+    with patch("main.check_environment") as mock_check_environment, patch(
+        "main.render_results", return_value=[tmp_path / "transcript_ts.txt"]
+    ) as mock_render:
+        main(
+            [
+                "render",
+                str(tmp_path / "results_ts.npz"),
+                "--formats",
+                "srt",
+                "--rename",
+                "SPEAKER_00=Alice",
+                "--merge",
+                "start",
+            ]
+        )
+
+    # Rendering needs neither the models nor the HF token
+    mock_check_environment.assert_not_called()
+    args, kwargs = mock_render.call_args
+    assert args == (tmp_path / "results_ts.npz", ["srt"])
+    assert kwargs["renames"] == {"SPEAKER_00": "Alice"}
+    assert kwargs["policy"] == "start"
+    assert kwargs["speakers"] is None
+
+
+def test_main_render_bad_rename(tmp_path, capsys):
+    with pytest.raises(SystemExit):
+        main(["render", str(tmp_path / "r.npz"), "--rename", "Alice"])
+    assert "LABEL=NAME" in capsys.readouterr().err
+
+
+def test_headless_commands_do_not_need_portaudio():
+    # Blocking sounddevice makes any import of it fail, as without PortAudio
+    code = (
+        "import sys; sys.modules['sounddevice'] = None; "
+        "from main import main; main(['render', '--help'])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).resolve().parents[1] / "src",
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "results_*.npz" in result.stdout
@@ -0,0 +1,101 @@
+import threading
+import time
+from unittest.mock import Mock
+from ui.events import UIEventBus
+
+
+def test_drain_coalesces_updates():
+    bus = UIEventBus(Mock())
+    assert bus.drain() is None
+
+    bus.log("first")
+    bus.log("second")
+    bus.progress(0.1, "Transcribing...", "1")
+    bus.progress(0.0, "Recording in progress...")
+    bus.progress(0.5, "Diarizing...", "1")
+    bus.span("span")
+
+    update = bus.drain()
+    assert update.logs == ["first", "second"]
+    assert update.skipped_logs == 0
+    # Only the latest progress per job is kept, ordered by last change
+    assert list(update.progress.items()) == [
+        (None, (0.0, "Recording in progress...")),
+        ("1", (0.5, "Diarizing...")),
+    ]
+    assert update.spans == ["span"]
+    assert bus.drain() is None
+
+
+def test_pending_logs_are_bounded():
+    bus = UIEventBus(Mock(), max_log_lines=3)
+    for index in range(5):
+        bus.log(str(index))
+    update = bus.drain()
+    assert update.logs == ["2", "3", "4"]
+    assert update.skipped_logs == 2
+
+
+def test_delivers_from_background_thread():
+    delivered = []
+    done = threading.Event()
+
+    def deliver(update):
+        delivered.append((threading.current_thread(), update))
+        if update.logs[-1] == "99":
+            done.set()
+
+    bus = UIEventBus(deliver, fps=100)
+    bus.start()
+    for index in range(100):
+        bus.log(str(index))
+    assert done.wait(timeout=5)
+    bus.stop()
+
+    # Logging never waits for delivery, and many lines arrive per frame
+    assert all(thread is not threading.current_thread() for thread, _ in delivered)
+    lines = [line for _, update in delivered for line in update.logs]
+    assert lines == [str(index) for index in range(100)]
+    assert len(delivered) < 100
+
+
+def test_keeps_delivering_after_a_failed_frame():
+    delivered = []
+    done = threading.Event()
+
+    def deliver(update):
+        if not delivered:
+            delivered.append(None)
+            raise RuntimeError("app not running")
+        delivered.extend(update.logs)
+        if "after" in update.logs:
+            done.set()
+
+    bus = UIEventBus(deliver, fps=100)
+    bus.start()
+    bus.log("lost")
+    while not delivered:
+        time.sleep(0.01)
+    bus.log("after")
+    assert done.wait(timeout=5)
+    bus.stop()
+    assert "Error updating the UI: app not running" in delivered
+
+
+def test_stops_when_app_is_gone():
+    stopping = threading.Event()
+    bus = None
+
+    def deliver(update):
+        bus._stopped.set()
+        stopping.set()
+        raise RuntimeError("app not running")
+
+    bus = UIEventBus(deliver, fps=100)
+    bus.start()
+    bus.log("late")
+    thread = bus._thread
+    assert stopping.wait(timeout=5)
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    bus.stop()
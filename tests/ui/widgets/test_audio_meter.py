@@ -1,4 +1,6 @@
+from unittest.mock import PropertyMock, patch
 import pytest
+from textual.geometry import Size
 from ui.widgets.audio_meter import AudioMeter
 
 
@@ -30,3 +32,52 @@ def test_compute_level_colors_max_value(audio_meter):
 def test_compute_level_colors_zero_value(audio_meter):
     result = audio_meter.compute_level_colors(0.0)
     assert result == ["green"]
+
+
+@pytest.fixture
+def sized_meter(audio_meter):
+    # 10 cells between the borders
+    with patch.object(
+        AudioMeter, "size", new_callable=PropertyMock, return_value=Size(12, 1)
+    ), patch.object(audio_meter, "refresh") as refresh:
+        audio_meter.refresh_mock = refresh
+        yield audio_meter
+
+
+def test_redraws_only_when_cells_change(sized_meter):
+    sized_meter.update_level(0.5, now=0.0)
+    sized_meter.render()
+    sized_meter.refresh_mock.reset_mock()
+
+    sized_meter.update_level(0.52, now=0.0)
+    sized_meter.refresh_mock.assert_not_called()
+    sized_meter.update_level(0.6, now=0.0)
+    sized_meter.refresh_mock.assert_called_once()
+
+
+def test_bars_are_cached(sized_meter):
+    sized_meter.update_level(0.5, now=0.0)
+    first = sized_meter.render()
+    sized_meter.update_level(0.55, now=0.0)
+    assert sized_meter.render() is first
+    assert first.plain == "│█████     │"
+
+
+def test_level_decays_and_peak_holds(sized_meter):
+    sized_meter.update_level(0.8, now=0.0)
+    sized_meter.update_level(0.0, now=0.1)
+    assert sized_meter.level == pytest.approx(0.65)
+    assert sized_meter.peak == 0.8
+    assert sized_meter.render().plain == "│██████ ▌  │"
+
+    # After the hold time the peak falls at the same rate as the bar
+    sized_meter.update_level(0.0, now=1.2)
+    assert sized_meter.level == 0.0
+    assert sized_meter.peak == 0.0
+
+
+def test_bar_colors(audio_meter):
+    bar = audio_meter._bar(10, 10, 10)
+    assert bar.plain == "│██████████│"
+    styles = [str(span.style) for span in bar.spans]
+    assert styles[0] == "green" and styles[-1] == "red"
@@ -9,3 +9,17 @@ def processing_progress():
 
 def test_initial_progress(processing_progress):
     assert processing_progress.progress == 0.0
+
+
+def test_set_job(processing_progress):
+    processing_progress.set_job("1", 0.3, "Transcribing...")
+    processing_progress.set_job("2", 0.1, "Preparing audio data...")
+    assert processing_progress.jobs == {
+        "1": (0.3, "Transcribing..."),
+        "2": (0.1, "Preparing audio data..."),
+    }
+
+    processing_progress.set_job("1", 1.0, "Processing completed!")
+    assert list(processing_progress.jobs) == ["2"]
+    assert processing_progress.progress == 1.0
+    assert processing_progress.status == "Job 1: Processing completed!"
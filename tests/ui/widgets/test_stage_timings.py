@@ -0,0 +1,27 @@
+import pytest
+from core.telemetry import Span
+from ui.widgets.stage_timings import StageTimings
+
+
+@pytest.fixture
+def stage_timings():
+    return StageTimings(max_rows=2)
+
+
+def finished(name, **attributes):
+    span = Span(name, **attributes)
+    span.end()
+    return span
+
+
+def test_keeps_most_recent_spans(stage_timings):
+    for name in ["audio.load", "asr", "merge"]:
+        stage_timings.add_span(finished(name))
+    assert [span.name for span in stage_timings.spans] == ["asr", "merge"]
+
+
+def test_format_span(stage_timings):
+    row = stage_timings.format_span(finished("asr", audio_seconds=60.0))
+    assert row.startswith("[green]asr")
+    assert "MiB" in row
+    assert "     -" in stage_timings.format_span(finished("merge"))